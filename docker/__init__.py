@@ -1,4 +1,4 @@
-from .api import APIClient
+from .api import APIClient, AsyncAPIClient
 from .client import DockerClient, from_context, from_env
 from .context import Context, ContextAPI
 from .tls import TLSConfig
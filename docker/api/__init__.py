@@ -1 +1,2 @@
+from .async_client import AsyncAPIClient
 from .client import APIClient
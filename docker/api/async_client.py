@@ -0,0 +1,584 @@
+import asyncio
+import contextvars
+import functools
+import struct
+
+import requests
+import requests.exceptions
+
+from .. import auth
+from ..constants import (
+    DEFAULT_MAX_POOL_SIZE,
+    DEFAULT_TIMEOUT_SECONDS,
+    DEFAULT_USER_AGENT,
+    IS_WINDOWS_PLATFORM,
+    MINIMUM_DOCKER_API_VERSION,
+    STREAM_HEADER_SIZE_BYTES,
+)
+from ..errors import (
+    DockerException,
+    InvalidVersion,
+    TLSParameterError,
+    create_api_error_from_http_exception,
+)
+from ..transport.asyncconn import (
+    AsyncConnectionPool,
+    FileBody,
+    ssl_context_from_tls_config,
+)
+from ..types import AsyncCancellableStream, CancellableStream
+from ..utils import config, update_headers, utils
+from ..utils.json_codec import get_json_codec
+from ..utils.json_stream import JSONStreamDecoder
+from ..utils.proxy import ProxyConfig
+from ..utils.socket import (
+    STDOUT,
+    consume_socket_output,
+    demux_adaptor,
+    output_sinks,
+)
+from ..utils.transfer import open_destination
+from .client import APIClient
+from .config import ConfigApiMixin
+from .container import ContainerApiMixin
+from .daemon import DaemonApiMixin
+from .exec_api import ExecApiMixin
+from .image import ImageApiMixin, _import_image_params, is_file
+from .network import NetworkApiMixin
+from .secret import SecretApiMixin
+from .service import ServiceApiMixin
+from .swarm import SwarmApiMixin
+from .volume import VolumeApiMixin
+
+# The replay state of the API call running in the current context, if any
+_current_call = contextvars.ContextVar('docker_async_call', default=None)
+
+# Mixin methods which only build data structures and never talk to the
+# daemon; these stay synchronous.
+_SYNC_METHODS = frozenset([
+    'create_container_config',
+    'create_endpoint_config',
+    'create_host_config',
+    'create_networking_config',
+    'create_swarm_spec',
+])
+
+
+class _Suspend(BaseException):
+    """
+    Raised from the synchronous API code when it needs a response, or a
+    response body, which has not been received yet. This derives from
+    ``BaseException`` so it is never swallowed by the API code itself.
+    """
+    def __init__(self, awaitable, record):
+        super().__init__()
+        self.awaitable = awaitable
+        self.record = record
+
+
+class _Call:
+    def __init__(self):
+        self.responses = []
+        self.index = 0
+
+
+def _coroutine_method(func):
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        if _current_call.get() is not None:
+            # Called by another API method: take part in its replay
+            return func(self, *args, **kwargs)
+        return self._call(func, args, kwargs)
+    return wrapper
+
+
+class AsyncAPIClient(
+        ConfigApiMixin,
+        ContainerApiMixin,
+        DaemonApiMixin,
+        ExecApiMixin,
+        ImageApiMixin,
+        NetworkApiMixin,
+        SecretApiMixin,
+        ServiceApiMixin,
+        SwarmApiMixin,
+        VolumeApiMixin):
+    """
+    A low-level client for the Docker Engine API, for use with
+    :py:mod:`asyncio`. It exposes the same methods as
+    :py:class:`~docker.api.client.APIClient` (except for building images and
+    managing plugins), as coroutines. Every request goes through a single
+    pool of keep-alive connections, so any number of calls can run
+    concurrently on one event loop without a thread each.
+
+    Streaming methods (``logs(stream=True)``, ``events()``, ``pull(...,
+    stream=True)``...) return asynchronous iterators.
+
+    Example:
+
+        >>> import asyncio
+        >>> import docker
+        >>> async def main():
+        ...     async with docker.AsyncAPIClient() as client:
+        ...         containers = await client.containers()
+        ...         return await asyncio.gather(*(
+        ...             client.inspect_container(c['Id']) for c in containers
+        ...         ))
+        >>> asyncio.run(main())
+
+    Args:
+        base_url (str): URL to the Docker server. For example,
+            ``unix:///var/run/docker.sock`` or ``tcp://127.0.0.1:1234``.
+            Only unix sockets and TCP are supported.
+        version (str): The version of the API to use. Set to ``auto`` to
+            automatically detect the server's version, on the first call.
+            Default: ``auto``
+        timeout (int): Default timeout for API calls, in seconds.
+        tls (bool or :py:class:`~docker.tls.TLSConfig`): Enable TLS. Pass
+            ``True`` to enable it with default options, or pass a
+            :py:class:`~docker.tls.TLSConfig` object to use custom
+            configuration.
+        user_agent (str): Set a custom user agent for requests to the server.
+        credstore_env (dict): Override environment variables when calling the
+            credential store process.
+        max_pool_size (int): The maximum number of idle connections to keep
+            in the pool.
+        json_codec (str or :py:class:`~docker.utils.json_codec.JSONCodec`):
+            How to encode request bodies and decode response bodies. See
+            :py:class:`~docker.api.client.APIClient`.
+    """
+
+    def __init__(self, base_url=None, version=None,
+                 timeout=DEFAULT_TIMEOUT_SECONDS, tls=False,
+                 user_agent=DEFAULT_USER_AGENT, credstore_env=None,
+                 max_pool_size=DEFAULT_MAX_POOL_SIZE, json_codec=None):
+        if tls and not base_url:
+            raise TLSParameterError(
+                'If using TLS, the base_url argument must be provided.'
+            )
+
+        self.timeout = timeout
+        self.headers = {'User-Agent': user_agent}
+        self._json_codec = get_json_codec(json_codec)
+        self._stream_loads = (
+            self._json_codec.loads if json_codec is not None else None
+        )
+        # Calls are replayed until they complete, and a cache filled in
+        # between replays would change the requests a replay makes
+        self._tty_cache = None
+
+        self._general_configs = config.load_general_config()
+
+        proxy_config = self._general_configs.get('proxies', {})
+        try:
+            proxies = proxy_config[base_url]
+        except KeyError:
+            proxies = proxy_config.get('default', {})
+
+        self._proxy_configs = ProxyConfig.from_dict(proxies)
+
+        self._auth_configs = auth.load_config(
+            config_dict=self._general_configs, credstore_env=credstore_env,
+        )
+        self.credstore_env = credstore_env
+
+        base_url = utils.parse_host(
+            base_url, IS_WINDOWS_PLATFORM, tls=bool(tls)
+        )
+        self._pool = AsyncConnectionPool(
+            base_url, timeout, maxsize=max_pool_size,
+            ssl_context=ssl_context_from_tls_config(tls) if tls else None
+        )
+        if base_url.startswith('http+unix://'):
+            self.base_url = 'http+docker://localhost'
+        else:
+            self.base_url = base_url
+
+        self._version_lock = None
+        if version is None or (isinstance(version, str) and
+                               version.lower() == 'auto'):
+            self._version = None
+        elif not isinstance(version, str):
+            raise DockerException(
+                'Version parameter must be a string or None. '
+                f'Found {type(version).__name__}'
+            )
+        else:
+            self._set_version(version)
+
+    def _set_version(self, version):
+        if utils.version_lt(version, MINIMUM_DOCKER_API_VERSION):
+            raise InvalidVersion(
+                f'API versions below {MINIMUM_DOCKER_API_VERSION} are '
+                f'no longer supported by this library.'
+            )
+        self._version = version
+
+    async def _retrieve_server_version(self):
+        try:
+            version = await self._call(
+                DaemonApiMixin.version, (), {'api_version': False},
+                resolve_version=False
+            )
+            return version['ApiVersion']
+        except KeyError as ke:
+            raise DockerException(
+                'Invalid response from docker daemon: key "ApiVersion"'
+                ' is missing.'
+            ) from ke
+        except Exception as e:
+            raise DockerException(
+                f'Error while fetching server API version: {e}'
+            ) from e
+
+    async def _call(self, func, args, kwargs, resolve_version=True):
+        """
+        Run a synchronous API method to completion. Whenever the method needs
+        a response that has not been received yet, it is suspended: the
+        request is sent without blocking the event loop, and the method is
+        run again from the start, this time getting the responses received
+        so far, in order.
+        """
+        if resolve_version and self._version is None:
+            if self._version_lock is None:
+                self._version_lock = asyncio.Lock()
+            async with self._version_lock:
+                if self._version is None:
+                    self._set_version(await self._retrieve_server_version())
+
+        call = _Call()
+        try:
+            while True:
+                call.index = 0
+                token = _current_call.set(call)
+                try:
+                    result = func(self, *args, **kwargs)
+                    break
+                except _Suspend as e:
+                    suspended = e
+                finally:
+                    _current_call.reset(token)
+                value = await suspended.awaitable
+                if suspended.record:
+                    call.responses.append(value)
+        except BaseException:
+            for response in call.responses:
+                response.close()
+            raise
+
+        if isinstance(result, CancellableStream):
+            return AsyncCancellableStream(result._stream, result._response)
+        return result
+
+    def _request(self, method, url, **kwargs):
+        call = _current_call.get()
+        if call is None:
+            raise DockerException(
+                'AsyncAPIClient requests can only be sent by its API methods'
+            )
+        if call.index < len(call.responses):
+            response = call.responses[call.index]
+            call.index += 1
+            return response
+        raise _Suspend(self._send(method, url, **kwargs), record=True)
+
+    async def _send(self, method, url, params=None, data=None, headers=None,
+                    stream=False, timeout=None):
+        prepared = requests.PreparedRequest()
+        prepared.prepare_url(url, params)
+        path = prepared.path_url
+
+        request_headers = dict(self.headers)
+        request_headers.update(headers or {})
+        if request_headers.get('Transfer-Encoding') == 'chunked':
+            # Chunked encoding is applied by the transport where needed
+            del request_headers['Transfer-Encoding']
+
+        response = await self._pool.request(
+            method, path, headers=request_headers, body=data,
+            timeout=timeout,
+        )
+        response.url = prepared.url
+        if not stream or response.status_code >= 400:
+            await response.read()
+        return response
+
+    @update_headers
+    def _post(self, url, **kwargs):
+        return self._request('POST', url, **self._set_request_timeout(kwargs))
+
+    @update_headers
+    def _get(self, url, **kwargs):
+        return self._request('GET', url, **self._set_request_timeout(kwargs))
+
+    @update_headers
+    def _put(self, url, **kwargs):
+        return self._request('PUT', url, **self._set_request_timeout(kwargs))
+
+    @update_headers
+    def _delete(self, url, **kwargs):
+        return self._request(
+            'DELETE', url, **self._set_request_timeout(kwargs)
+        )
+
+    def post(self, url, data=None, **kwargs):
+        # Used by attach_socket, which bypasses the default timeout
+        return self._request('POST', url, data=data, **kwargs)
+
+    # Request building and result decoding shared with APIClient
+    _set_request_timeout = APIClient._set_request_timeout
+    _url = APIClient._url
+    _post_json = APIClient._post_json
+    _attach_params = APIClient._attach_params
+    _check_is_tty = APIClient._check_is_tty
+    _get_result = APIClient._get_result
+    _get_result_tty = APIClient._get_result_tty
+    _multiplexed_buffer_helper = APIClient._multiplexed_buffer_helper
+    api_version = APIClient.api_version
+    reload_config = APIClient.reload_config
+
+    def _raise_for_status(self, response):
+        """Raises stored :class:`APIError`, if one occurred."""
+        if response.status_code < 400:
+            return
+        kind = 'Client' if response.status_code < 500 else 'Server'
+        e = requests.exceptions.HTTPError(
+            f'{response.status_code} {kind} Error: {response.reason} '
+            f'for url: {response.url}',
+            response=response
+        )
+        raise create_api_error_from_http_exception(e) from e
+
+    def _result(self, response, json=False, binary=False):
+        assert not (json and binary)
+        self._raise_for_status(response)
+        if response.content is None:
+            raise _Suspend(response.read(), record=False)
+
+        if json:
+            return self._json_codec.loads(response.content)
+        if binary:
+            return response.content
+        return response.text
+
+    def _stream_helper(self, response, decode=False):
+        """
+        Asynchronous iterator for data coming from a chunked-encoded HTTP
+        response.
+        """
+        if 'chunked' not in response.headers.get('Transfer-Encoding', ''):
+            # Response isn't chunked, meaning we probably
+            # encountered an error immediately
+            return _aiter_values([self._result(response, json=decode)])
+        if decode:
+            return _json_stream(response.iter_chunks(), self._stream_loads)
+        return response.iter_chunks()
+
+    def _stream_raw_result(self, response, chunk_size=1, decode=True):
+        ''' Stream result for TTY-enabled container and raw binary data'''
+        self._raise_for_status(response)
+        response.timeout = None
+        return response.iter_chunks(chunk_size)
+
+    def _write_raw_result(self, response, dest):
+        '''
+        Write raw binary data to dest and return how many bytes it was.
+        Writes block the event loop, as with the sync client.
+        '''
+        self._raise_for_status(response)
+        written = getattr(response, 'output_written', None)
+        if written is None:
+            raise _Suspend(_write_body(response, dest), record=False)
+        return written
+
+    def _multiplexed_response_stream_helper(self, response):
+        """
+        An asynchronous iterator of multiplexed data blocks coming from a
+        response stream.
+        """
+        response.timeout = None
+        return _multiplexed_frames(response, demux=False)
+
+    def _read_from_socket(self, response, stream, tty=True, demux=False,
+                          timeout=None, output=None):
+        """
+        Consume all data from the socket, close the response and return the
+        data. If stream=True, an asynchronous iterator is returned instead
+        and the caller is responsible for closing the response. timeout only
+        applies to the former, and so does output: the data is written to it
+        instead, and the number of bytes of stdout and stderr is returned.
+        """
+        if output is not None and not stream:
+            return self._write_result(response, tty, output, timeout)
+        self._raise_for_status(response)
+        if stream:
+            response.timeout = None
+            if tty:
+                return _tty_frames(response, demux)
+            return _multiplexed_frames(response, demux)
+
+        if response.content is None:
+            read = response.read()
+            if timeout is not None:
+                read = asyncio.wait_for(read, timeout)
+            raise _Suspend(read, record=False)
+        if tty:
+            gen = iter([(STDOUT, response.content)])
+        else:
+            gen = _buffer_frames(response.content)
+        if demux:
+            gen = (demux_adaptor(*frame) for frame in gen)
+        else:
+            gen = (data for (_, data) in gen)
+        return consume_socket_output(gen, demux=demux)
+
+    def _write_result(self, response, tty, output, timeout=None):
+        """
+        Write the frames of a streamed response to output as they arrive,
+        close the response and return the number of bytes of stdout and
+        stderr. Writes block the event loop, as with the sync client.
+        """
+        self._raise_for_status(response)
+        written = getattr(response, 'output_written', None)
+        if written is None:
+            write = _write_frames(response, tty, output_sinks(output))
+            if timeout is not None:
+                write = asyncio.wait_for(write, timeout)
+            raise _Suspend(write, record=False)
+        return written
+
+    def _get_raw_response_socket(self, response):
+        self._raise_for_status(response)
+        return response.connection
+
+    def _preconnect(self):
+        # Connections are opened by the pool as calls need them, without
+        # blocking the event loop
+        pass
+
+    def _disable_socket_timeout(self, socket):
+        pass
+
+    def _attach_websocket(self, container, params=None):
+        raise DockerException(
+            'Websocket attach is not supported by AsyncAPIClient'
+        )
+
+    def import_image(self, src=None, repository=None, tag=None, image=None,
+                     changes=None, stream_src=False):
+        if not image and is_file(src):
+            # The file would otherwise be closed before the request is sent,
+            # let the transport open it instead.
+            params = _import_image_params(
+                repository, tag, src=src, changes=changes
+            )
+            return self._result(self._post(
+                self._url('/images/create'), data=FileBody(src),
+                params=params, headers={'Content-Type': 'application/tar'},
+                timeout=None
+            ))
+        return super().import_image(
+            src=src, repository=repository, tag=tag, image=image,
+            changes=changes, stream_src=stream_src
+        )
+
+    import_image.__doc__ = ImageApiMixin.import_image.__doc__
+
+    def close(self):
+        """
+        Close all idle connections.
+        """
+        self._pool.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        self.close()
+
+
+for _name in dir(AsyncAPIClient):
+    _value = getattr(AsyncAPIClient, _name)
+    if _name.startswith('_') or _name in _SYNC_METHODS or \
+            _name in ('close', 'post', 'reload_config') or \
+            not callable(_value):
+        continue
+    setattr(AsyncAPIClient, _name, _coroutine_method(_value))
+
+
+async def _aiter_values(values):
+    for value in values:
+        yield value
+
+
+async def _json_stream(chunks, loads=None):
+    decoder = JSONStreamDecoder(loads)
+    async for data in chunks:
+        for obj in decoder.decode(data):
+            yield obj
+    for obj in decoder.flush():
+        yield obj
+
+
+async def _tty_frames(response, demux):
+    while True:
+        data = await response.read_some()
+        if not data:
+            return
+        yield (data, None) if demux else data
+
+
+async def _multiplexed_frames(response, demux):
+    while True:
+        header = await response.read_exactly(STREAM_HEADER_SIZE_BYTES)
+        if not header:
+            return
+        stream_id, length = struct.unpack('>BxxxL', header)
+        if not length:
+            continue
+        data = await response.read_exactly(length)
+        if not data:
+            return
+        yield demux_adaptor(stream_id, data) if demux else data
+
+
+async def _write_frames(response, tty, sinks):
+    response.timeout = None
+    written = [0, 0]
+    try:
+        if tty:
+            frames = _tty_frames(response, demux=True)
+        else:
+            frames = _multiplexed_frames(response, demux=True)
+        async for frame in frames:
+            for i, data in enumerate(frame):
+                if data is None:
+                    continue
+                if sinks[i] is not None:
+                    sinks[i].write(data)
+                written[i] += len(data)
+    finally:
+        response.close()
+    response.output_written = tuple(written)
+
+
+async def _write_body(response, dest):
+    response.timeout = None
+    written = 0
+    try:
+        with open_destination(dest) as f:
+            async for chunk in response.iter_chunks():
+                f.write(chunk)
+                written += len(chunk)
+    finally:
+        response.close()
+    response.output_written = written
+
+
+def _buffer_frames(buf):
+    walker = 0
+    while len(buf) - walker >= STREAM_HEADER_SIZE_BYTES:
+        stream_id, length = struct.unpack_from('>BxxxL', buf, walker)
+        start = walker + STREAM_HEADER_SIZE_BYTES
+        walker = start + length
+        yield stream_id, buf[start:walker]
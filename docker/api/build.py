@@ -16,7 +16,8 @@ class BuildApiMixin:
               decode=False, buildargs=None, gzip=False, shmsize=None,
               labels=None, cache_from=None, target=None, network_mode=None,
               squash=None, extra_hosts=None, platform=None, isolation=None,
-              use_config_proxy=True):
+              use_config_proxy=True, stream_context=False,
+              context_cache=None, reproducible_context=False):
         """
         Similar to the ``docker build`` command. Either ``path`` or ``fileobj``
         needs to be set. ``path`` can be a local path (to a directory
@@ -72,7 +73,10 @@ class BuildApiMixin:
             forcerm (bool): Always remove intermediate containers, even after
                 unsuccessful builds
             dockerfile (str): path within the build context to the Dockerfile
-            gzip (bool): If set to ``True``, gzip compression/encoding is used
+            gzip (bool or :py:class:`~docker.utils.ParallelGzip`): If set to
+                ``True``, gzip compression/encoding is used. Pass a
+                :py:class:`~docker.utils.ParallelGzip` to compress on several
+                threads, at a given level.
             buildargs (dict): A dictionary of build arguments
             container_limits (dict): A dictionary of limits applied to each
                 container created by the build process. Valid keys:
@@ -105,6 +109,19 @@ class BuildApiMixin:
                 configuration file (``~/.docker/config.json`` by default)
                 contains a proxy configuration, the corresponding environment
                 variables will be set in the container being built.
+            stream_context (bool): If ``True``, and ``path`` is a local
+                directory, upload the build context while it is being
+                archived, with chunked transfer encoding, rather than
+                writing it to a temporary file first. Default: ``False``
+            context_cache (str or :py:class:`~docker.utils.ContextCache`): If
+                ``path`` is a local directory, a cache (or the directory of a
+                cache) of the archived context files, so that only the files
+                which changed since a previous build are read again.
+            reproducible_context (bool): If ``True``, and ``path`` is a local
+                directory, normalize the metadata of the archived context
+                (ordering, owners, modes and modification times), so that
+                identical trees produce identical contexts on any host.
+                Default: ``False``
 
         Returns:
             A generator for the build output.
@@ -156,8 +173,12 @@ class BuildApiMixin:
                         [line.strip() for line in f.read().splitlines()]
                     ))
             dockerfile = process_dockerfile(dockerfile, path)
+            if isinstance(context_cache, str):
+                context_cache = utils.ContextCache(context_cache)
             context = utils.tar(
-                path, exclude=exclude, dockerfile=dockerfile, gzip=gzip
+                path, exclude=exclude, dockerfile=dockerfile, gzip=gzip,
+                stream=stream_context, cache=context_cache,
+                reproducible=reproducible_context
             )
             encoding = 'gzip' if gzip else encoding
 
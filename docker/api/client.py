@@ -1,6 +1,9 @@
-import json
+import collections
+import io
 import struct
+import threading
 import urllib
+from concurrent.futures import ThreadPoolExecutor
 from functools import partial
 
 import requests
@@ -13,6 +16,7 @@ from ..constants import (
     DEFAULT_NUM_POOLS,
     DEFAULT_NUM_POOLS_SSH,
     DEFAULT_TIMEOUT_SECONDS,
+    DEFAULT_TTY_CACHE_SIZE,
     DEFAULT_USER_AGENT,
     IS_WINDOWS_PLATFORM,
     MINIMUM_DOCKER_API_VERSION,
@@ -27,9 +31,16 @@ from ..errors import (
 from ..tls import TLSConfig
 from ..transport import UnixHTTPAdapter
 from ..utils import check_resource, config, update_headers, utils
+from ..utils.json_codec import get_json_codec
 from ..utils.json_stream import json_stream
 from ..utils.proxy import ProxyConfig
-from ..utils.socket import consume_socket_output, demux_adaptor, frames_iter
+from ..utils.socket import (
+    FrameReader,
+    demux_adaptor,
+    frames_iter,
+    output_sinks,
+)
+from ..utils.transfer import write_body
 from .build import BuildApiMixin
 from .config import ConfigApiMixin
 from .container import ContainerApiMixin
@@ -104,6 +115,11 @@ class APIClient(
             installed and configured on the host.
         max_pool_size (int): The maximum number of connections
             to save in the pool.
+        json_codec (str or :py:class:`~docker.utils.json_codec.JSONCodec`):
+            How to encode request bodies and decode response bodies: one of
+            ``json``, ``orjson`` or ``ujson``, ``auto`` for the fastest one
+            installed, or a codec object. Default: ``json``, except for
+            streamed responses, which use the fastest codec installed.
     """
 
     __attrs__ = requests.Session.__attrs__ + ['_auth_configs',
@@ -116,7 +132,7 @@ class APIClient(
                  timeout=DEFAULT_TIMEOUT_SECONDS, tls=False,
                  user_agent=DEFAULT_USER_AGENT, num_pools=None,
                  credstore_env=None, use_ssh_client=False,
-                 max_pool_size=DEFAULT_MAX_POOL_SIZE):
+                 max_pool_size=DEFAULT_MAX_POOL_SIZE, json_codec=None):
         super().__init__()
 
         if tls and not base_url:
@@ -127,6 +143,15 @@ class APIClient(
         self.base_url = base_url
         self.timeout = timeout
         self.headers['User-Agent'] = user_agent
+        self._json_codec = get_json_codec(json_codec)
+        # Streams keep their faster default unless a codec was chosen
+        self._stream_loads = (
+            self._json_codec.loads if json_codec is not None else None
+        )
+        self._tty_cache = TTYCache()
+        self._preconnect_lock = threading.Lock()
+        self._preconnect_executor = None
+        self._preconnect_future = None
 
         self._general_configs = config.load_general_config()
 
@@ -281,7 +306,7 @@ class APIClient(
         self._raise_for_status(response)
 
         if json:
-            return response.json()
+            return self._json_codec.loads(response.content)
         if binary:
             return response.content
         return response.text
@@ -289,18 +314,15 @@ class APIClient(
     def _post_json(self, url, data, **kwargs):
         # Go <1.1 can't unserialize null to a string
         # so we do this disgusting thing here.
-        data2 = {}
-        if data is not None and isinstance(data, dict):
-            for k, v in iter(data.items()):
-                if v is not None:
-                    data2[k] = v
-        elif data is not None:
-            data2 = data
+        if isinstance(data, dict):
+            data = {k: v for k, v in data.items() if v is not None}
+        elif data is None:
+            data = {}
 
         if 'headers' not in kwargs:
             kwargs['headers'] = {}
         kwargs['headers']['Content-Type'] = 'application/json'
-        return self._post(url, data=json.dumps(data2), **kwargs)
+        return self._post(url, data=self._json_codec.dumps(data), **kwargs)
 
     def _attach_params(self, override=None):
         return override or {
@@ -330,6 +352,52 @@ class APIClient(
                 'with the [websocket] extra to install it.'
             ) from ie
 
+    def _preconnect(self):
+        """
+        Open a connection to the daemon in the background, by pinging it,
+        so that it is idle in the pool when the next request is sent. Used
+        before a request which hijacks its connection, such as starting an
+        exec instance, when another request follows.
+
+        Pings run on a single worker thread, reused across calls, and a call
+        made while one is pending returns that one instead of queuing
+        another.
+
+        Returns:
+            (:py:class:`concurrent.futures.Future`): The pending ping.
+        """
+        with self._preconnect_lock:
+            pending = self._preconnect_future
+            if pending is not None and not pending.done():
+                return pending
+            if self._preconnect_executor is None:
+                self._preconnect_executor = ThreadPoolExecutor(
+                    1, thread_name_prefix='docker-preconnect'
+                )
+            self._preconnect_future = self._preconnect_executor.submit(
+                self._open_spare_connection
+            )
+            return self._preconnect_future
+
+    def _open_spare_connection(self):
+        url = self._url('/_ping')
+        if getattr(self.get_adapter(url), 'ssh_client', True) is None:
+            # Shelling out to ssh, every request gets a pool of its own
+            return
+        try:
+            # Read in full, the response leaves its connection in the pool
+            self._get(url).close()
+        except Exception:
+            # Only an optimization: errors are up to the next request
+            pass
+
+    def close(self):
+        with self._preconnect_lock:
+            if self._preconnect_executor is not None:
+                self._preconnect_executor.shutdown(wait=False)
+                self._preconnect_executor = None
+        super().close()
+
     def _get_raw_response_socket(self, response):
         self._raise_for_status(response)
         if self.base_url == "http+docker://localnpipe":
@@ -357,7 +425,10 @@ class APIClient(
 
         if response.raw._fp.chunked:
             if decode:
-                yield from json_stream(self._stream_helper(response, False))
+                yield from json_stream(
+                    self._stream_helper(response, False),
+                    loads=self._stream_loads
+                )
             else:
                 reader = response.raw
                 while not reader.closed:
@@ -421,13 +492,40 @@ class APIClient(
 
         yield from response.iter_content(chunk_size, decode)
 
-    def _read_from_socket(self, response, stream, tty=True, demux=False):
+    def _write_raw_result(self, response, dest):
+        ''' Write raw binary data to dest and return how many bytes it was'''
+        self._raise_for_status(response)
+        return write_body(response, dest)
+
+    def _read_from_socket(self, response, stream, tty=True, demux=False,
+                          timeout=None, output=None):
         """Consume all data from the socket, close the response and return the
         data. If stream=True, then a generator is returned instead and the
-        caller is responsible for closing the response.
+        caller is responsible for closing the response. timeout only applies
+        to the former, and so does output: the data is written to it instead,
+        and the number of bytes of stdout and stderr is returned.
         """
         socket = self._get_raw_response_socket(response)
 
+        if not stream:
+            # Write the frames straight out of the read buffer
+            if output is not None:
+                stdout, stderr = output_sinks(output)
+            else:
+                stdout = io.BytesIO()
+                stderr = io.BytesIO() if demux else stdout
+            try:
+                written = FrameReader(socket, tty, timeout=timeout).write_to(
+                    stdout, stderr
+                )
+            finally:
+                self._close_hijacked_response(response)
+            if output is not None:
+                return written
+            if not demux:
+                return stdout.getvalue()
+            return tuple(s.getvalue() or None for s in (stdout, stderr))
+
         gen = frames_iter(socket, tty)
 
         if demux:
@@ -437,14 +535,17 @@ class APIClient(
             # The generator will output strings
             gen = (data for (_, data) in gen)
 
-        if stream:
-            return gen
-        else:
-            try:
-                # Wait for all frames, concatenate them, and return the result
-                return consume_socket_output(gen, demux=demux)
-            finally:
-                response.close()
+        return gen
+
+    def _close_hijacked_response(self, response):
+        # The daemon closes hijacked connections when it is done with them:
+        # don't put this one back in the pool, where the next request would
+        # pick it before any live connection
+        connection = getattr(response.raw, '_connection', None)
+        if connection is not None:
+            response.raw._connection = None
+            connection.close()
+        response.close()
 
     def _disable_socket_timeout(self, socket):
         """ Depending on the combination of python version and whether we're
@@ -476,13 +577,21 @@ class APIClient(
 
     @check_resource('container')
     def _check_is_tty(self, container):
+        if self._tty_cache is not None:
+            tty = self._tty_cache.get(container)
+            if tty is not None:
+                return tty
         cont = self.inspect_container(container)
         return cont['Config']['Tty']
 
-    def _get_result(self, container, stream, res):
-        return self._get_result_tty(stream, res, self._check_is_tty(container))
+    def _get_result(self, container, stream, res, tty=None, output=None):
+        if tty is None:
+            tty = self._check_is_tty(container)
+        return self._get_result_tty(stream, res, tty, output)
 
-    def _get_result_tty(self, stream, res, is_tty):
+    def _get_result_tty(self, stream, res, is_tty, output=None):
+        if output is not None:
+            return self._write_result(res, is_tty, output)
         # We should also use raw streaming (without keep-alives)
         # if we're dealing with a tty-enabled container.
         if is_tty:
@@ -498,6 +607,18 @@ class APIClient(
                 list(self._multiplexed_buffer_helper(res))
             )
 
+    def _write_result(self, response, tty, output):
+        """Write the frames of a streamed response to output as they arrive,
+        close the response and return the number of bytes of stdout and
+        stderr."""
+        self._raise_for_status(response)
+        try:
+            return FrameReader(response.raw, tty).write_to(
+                *output_sinks(output)
+            )
+        finally:
+            response.close()
+
     def _unmount(self, *args):
         for proto in args:
             self.adapters.pop(proto)
@@ -530,3 +651,36 @@ class APIClient(
         self._auth_configs = auth.load_config(
             dockercfg_path, credstore_env=self.credstore_env
         )
+
+
+class TTYCache:
+    """
+    Whether containers were created with a TTY, by container ID, for the
+    most recently used containers. A container's TTY setting never changes,
+    so entries don't expire. Only full container IDs are recorded, since
+    a name can later refer to another container.
+    """
+
+    def __init__(self, maxsize=DEFAULT_TTY_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, container_id):
+        with self._lock:
+            tty = self._entries.get(container_id)
+            if tty is not None:
+                self._entries.move_to_end(container_id)
+            return tty
+
+    def remember(self, container):
+        """Record the TTY setting of a container's inspect result."""
+        try:
+            container_id, tty = container['Id'], container['Config']['Tty']
+        except (KeyError, TypeError):
+            return
+        with self._lock:
+            self._entries[container_id] = bool(tty)
+            self._entries.move_to_end(container_id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
@@ -14,7 +14,7 @@ from ..types import (
 class ContainerApiMixin:
     @utils.check_resource('container')
     def attach(self, container, stdout=True, stderr=True,
-               stream=False, logs=False, demux=False):
+               stream=False, logs=False, demux=False, tty=None):
         """
         Attach to a container.
 
@@ -30,6 +30,9 @@ class ContainerApiMixin:
                 of strings, rather than a single string.
             logs (bool): Include the container's previous output.
             demux (bool): Keep stdout and stderr separate.
+            tty (bool): Whether the container was created with a TTY, if
+                known. Otherwise it is looked up, with an extra request the
+                first time for each container.
 
         Returns:
             By default, the container's output as a single string (two if
@@ -58,8 +61,9 @@ class ContainerApiMixin:
         u = self._url("/containers/{0}/attach", container)
         response = self._post(u, headers=headers, params=params, stream=True)
 
-        output = self._read_from_socket(
-            response, stream, self._check_is_tty(container), demux=demux)
+        if tty is None:
+            tty = self._check_is_tty(container)
+        output = self._read_from_socket(response, stream, tty, demux=demux)
 
         if stream:
             return CancellableStream(output, response)
@@ -721,6 +725,32 @@ class ContainerApiMixin:
         )
         return self._stream_raw_result(res, chunk_size, False)
 
+    @utils.check_resource('container')
+    def export_to(self, container, dest):
+        """
+        Export the contents of a filesystem as a tar archive, writing it
+        straight to a file. The archive is received into a single reused
+        buffer rather than allocated chunk by chunk, so this is faster than
+        writing out what :py:meth:`export` yields.
+
+        Args:
+            container (str): The container to export
+            dest (str, int or file): Where to write the archive: a path,
+                which is created or truncated, a file descriptor, or a file
+                object opened in binary mode.
+
+        Returns:
+            (int): The number of bytes written
+
+        Raises:
+            :py:class:`docker.errors.APIError`
+                If the server returns an error.
+        """
+        res = self._get(
+            self._url("/containers/{0}/export", container), stream=True
+        )
+        return self._write_raw_result(res, dest)
+
     @utils.check_resource('container')
     def get_archive(self, container, path, chunk_size=DEFAULT_DATA_CHUNK_SIZE,
                     encode_stream=False):
@@ -757,6 +787,45 @@ class ContainerApiMixin:
             ...    f.write(chunk)
             >>> f.close()
         """
+        res, stat = self._get_archive_response(container, path, encode_stream)
+        return self._stream_raw_result(res, chunk_size, False), stat
+
+    @utils.check_resource('container')
+    def get_archive_to(self, container, path, dest, encode_stream=False):
+        """
+        Retrieve a file or folder from a container in the form of a tar
+        archive, writing it straight to a file. The archive is received into
+        a single reused buffer rather than allocated chunk by chunk, so this
+        is faster than writing out what :py:meth:`get_archive` yields.
+
+        Args:
+            container (str): The container where the file is located
+            path (str): Path to the file or folder to retrieve
+            dest (str, int or file): Where to write the archive: a path,
+                which is created or truncated, a file descriptor, or a file
+                object opened in binary mode.
+            encode_stream (bool): Determines if data should be encoded
+                (gzip-compressed) during transmission. Default: False
+
+        Returns:
+            (tuple): First element is the number of bytes written. Second
+            element is a dict containing ``stat`` information on the
+            specified ``path``.
+
+        Raises:
+            :py:class:`docker.errors.APIError`
+                If the server returns an error.
+
+        Example:
+
+            >>> size, stat = client.api.get_archive_to(
+            ...     container, '/bin/sh', './sh_bin.tar'
+            ... )
+        """
+        res, stat = self._get_archive_response(container, path, encode_stream)
+        return self._write_raw_result(res, dest), stat
+
+    def _get_archive_response(self, container, path, encode_stream):
         params = {
             'path': path
         }
@@ -770,7 +839,7 @@ class ContainerApiMixin:
         self._raise_for_status(res)
         encoded_stat = res.headers.get('x-docker-container-path-stat')
         return (
-            self._stream_raw_result(res, chunk_size, False),
+            res,
             utils.decode_json_header(encoded_stat) if encoded_stat else None
         )
 
@@ -790,9 +859,12 @@ class ContainerApiMixin:
             :py:class:`docker.errors.APIError`
                 If the server returns an error.
         """
-        return self._result(
+        result = self._result(
             self._get(self._url("/containers/{0}/json", container)), True
         )
+        if self._tty_cache is not None:
+            self._tty_cache.remember(result)
+        return result
 
     @utils.check_resource('container')
     def kill(self, container, signal=None):
@@ -820,7 +892,7 @@ class ContainerApiMixin:
     @utils.check_resource('container')
     def logs(self, container, stdout=True, stderr=True, stream=False,
              timestamps=False, tail='all', since=None, follow=None,
-             until=None):
+             until=None, tty=None, output=None):
         """
         Get logs from a container. Similar to the ``docker logs`` command.
 
@@ -842,16 +914,54 @@ class ContainerApiMixin:
             until (datetime, int, or float): Show logs that occurred before
                 the given datetime, integer epoch (in seconds), or
                 float (in fractional seconds)
+            tty (bool): Whether the container was created with a TTY, if
+                known. Otherwise it is looked up, with an extra request the
+                first time for each container.
+            output: Write the logs to this file object (opened in binary
+                mode) or file descriptor as they arrive, instead of returning
+                them, so that they are never held in memory whole. A tuple of
+                two writes stdout and stderr separately, either of which can
+                be ``None`` to discard that stream. Can't be used with
+                ``stream``.
 
         Returns:
-            (generator of bytes or bytes)
+            (generator of bytes or bytes or tuple): If ``output`` is set, a
+            tuple of the number of bytes of stdout and of stderr received.
 
         Raises:
             :py:class:`docker.errors.APIError`
                 If the server returns an error.
         """
+        if output is not None and stream:
+            raise errors.InvalidArgument('output can not be used with stream')
         if follow is None:
             follow = stream
+        params = self._log_params(
+            stdout=stdout, stderr=stderr, timestamps=timestamps, tail=tail,
+            since=since, follow=follow, until=until
+        )
+
+        url = self._url("/containers/{0}/logs", container)
+        if output is not None:
+            # Read the logs as they arrive rather than all at once
+            res = self._get(url, params=params, stream=True)
+            return self._get_result(container, False, res, tty, output)
+
+        res = self._get(url, params=params, stream=stream)
+        output = self._get_result(container, stream, res, tty)
+
+        if stream:
+            return CancellableStream(output, res)
+        else:
+            return output
+
+    def _log_params(self, stdout=True, stderr=True, timestamps=False,
+                    tail='all', since=None, follow=False, until=None):
+        """
+        The query parameters of a request for the logs of a container, as
+        :py:meth:`logs` takes them, shared with the log readers of
+        :py:mod:`docker.models.logs`.
+        """
         params = {'stderr': stderr and 1 or 0,
                   'stdout': stdout and 1 or 0,
                   'timestamps': timestamps and 1 or 0,
@@ -890,15 +1000,7 @@ class ContainerApiMixin:
                     f'until value should be datetime or positive int/float, '
                     f'not {type(until)}'
                 )
-
-        url = self._url("/containers/{0}/logs", container)
-        res = self._get(url, params=params, stream=stream)
-        output = self._get_result(container, stream, res)
-
-        if stream:
-            return CancellableStream(output, res)
-        else:
-            return output
+        return params
 
     @utils.check_resource('container')
     def pause(self, container):
@@ -967,7 +1069,7 @@ class ContainerApiMixin:
         return h_ports
 
     @utils.check_resource('container')
-    def put_archive(self, container, path, data):
+    def put_archive(self, container, path, data, gzip=False):
         """
         Insert a file or folder in an existing container using a tar archive as
         source.
@@ -977,6 +1079,10 @@ class ContainerApiMixin:
             path (str): Path inside the container where the file(s) will be
                 extracted. Must exist.
             data (bytes or stream): tar data to be extracted
+            gzip (bool or :py:class:`~docker.utils.ParallelGzip`): Compress
+                ``data`` with gzip while it is uploaded, on several threads.
+                ``True`` uses the default :py:class:`~docker.utils.ParallelGzip`
+                options. Default: False
 
         Returns:
             (bool): True if the call succeeds.
@@ -987,6 +1093,10 @@ class ContainerApiMixin:
         """
         params = {'path': path}
         url = self._url('/containers/{0}/archive', container)
+        if gzip:
+            if not isinstance(gzip, utils.ParallelGzip):
+                gzip = utils.ParallelGzip()
+            data = gzip.compress(data)
         res = self._put(url, params=params, data=data)
         self._raise_for_status(res)
         return res.status_code == 200
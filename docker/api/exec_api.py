@@ -6,7 +6,8 @@ class ExecApiMixin:
     @utils.check_resource('container')
     def exec_create(self, container, cmd, stdout=True, stderr=True,
                     stdin=False, tty=False, privileged=False, user='',
-                    environment=None, workdir=None, detach_keys=None):
+                    environment=None, workdir=None, detach_keys=None,
+                    timeout=None):
         """
         Sets up an exec instance in a running container.
 
@@ -29,6 +30,8 @@ class ExecApiMixin:
                 or `ctrl-<value>` where `<value>` is one of:
                 `a-z`, `@`, `^`, `[`, `,` or `_`.
                 ~/.docker/config.json is used by default.
+            timeout (float): Timeout of the request, in seconds. Default:
+                the client's timeout
 
         Returns:
             (dict): A dictionary with an exec ``Id`` key.
@@ -74,15 +77,17 @@ class ExecApiMixin:
             data['detachKeys'] = self._general_configs['detachKeys']
 
         url = self._url('/containers/{0}/exec', container)
-        res = self._post_json(url, data=data)
+        res = self._post_json(url, data=data, **_timeout(timeout))
         return self._result(res, True)
 
-    def exec_inspect(self, exec_id):
+    def exec_inspect(self, exec_id, timeout=None):
         """
         Return low-level information about an exec command.
 
         Args:
             exec_id (str): ID of the exec instance
+            timeout (float): Timeout of the request, in seconds. Default:
+                the client's timeout
 
         Returns:
             (dict): Dictionary of values returned by the endpoint.
@@ -93,7 +98,9 @@ class ExecApiMixin:
         """
         if isinstance(exec_id, dict):
             exec_id = exec_id.get('Id')
-        res = self._get(self._url("/exec/{0}/json", exec_id))
+        res = self._get(
+            self._url("/exec/{0}/json", exec_id), **_timeout(timeout)
+        )
         return self._result(res, True)
 
     def exec_resize(self, exec_id, height=None, width=None):
@@ -116,7 +123,8 @@ class ExecApiMixin:
 
     @utils.check_resource('exec_id')
     def exec_start(self, exec_id, detach=False, tty=False, stream=False,
-                   socket=False, demux=False):
+                   socket=False, demux=False, timeout=None, output=None,
+                   preconnect=False):
         """
         Start a previously set up exec instance.
 
@@ -130,6 +138,21 @@ class ExecApiMixin:
             socket (bool): Return the connection socket to allow custom
                 read/write operations. Must be closed by the caller when done.
             demux (bool): Return stdout and stderr separately
+            timeout (float): Give up waiting for the output of the command
+                after this many seconds, raising :py:class:`socket.timeout`.
+                The command itself keeps running. Has no effect if ``stream``
+                or ``socket`` is ``True``. Default: no timeout
+            output: Write the output of the command to this file object
+                (opened in binary mode) or file descriptor as it arrives,
+                instead of returning it, so that it is never held in memory
+                whole. A tuple of two writes stdout and stderr separately,
+                either of which can be ``None`` to discard that stream.
+                Can't be used with ``stream`` or ``socket``.
+            preconnect (bool): Open a connection to the daemon in the
+                background while the command runs, to be ready for the next
+                request, such as :py:meth:`exec_inspect`: the daemon takes
+                over the one the command runs on. Has no effect if
+                ``detach`` is ``True``. Default: False
 
         Returns:
 
@@ -137,13 +160,18 @@ class ExecApiMixin:
             yielding response chunks. If ``socket=True``, a socket object for
             the connection. A string containing response data otherwise. If
             ``demux=True``, a tuple with two elements of type byte: stdout and
-            stderr.
+            stderr. If ``output`` is set, a tuple of the number of bytes of
+            stdout and of stderr received.
 
         Raises:
             :py:class:`docker.errors.APIError`
                 If the server returns an error.
         """
         # we want opened socket if socket == True
+        if output is not None and (stream or socket):
+            raise errors.InvalidArgument(
+                'output can not be used with stream or socket'
+            )
 
         data = {
             'Tty': tty,
@@ -155,12 +183,11 @@ class ExecApiMixin:
             'Upgrade': 'tcp'
         }
 
-        res = self._post_json(
-            self._url('/exec/{0}/start', exec_id),
-            headers=headers,
-            data=data,
-            stream=True
-        )
+        url = self._url('/exec/{0}/start', exec_id)
+        res = self._post_json(url, headers=headers, data=data, stream=True)
+        if preconnect and not detach:
+            # The daemon hijacks the connection, which can't be reused
+            self._preconnect()
         if detach:
             try:
                 return self._result(res)
@@ -169,8 +196,16 @@ class ExecApiMixin:
         if socket:
             return self._get_raw_response_socket(res)
 
-        output = self._read_from_socket(res, stream, tty=tty, demux=demux)
+        output = self._read_from_socket(
+            res, stream, tty=tty, demux=demux, timeout=timeout,
+            output=output
+        )
         if stream:
             return CancellableStream(output, res)
         else:
             return output
+
+
+def _timeout(timeout):
+    # None leaves the client's timeout, rather than disabling it
+    return {} if timeout is None else {'timeout': timeout}
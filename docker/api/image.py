@@ -38,6 +38,11 @@ class ImageApiMixin:
         res = self._get(self._url("/images/{0}/get", image), stream=True)
         return self._stream_raw_result(res, chunk_size, False)
 
+    def _get_image_response(self, image):
+        res = self._get(self._url("/images/{0}/get", image), stream=True)
+        self._raise_for_status(res)
+        return res
+
     @utils.check_resource('image')
     def history(self, image):
         """
@@ -35,7 +35,9 @@ class PluginApiMixin:
                 plugin_data_dir (string): Path to the plugin data directory.
                     Plugin data directory must contain the ``config.json``
                     manifest file and the ``rootfs`` directory.
-                gzip (bool): Compress the context using gzip. Default: False
+                gzip (bool or :py:class:`~docker.utils.ParallelGzip`):
+                    Compress the context using gzip, on several threads with
+                    a :py:class:`~docker.utils.ParallelGzip`. Default: False
 
             Returns:
                 ``True`` if successful
@@ -1,11 +1,14 @@
+import concurrent.futures
 import os
+import threading
 
 from .api.client import APIClient
-from .constants import DEFAULT_MAX_POOL_SIZE, DEFAULT_TIMEOUT_SECONDS
+from .constants import DEFAULT_MAX_WORKERS, DEFAULT_TIMEOUT_SECONDS
 from .context import ContextAPI
 from .models.configs import ConfigCollection
 from .models.containers import ContainerCollection
 from .models.images import ImageCollection
+from .models.mirror import StateMirror
 from .models.networks import NetworkCollection
 from .models.nodes import NodeCollection
 from .models.plugins import PluginCollection
@@ -14,6 +17,7 @@ from .models.services import ServiceCollection
 from .models.swarm import Swarm
 from .models.volumes import VolumeCollection
 from .utils import kwargs_from_env
+from .utils.concurrency import check_max_workers
 
 
 class DockerClient:
@@ -42,10 +46,36 @@ class DockerClient:
             via shelling out to the ssh client. Ensure the ssh client is
             installed and configured on the host.
         max_pool_size (int): The maximum number of connections
-            to save in the pool.
+            to save in the pool. Default: 32, one for each thread the
+            methods which take ``max_workers`` may use.
+        json_codec (str or :py:class:`~docker.utils.json_codec.JSONCodec`):
+            How to encode request bodies and decode response bodies: one of
+            ``json``, ``orjson`` or ``ujson``, ``auto`` for the fastest one
+            installed, or a codec object. Default: ``json``
     """
     def __init__(self, *args, **kwargs):
+        # Enough connections for every thread of the shared executor
+        kwargs.setdefault('max_pool_size', DEFAULT_MAX_WORKERS)
         self.api = APIClient(*args, **kwargs)
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        self._mirror = None
+
+    def _get_executor(self, max_workers=None):
+        """
+        The thread pool shared by the methods which fan requests out, such as
+        ``containers.list(max_workers=...)``. It is created on first use.
+        ``max_workers``, the concurrency the caller will use, is checked
+        against the size of the pool.
+        """
+        check_max_workers(max_workers)
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=DEFAULT_MAX_WORKERS,
+                    thread_name_prefix='docker-client'
+                )
+            return self._executor
 
     @classmethod
     def from_env(cls, **kwargs):
@@ -73,7 +103,7 @@ class DockerClient:
                 automatically detect the server's version. Default: ``auto``
             timeout (int): Default timeout for API calls, in seconds.
             max_pool_size (int): The maximum number of connections
-                to save in the pool.
+                to save in the pool. Default: 32
             environment (dict): The environment to read environment variables
                 from. Default: the value of ``os.environ``
             credstore_env (dict): Override environment variables when calling
@@ -85,6 +115,10 @@ class DockerClient:
                 current Docker CLI context (``~/.docker/config.json`` /
                 ``DOCKER_CONTEXT``) when ``DOCKER_HOST`` is not set. This
                 allows the client to talk to Docker Desktop out of the box.
+            json_codec (str or :py:class:`~docker.utils.json_codec.JSONCodec`):
+                How to encode request bodies and decode response bodies: one
+                of ``json``, ``orjson`` or ``ujson``, ``auto`` for the
+                fastest one installed, or a codec object. Default: ``json``
 
         Example:
 
@@ -95,10 +129,11 @@ class DockerClient:
             https://docs.python.org/3.5/library/ssl.html#ssl.PROTOCOL_TLSv1
         """
         timeout = kwargs.pop('timeout', DEFAULT_TIMEOUT_SECONDS)
-        max_pool_size = kwargs.pop('max_pool_size', DEFAULT_MAX_POOL_SIZE)
+        max_pool_size = kwargs.pop('max_pool_size', DEFAULT_MAX_WORKERS)
         version = kwargs.pop('version', None)
         use_ssh_client = kwargs.pop('use_ssh_client', False)
         use_context = kwargs.pop('use_context', True)
+        json_codec = kwargs.pop('json_codec', None)
         environment = kwargs.get('environment') or os.environ
 
         params = kwargs_from_env(**kwargs)
@@ -112,6 +147,7 @@ class DockerClient:
             max_pool_size=max_pool_size,
             version=version,
             use_ssh_client=use_ssh_client,
+            json_codec=json_codec,
             **params,
         )
 
@@ -133,7 +169,7 @@ class DockerClient:
                 automatically detect the server's version.
             timeout (int): Default timeout for API calls, in seconds.
             max_pool_size (int): The maximum number of connections to save in
-                the pool.
+                the pool. Default: 32
             use_ssh_client (bool): If ``True``, shell out to the ssh client
                 for ssh:// contexts.
 
@@ -145,7 +181,7 @@ class DockerClient:
             >>> client = docker.DockerClient.from_context('desktop-linux')
         """
         timeout = kwargs.pop('timeout', DEFAULT_TIMEOUT_SECONDS)
-        max_pool_size = kwargs.pop('max_pool_size', DEFAULT_MAX_POOL_SIZE)
+        max_pool_size = kwargs.pop('max_pool_size', DEFAULT_MAX_WORKERS)
         version = kwargs.pop('version', None)
         use_ssh_client = kwargs.pop('use_ssh_client', False)
 
@@ -241,6 +277,28 @@ class DockerClient:
         """
         return VolumeCollection(client=self)
 
+    def start_mirror(self, *args, **kwargs):
+        """
+        Start keeping a copy of the state of the server up to date from its
+        events, and answer ``get()`` and unfiltered ``list()`` calls on
+        containers, images, networks and volumes from it. Takes the same
+        arguments as :py:class:`~docker.models.mirror.StateMirror`.
+
+        Returns:
+            (:py:class:`~docker.models.mirror.StateMirror`): The started
+            mirror. Call its :py:meth:`~docker.models.mirror.StateMirror.stop`
+            method to go back to querying the server.
+
+        Raises:
+            :py:class:`docker.errors.APIError`
+                If the server returns an error.
+        """
+        if self._mirror is not None:
+            self._mirror.stop()
+        mirror = StateMirror(self, *args, **kwargs)
+        mirror.start()
+        return mirror
+
     # Top-level methods
     def events(self, *args, **kwargs):
         return self.api.events(*args, **kwargs)
@@ -267,6 +325,12 @@ class DockerClient:
     version.__doc__ = APIClient.version.__doc__
 
     def close(self):
+        if self._mirror is not None:
+            self._mirror.stop()
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
         return self.api.close()
     close.__doc__ = APIClient.close.__doc__
 
@@ -39,7 +39,27 @@ DEFAULT_NUM_POOLS_SSH = 9
 
 DEFAULT_MAX_POOL_SIZE = 10
 
+# How many containers' TTY setting a client remembers
+DEFAULT_TTY_CACHE_SIZE = 256
+
+# Threads of the pool shared by the methods of DockerClient which fan
+# requests out (e.g. containers.list(max_workers=...)), and the most any of
+# them may use. DockerClient keeps as many connections in its pool.
+DEFAULT_MAX_WORKERS = 32
+
 DEFAULT_DATA_CHUNK_SIZE = 1024 * 2048
 
+# Size of the buffer that multiplexed attach, exec and log streams are read
+# into. Many small frames are parsed out of a single read.
+DEFAULT_FRAME_BUFFER_SIZE = 64 * 1024
+
+# Chunks in which streamed archives (e.g. build(stream_context=True)) are
+# sent, and how many of them may be produced ahead of the upload
+STREAM_ARCHIVE_CHUNK_SIZE = 64 * 1024
+STREAM_ARCHIVE_MAX_CHUNKS = 16
+
+# Size of the blocks which parallel gzip compression deflates independently
+DEFAULT_GZIP_BLOCK_SIZE = 128 * 1024
+
 DEFAULT_SWARM_ADDR_POOL = ['10.0.0.0/8']
 DEFAULT_SWARM_SUBNET_SIZE = 24
@@ -1,5 +1,9 @@
 import copy
+import errno
 import ntpath
+import os
+import socket
+import time
 from collections import namedtuple
 
 from ..api import APIClient
@@ -8,13 +12,29 @@ from ..errors import (
     ContainerError,
     DockerException,
     ImageNotFound,
+    InvalidArgument,
     NotFound,
     create_unexpected_kwargs_error,
 )
 from ..types import HostConfig, NetworkingConfig
-from ..utils import version_gte
+from ..utils import stream_archive, version_gte
+from ..utils.build import PatternMatcher
+from ..utils.concurrency import (
+    bounded_as_completed,
+    bounded_map,
+    check_max_workers,
+)
+from ..utils.transfer import (
+    extract_archive,
+    iter_body,
+    shared_buffer,
+    stream_body,
+)
 from .images import Image
+from .logs import LogFollower, read_columns
 from .resource import Collection, Model
+from .stats import StatsCollector
+from .sync import sync_path
 
 
 class Container(Model):
@@ -82,6 +102,13 @@ class Container(Model):
         """
         return self.attrs.get('NetworkSettings', {}).get('Ports', {})
 
+    def _with_tty(self, kwargs):
+        # Spares the API client a lookup of what the attributes already say
+        tty = (self.attrs.get('Config') or {}).get('Tty')
+        if tty is not None:
+            kwargs.setdefault('tty', tty)
+        return kwargs
+
     def attach(self, **kwargs):
         """
         Attach to this container.
@@ -96,6 +123,9 @@ class Container(Model):
             stream (bool): Return container output progressively as an iterator
                 of strings, rather than a single string.
             logs (bool): Include the container's previous output.
+            tty (bool): Whether the container was created with a TTY.
+                Default: as recorded in :py:attr:`attrs`, or looked up if
+                they don't say
 
         Returns:
             By default, the container's output as a single string.
@@ -106,7 +136,7 @@ class Container(Model):
             :py:class:`docker.errors.APIError`
                 If the server returns an error.
         """
-        return self.client.api.attach(self.id, **kwargs)
+        return self.client.api.attach(self.id, **self._with_tty(kwargs))
 
     def attach_socket(self, **kwargs):
         """
@@ -150,6 +180,47 @@ class Container(Model):
                                       **kwargs)
         return self.client.images.get(resp['Id'])
 
+    def copy_to(self, path, target, dest, gzip=False):
+        """
+        Copy a file or folder from this container into another one, which
+        can be on another host, without storing it locally: the archive
+        retrieved from this container is sent to the other as it is
+        received, with a bounded buffer in between.
+
+        Args:
+            path (str): Path to the file or folder to copy
+            target (:py:class:`Container`): The container to copy to, from
+                any :py:class:`~docker.client.DockerClient`
+            dest (str): Path inside ``target`` where the file or folder
+                will be extracted. Must exist.
+            gzip (bool or :py:class:`~docker.utils.ParallelGzip`): Compress
+                the archive with gzip on its way to ``target``.
+                Default: False
+
+        Returns:
+            (dict): ``stat`` information on the specified ``path``.
+
+        Raises:
+            :py:class:`docker.errors.APIError`
+                If either server returns an error.
+
+        Example:
+
+            >>> remote = docker.DockerClient(base_url='tcp://host:2376')
+            >>> target = remote.containers.get('db')
+            >>> container.copy_to('/var/backups', target, '/restore')
+        """
+        res, stat = self.client.api._get_archive_response(
+            self.id, path, False
+        )
+        data = stream_body(res)
+        try:
+            target.put_archive(dest, data, gzip=gzip)
+        finally:
+            data.close()
+            res.close()
+        return stat
+
     def diff(self):
         """
         Inspect changes on a container's filesystem.
@@ -166,7 +237,8 @@ class Container(Model):
 
     def exec_run(self, cmd, stdout=True, stderr=True, stdin=False, tty=False,
                  privileged=False, user='', detach=False, stream=False,
-                 socket=False, environment=None, workdir=None, demux=False):
+                 socket=False, environment=None, workdir=None, demux=False,
+                 preconnect=False):
         """
         Run a command inside this container. Similar to
         ``docker exec``.
@@ -190,6 +262,12 @@ class Container(Model):
                 ``{"PASSWORD": "xxx"}``.
             workdir (str): Path to working directory for this exec session
             demux (bool): Return stdout and stderr separately
+            preconnect (bool): Open a connection to the daemon while the
+                command runs, for the request which fetches its exit code,
+                as :py:meth:`~docker.api.exec_api.ExecApiMixin.exec_start`
+                does. The connection is then not opened after the command
+                ends, at the cost of a ping to the daemon. Has no effect
+                with ``detach``, ``stream`` or ``socket``. Default: False
 
         Returns:
             (ExecResult): A tuple of (exit_code, output)
@@ -211,9 +289,13 @@ class Container(Model):
             privileged=privileged, user=user, environment=environment,
             workdir=workdir,
         )
+        kwargs = {}
+        if preconnect and not (detach or stream or socket):
+            # Only exec_inspect follows a command run to the end
+            kwargs['preconnect'] = True
         exec_output = self.client.api.exec_start(
             resp['Id'], detach=detach, tty=tty, stream=stream, socket=socket,
-            demux=demux
+            demux=demux, **kwargs
         )
         if socket or stream:
             return ExecResult(None, exec_output)
@@ -241,6 +323,26 @@ class Container(Model):
         """
         return self.client.api.export(self.id, chunk_size)
 
+    def export_to(self, dest):
+        """
+        Export the contents of the container's filesystem as a tar archive,
+        writing it straight to a file, faster than writing out what
+        :py:meth:`export` yields.
+
+        Args:
+            dest (str, int or file): Where to write the archive: a path,
+                which is created or truncated, a file descriptor, or a file
+                object opened in binary mode.
+
+        Returns:
+            (int): The number of bytes written
+
+        Raises:
+            :py:class:`docker.errors.APIError`
+                If the server returns an error.
+        """
+        return self.client.api.export_to(self.id, dest)
+
     def get_archive(self, path, chunk_size=DEFAULT_DATA_CHUNK_SIZE,
                     encode_stream=False):
         """
@@ -277,6 +379,88 @@ class Container(Model):
         return self.client.api.get_archive(self.id, path,
                                            chunk_size, encode_stream)
 
+    def get_archive_to(self, path, dest, encode_stream=False):
+        """
+        Retrieve a file or folder from the container in the form of a tar
+        archive, writing it straight to a file, faster than writing out what
+        :py:meth:`get_archive` yields.
+
+        Args:
+            path (str): Path to the file or folder to retrieve
+            dest (str, int or file): Where to write the archive: a path,
+                which is created or truncated, a file descriptor, or a file
+                object opened in binary mode.
+            encode_stream (bool): Determines if data should be encoded
+                (gzip-compressed) during transmission. Default: False
+
+        Returns:
+            (tuple): First element is the number of bytes written. Second
+            element is a dict containing ``stat`` information on the
+            specified ``path``.
+
+        Raises:
+            :py:class:`docker.errors.APIError`
+                If the server returns an error.
+
+        Example:
+
+            >>> size, stat = container.get_archive_to('/bin/sh', 'sh.tar')
+        """
+        return self.client.api.get_archive_to(
+            self.id, path, dest, encode_stream=encode_stream
+        )
+
+    def get_path(self, path, dest, max_workers=8):
+        """
+        Copy a file or folder out of the container, like ``docker cp``,
+        extracting the archive as it is received instead of storing it
+        first. Files are written on several threads, with their permissions
+        and modification times.
+
+        Args:
+            path (str): Path to the file or folder to copy
+            dest (str): Where to copy it: into the directory if ``dest`` is
+                an existing directory, otherwise to the new name ``dest``,
+                whose parent directory must exist.
+            max_workers (int): The maximum number of files written at
+                once, on a thread pool shared by the client, at most 32.
+                Default: 8
+
+        Returns:
+            (dict): ``stat`` information on the specified ``path``.
+
+        Raises:
+            :py:class:`docker.errors.APIError`
+                If the server returns an error.
+            :py:class:`docker.errors.DockerException`
+                If the archive has a member which would be written outside
+                of ``dest``.
+
+        Example:
+
+            >>> container.get_path('/etc/nginx', './nginx-conf')
+        """
+        executor = self.client._get_executor(max_workers)
+        if os.path.isdir(dest):
+            root, rename = dest, None
+        else:
+            root, rename = os.path.split(os.path.abspath(dest))
+            if not os.path.isdir(root):
+                raise FileNotFoundError(
+                    errno.ENOENT, 'No such directory', root
+                )
+        res, stat = self.client.api._get_archive_response(
+            self.id, path, False
+        )
+        try:
+            extract_archive(
+                iter_body(res), root, rename=rename,
+                executor=executor, max_workers=max_workers
+            )
+        finally:
+            res.close()
+        return stat
+
     def kill(self, signal=None):
         """
         Kill or send a signal to the container.
@@ -312,15 +496,62 @@ class Container(Model):
             until (datetime, int, or float): Show logs that occurred before
                 the given datetime, integer epoch (in seconds), or
                 float (in nanoseconds)
+            tty (bool): Whether the container was created with a TTY.
+                Default: as recorded in :py:attr:`attrs`, or looked up if
+                they don't say
+            output: Write the logs to this file object (opened in binary
+                mode) or file descriptor as they arrive, instead of returning
+                them, so that they are never held in memory whole. A tuple of
+                two writes stdout and stderr separately, either of which can
+                be ``None`` to discard that stream. Can't be used with
+                ``stream``.
+
+        Returns:
+            (generator of bytes or bytes or tuple): Logs from the container.
+            If ``output`` is set, a tuple of the number of bytes of stdout
+            and of stderr received.
+
+        Raises:
+            :py:class:`docker.errors.APIError`
+                If the server returns an error.
+        """
+        return self.client.api.logs(self.id, **self._with_tty(kwargs))
+
+    def logs_columnar(self, stdout=True, stderr=True, since=None,
+                      until=None, tail='all'):
+        """
+        Get the logs of this container in columnar form, for analysis.
+
+        The lines are stored in a single buffer, along with arrays of their
+        offsets, streams and timestamps, which are parsed in bulk. With
+        NumPy installed, the arrays are NumPy arrays, and timestamps are
+        ``datetime64[ns]`` values, so lines can be filtered and sliced with
+        array operations rather than a Python loop over each line. Lines
+        the daemon split into several messages are put back together.
+
+        Args:
+            stdout (bool): Get ``STDOUT``. Default ``True``
+            stderr (bool): Get ``STDERR``. Default ``True``
+            since (datetime, int, or float): Show logs since a given datetime,
+                integer epoch (in seconds) or float (in fractional seconds)
+            until (datetime, int, or float): Show logs that occurred before
+                the given datetime, integer epoch (in seconds), or
+                float (in fractional seconds)
+            tail (str or int): Output specified number of lines at the end of
+                logs. Either an integer of number of lines or the string
+                ``all``. Default ``all``
 
         Returns:
-            (generator of bytes or bytes): Logs from the container.
+            (:py:class:`~docker.models.logs.LogColumns`): The logs.
 
         Raises:
             :py:class:`docker.errors.APIError`
                 If the server returns an error.
         """
-        return self.client.api.logs(self.id, **kwargs)
+        return read_columns(
+            self.client.api, self.id, stdout=stdout, stderr=stderr,
+            since=since, until=until, tail=tail
+        )
 
     def pause(self):
         """
@@ -332,7 +563,7 @@ class Container(Model):
         """
         return self.client.api.pause(self.id)
 
-    def put_archive(self, path, data):
+    def put_archive(self, path, data, **kwargs):
         """
         Insert a file or folder in this container using a tar archive as
         source.
@@ -341,6 +572,10 @@ class Container(Model):
             path (str): Path inside the container where the file(s) will be
                 extracted. Must exist.
             data (bytes or stream): tar data to be extracted
+            gzip (bool or :py:class:`~docker.utils.ParallelGzip`): Compress
+                ``data`` with gzip while it is uploaded, on several threads.
+                ``True`` uses the default :py:class:`~docker.utils.ParallelGzip`
+                options. Default: False
 
         Returns:
             (bool): True if the call succeeds.
@@ -348,7 +583,48 @@ class Container(Model):
         Raises:
             :py:class:`~docker.errors.APIError` If an error occurs.
         """
-        return self.client.api.put_archive(self.id, path, data)
+        return self.client.api.put_archive(self.id, path, data, **kwargs)
+
+    def put_path(self, src, path, exclude=None, gzip=False):
+        """
+        Copy the contents of a local directory into this container. The tar
+        archive is built from the directory while it is uploaded, in a
+        chunked request, so it is never held in memory or stored on disk
+        whatever the size of the directory.
+
+        Args:
+            src (str): Path to the local directory to copy
+            path (str): Path to the directory inside the container where
+                the contents of ``src`` will be extracted. Must exist.
+            exclude (list): ``.dockerignore``-style patterns of the paths,
+                relative to ``src``, to leave out
+            gzip (bool or :py:class:`~docker.utils.ParallelGzip`): Compress
+                the archive with gzip while it is uploaded, on several
+                threads. Default: False
+
+        Returns:
+            (bool): True if the call succeeds.
+
+        Raises:
+            :py:class:`~docker.errors.APIError` If an error occurs.
+
+        Example:
+
+            >>> container.put_path('./static', '/usr/share/nginx/html',
+            ...                    exclude=['*.map', '.git'], gzip=True)
+        """
+        root = os.path.abspath(src)
+        if not os.path.isdir(root):
+            raise NotADirectoryError(errno.ENOTDIR, 'Not a directory', src)
+        # The directory is walked as the archive is produced
+        files = PatternMatcher(exclude or []).walk(root)
+        data = stream_archive(root, files=files)
+        try:
+            return self.client.api.put_archive(
+                self.id, path, data, gzip=gzip
+            )
+        finally:
+            data.close()
 
     def remove(self, **kwargs):
         """
@@ -409,6 +685,54 @@ class Container(Model):
         """
         return self.client.api.restart(self.id, **kwargs)
 
+    def sync_path(self, src, path, exclude=None, delete=True,
+                  checksum=False, gzip=False):
+        """
+        Bring a directory in this container up to date with a local
+        directory, sending only what changed, like ``rsync``.
+
+        The files in the container are listed by running ``find`` and
+        ``stat`` in it. Files whose type, size or permissions differ are
+        sent, and so are files whose modification time differs, unless
+        ``checksum`` is set and their SHA-256 digests (computed by
+        ``sha256sum`` in the container) match. Directories are sent, without
+        their contents, when their type or permissions differ. What is sent
+        goes in a single tar archive, built while it is uploaded.
+
+        Args:
+            src (str): Path to the local directory
+            path (str): Path to the directory inside the container. Must
+                exist.
+            exclude (list): ``.dockerignore``-style patterns of the paths,
+                relative to ``src``, to leave out. They are neither sent nor
+                deleted.
+            delete (bool): Delete the files in the container which are not
+                in ``src``. Default: True
+            checksum (bool): Compare the contents of the files whose size
+                matches but modification time doesn't. Default: False
+            gzip (bool or :py:class:`~docker.utils.ParallelGzip`): Compress
+                the archive with gzip while it is uploaded. Default: False
+
+        Returns:
+            (SyncResult): A tuple of ``(sent, deleted)``, the lists of paths
+            sent and deleted, relative to ``path``.
+
+        Raises:
+            :py:class:`docker.errors.APIError`
+                If the server returns an error.
+            :py:class:`docker.errors.DockerException`
+                If a command run in the container fails.
+
+        Example:
+
+            >>> container.sync_path('./src', '/app', exclude=['.git'])
+            SyncResult(sent=['main.py'], deleted=['old.py'])
+        """
+        return sync_path(
+            self, src, path, exclude=exclude, delete=delete,
+            checksum=checksum, gzip=gzip
+        )
+
     def start(self, **kwargs):
         """
         Start this container. Similar to the ``docker start`` command, but
@@ -531,6 +855,7 @@ class Container(Model):
 
 class ContainerCollection(Collection):
     model = Container
+    mirror_resource = 'containers'
 
     def run(self, image, command=None, stdout=True, stderr=False,
             remove=False, **kwargs):
@@ -952,11 +1277,14 @@ class ContainerCollection(Collection):
             :py:class:`docker.errors.APIError`
                 If the server returns an error.
         """
+        container = self._get_mirrored(container_id)
+        if container is not None:
+            return container
         resp = self.client.api.inspect_container(container_id)
         return self.prepare_model(resp)
 
     def list(self, all=False, before=None, filters=None, limit=-1, since=None,
-             sparse=False, ignore_removed=False):
+             sparse=False, ignore_removed=False, max_workers=None):
         """
         List containers. Similar to the ``docker ps`` command.
 
@@ -999,6 +1327,11 @@ class ContainerCollection(Collection):
                 when attempting to inspect containers from the original list.
                 Set to ``True`` if race conditions are likely. Has no effect
                 if ``sparse=True``. Default: ``False``
+            max_workers (int): Inspect up to this many containers
+                concurrently, on a thread pool shared by the client, at most
+                32. Results are returned in the same order either way. Has
+                no effect if ``sparse=True``. Default: ``None`` (one at a
+                time)
 
         Returns:
             (list of :py:class:`Container`)
@@ -1007,21 +1340,309 @@ class ContainerCollection(Collection):
             :py:class:`docker.errors.APIError`
                 If the server returns an error.
         """
+        check_max_workers(max_workers)
+        if not sparse and before is None and since is None and \
+                filters is None and limit == -1:
+            containers = self._list_mirrored()
+            if containers is not None:
+                return [
+                    c for c in containers if all or c.attrs['State']['Running']
+                ]
+
         resp = self.client.api.containers(all=all, before=before,
                                           filters=filters, limit=limit,
                                           since=since)
         if sparse:
             return [self.prepare_model(r) for r in resp]
+
+        def get(r):
+            try:
+                return self.get(r['Id'])
+            # a container may have been removed while iterating
+            except NotFound:
+                if not ignore_removed:
+                    raise
+
+        if max_workers is None:
+            containers = map(get, resp)
+        else:
+            containers = bounded_map(
+                self.client._get_executor(), get, resp, max_workers
+            )
+        return [c for c in containers if c is not None]
+
+    def exec_run_many(self, cmd, containers=None, filters=None,
+                      max_workers=8, timeout=None, stdout=True, stderr=True,
+                      tty=False, privileged=False, user='', environment=None,
+                      workdir=None):
+        """
+        Run a command in many containers at once, like
+        :py:meth:`Container.exec_run` in each of them.
+
+        Results are yielded as the commands finish, in no particular order.
+        A failure in one container, such as the container being gone or the
+        command timing out, is reported in its result rather than raised, so
+        that it doesn't get in the way of the others.
+
+        Args:
+            cmd (str or list): Command to be executed
+            containers (list): :py:class:`Container` objects, or container
+                names or IDs, to run the command in.
+            filters (dict): Run the command in the running containers
+                matching these filters instead, as in :py:meth:`list`. For
+                example ``{'label': 'app=web'}``. By default, the command is
+                run in all running containers. Ignored if ``containers`` is
+                given.
+            max_workers (int): Run the command in up to this many containers
+                concurrently, on a thread pool shared by the client, at most
+                32. Default: 8
+            timeout (float): Give up on a container after this many
+                seconds, counted from when the exec instance is created in
+                it: creating it, running the command and fetching its exit
+                code all count. The command itself keeps running. Default:
+                no timeout, and the client's timeout for each request
+            stdout (bool): Attach to stdout. Default: ``True``
+            stderr (bool): Attach to stderr. Default: ``True``
+            tty (bool): Allocate a pseudo-TTY. Default: False
+            privileged (bool): Run as privileged.
+            user (str): User to execute command as. Default: root
+            environment (dict or list): A dictionary or a list of strings in
+                the following format ``["PASSWORD=xxx"]`` or
+                ``{"PASSWORD": "xxx"}``.
+            workdir (str): Path to working directory for this exec session
+
+        Returns:
+            (generator): :py:class:`ContainerExecResult` tuples of
+            ``(container, exit_code, output, error)``:
+                container: (:py:class:`Container`): Where the command ran.
+                exit_code: (int): Exit code of the command, or ``None`` if
+                    it failed to run or timed out.
+                output: (tuple): stdout and stderr, as with
+                    ``exec_run(demux=True)``, or ``None`` if the command
+                    failed to run or timed out.
+                error: (Exception): Why the command failed to run or timed
+                    out, such as :py:class:`docker.errors.NotFound` or
+                    :py:class:`socket.timeout`, or ``None``.
+
+        Raises:
+            :py:class:`docker.errors.APIError`
+                If listing the containers fails.
+
+        Example:
+
+            >>> results = client.containers.exec_run_many(
+            ...     'uptime', filters={'label': 'app=web'}, max_workers=16,
+            ...     timeout=10
+            ... )
+            >>> for container, exit_code, output, error in results:
+            ...     print(container.short_id, exit_code, error or output[0])
+        """
+        executor = self.client._get_executor(max_workers)
+        if containers is None:
+            containers = [
+                self.prepare_model(r)
+                for r in self.client.api.containers(filters=filters)
+            ]
+        else:
+            containers = [
+                c if isinstance(c, Container)
+                else self.prepare_model({'Id': c})
+                for c in containers
+            ]
+
+        def run(container):
+            deadline = None
+            if timeout is not None:
+                deadline = time.monotonic() + timeout
+
+            def remaining():
+                # What is left of the timeout for the next request
+                if deadline is None:
+                    return None
+                left = deadline - time.monotonic()
+                if left <= 0:
+                    raise socket.timeout('timed out')
+                return left
+
+            try:
+                resp = self.client.api.exec_create(
+                    container.id, cmd, stdout=stdout, stderr=stderr, tty=tty,
+                    privileged=privileged, user=user,
+                    environment=environment, workdir=workdir,
+                    timeout=remaining(),
+                )
+                output = self.client.api.exec_start(
+                    resp['Id'], tty=tty, demux=True, timeout=remaining()
+                )
+                info = self.client.api.exec_inspect(
+                    resp['Id'], timeout=remaining()
+                )
+            # requests and socket errors are OSErrors
+            except (DockerException, OSError) as e:
+                return ContainerExecResult(container, None, None, e)
+            return ContainerExecResult(
+                container, info['ExitCode'], output, None
+            )
+
+        return bounded_as_completed(executor, run, containers, max_workers)
+
+    def put_archive_many(self, path, data=None, src=None, containers=None,
+                         filters=None, exclude=None, gzip=False,
+                         max_workers=8):
+        """
+        Insert the same files in many containers at once, like
+        :py:meth:`Container.put_archive` in each of them.
+
+        The archive is built and compressed once, stored in a read-only
+        memory map of a temporary file, and uploaded from there to every
+        container without being copied again.
+
+        Results are yielded as the uploads finish, in no particular order.
+        A failure in one container is reported in its result rather than
+        raised, so that it doesn't get in the way of the others.
+
+        Args:
+            path (str): Path inside the containers where the file(s) will be
+                extracted. Must exist.
+            data (bytes, stream or iterable): tar data to be extracted
+            src (str): Path to a local directory to archive instead of
+                ``data``: its contents are extracted into ``path``.
+            containers (list): :py:class:`Container` objects, or container
+                names or IDs, to upload to.
+            filters (dict): Upload to the running containers matching these
+                filters instead, as in :py:meth:`list`. For example
+                ``{'label': 'app=web'}``. By default, the archive is
+                uploaded to all running containers. Ignored if
+                ``containers`` is given.
+            exclude (list): ``.dockerignore``-style patterns of the paths,
+                relative to ``src``, to leave out
+            gzip (bool or :py:class:`~docker.utils.ParallelGzip`): Compress
+                the archive with gzip, once for all the containers.
+                Default: False
+            max_workers (int): Upload to up to this many containers
+                concurrently, on a thread pool shared by the client, at most
+                32. Default: 8
+
+        Returns:
+            (generator): :py:class:`ContainerPutResult` tuples of
+            ``(container, error)``:
+                container: (:py:class:`Container`): Where the archive was
+                    uploaded.
+                error: (Exception): Why the upload failed, such as
+                    :py:class:`docker.errors.NotFound`, or ``None``.
+
+        Raises:
+            :py:class:`docker.errors.InvalidArgument`
+                If neither or both of ``data`` and ``src`` are given.
+            :py:class:`docker.errors.APIError`
+                If listing the containers fails.
+
+        Example:
+
+            >>> results = client.containers.put_archive_many(
+            ...     '/etc/app', src='./config', filters={'label': 'app=web'}
+            ... )
+            >>> failed = [r for r in results if r.error]
+        """
+        if (data is None) == (src is None):
+            raise InvalidArgument('Exactly one of data and src is needed')
+        executor = self.client._get_executor(max_workers)
+        if src is not None:
+            root = os.path.abspath(src)
+            if not os.path.isdir(root):
+                raise NotADirectoryError(
+                    errno.ENOTDIR, 'Not a directory', src
+                )
+            data = stream_archive(
+                root, files=PatternMatcher(exclude or []).walk(root)
+            )
+        buffer = shared_buffer(data, gzip=gzip)
+
+        if containers is None:
+            containers = [
+                self.prepare_model(r)
+                for r in self.client.api.containers(filters=filters)
+            ]
         else:
-            containers = []
-            for r in resp:
-                try:
-                    containers.append(self.get(r['Id']))
-                # a container may have been removed while iterating
-                except NotFound:
-                    if not ignore_removed:
-                        raise
-            return containers
+            containers = [
+                c if isinstance(c, Container)
+                else self.prepare_model({'Id': c})
+                for c in containers
+            ]
+
+        def put(container):
+            try:
+                # Each upload reads the buffer through a view of its own
+                self.client.api.put_archive(
+                    container.id, path, memoryview(buffer)
+                )
+            # requests and socket errors are OSErrors
+            except (DockerException, OSError) as e:
+                return ContainerPutResult(container, e)
+            return ContainerPutResult(container, None)
+
+        return bounded_as_completed(executor, put, containers, max_workers)
+
+    def follow_logs(self, containers=None, filters=None, **kwargs):
+        """
+        Follow the logs of many containers on a single thread. Similar to
+        :py:meth:`Container.logs` with ``stream=True, follow=True`` for each
+        of them, without a thread per container.
+
+        Args:
+            containers (list): :py:class:`Container` objects, or container
+                names or IDs, to follow the logs of.
+            filters (dict): Follow the running containers matching these
+                filters instead, as in :py:meth:`list`. For example
+                ``{'label': 'app=web'}``. By default, all running containers
+                are followed. Ignored if ``containers`` is given.
+            **kwargs: Passed to :py:class:`~docker.models.logs.LogFollower`:
+                ``stdout``, ``stderr``, ``since``, ``tail`` and
+                ``reconnect_delay``.
+
+        Returns:
+            (:py:class:`~docker.models.logs.LogFollower`): An iterable of
+            ``(container_id, stream, timestamp, line)`` tuples. Call its
+            :py:meth:`~docker.models.logs.LogFollower.close` method to stop
+            following the logs.
+
+        Raises:
+            :py:class:`docker.errors.APIError`
+                If listing the containers fails.
+        """
+        if containers is None:
+            containers = [
+                c['Id'] for c in self.client.api.containers(filters=filters)
+            ]
+        return LogFollower(self.client, containers, **kwargs)
+
+    def collect_stats(self, containers=None, filters=None, **kwargs):
+        """
+        Start sampling the resource usage statistics of many containers in
+        the background.
+
+        Args:
+            containers (list): :py:class:`Container` objects, or container
+                names or IDs, to sample.
+            filters (dict): Sample the running containers matching these
+                filters instead, as in :py:meth:`list`. By default, all
+                running containers are sampled. Ignored if ``containers``
+                is given.
+            **kwargs: Passed to
+                :py:class:`~docker.models.stats.StatsCollector`:
+                ``interval``, ``history`` and ``max_workers``.
+
+        Returns:
+            (:py:class:`~docker.models.stats.StatsCollector`): The started
+            collector. Call its
+            :py:meth:`~docker.models.stats.StatsCollector.stop` method to
+            stop sampling.
+        """
+        collector = StatsCollector(
+            self.client, containers=containers, filters=filters, **kwargs
+        )
+        collector.start()
+        return collector
 
     def prune(self, filters=None):
         return self.client.api.prune_containers(filters=filters)
@@ -1196,3 +1817,15 @@ def _host_volume_from_bind(bind):
 ExecResult = namedtuple('ExecResult', 'exit_code,output')
 """ A result of Container.exec_run with the properties ``exit_code`` and
     ``output``. """
+
+
+ContainerExecResult = namedtuple(
+    'ContainerExecResult', 'container,exit_code,output,error'
+)
+""" A result of ContainerCollection.exec_run_many with the properties
+    ``container``, ``exit_code``, ``output`` and ``error``. """
+
+
+ContainerPutResult = namedtuple('ContainerPutResult', 'container,error')
+""" A result of ContainerCollection.put_archive_many with the properties
+    ``container`` and ``error``. """
@@ -1,12 +1,16 @@
 import itertools
 import re
+import time
 import warnings
+from collections import namedtuple
 
 from ..api import APIClient
 from ..constants import DEFAULT_DATA_CHUNK_SIZE
 from ..errors import BuildError, ImageLoadError, InvalidArgument
-from ..utils import parse_repository_tag
+from ..utils import ParallelGzip, parse_repository_tag
+from ..utils.concurrency import bounded_map, check_max_workers
 from ..utils.json_stream import json_stream
+from ..utils.transfer import stream_body
 from .resource import Collection, Model
 
 
@@ -107,6 +111,9 @@ class Image(Model):
             >>>   f.write(chunk)
             >>> f.close()
         """
+        return self.client.api.get_image(self._save_name(named), chunk_size)
+
+    def _save_name(self, named):
         img = self.id
         if named:
             img = self.tags[0] if self.tags else img
@@ -116,8 +123,62 @@ class Image(Model):
                         f"{named} is not a valid tag for this image"
                     )
                 img = named
+        return img
+
+    def transfer_to(self, target, named=False, gzip=False, progress=None):
+        """
+        Copy this image to another Docker daemon, without a registry and
+        without storing it locally. Similar to ``docker save | docker -H
+        <target> load``.
+
+        The tarball of the image is sent to ``target`` as it is received,
+        through a buffer of bounded size, so memory use doesn't depend on
+        the size of the image.
+
+        Args:
+            target (:py:class:`~docker.client.DockerClient`): A client of
+                the daemon to copy the image to.
+            named (str or bool): Whether the image keeps its repository and
+                tag on ``target``, as in :py:meth:`save`. Default: ``False``
+            gzip (bool or :py:class:`~docker.utils.ParallelGzip`): Compress
+                the tarball with gzip on its way to ``target``, on several
+                threads, for slow links. Default: False
+            progress (callable): Called with a :py:class:`TransferProgress`
+                each time a chunk of the tarball is sent. With ``gzip``,
+                sizes are counted before compression.
+
+        Returns:
+            (list of :py:class:`Image`): The images loaded on ``target``.
+
+        Raises:
+            :py:class:`docker.errors.APIError`
+                If either server returns an error.
+            :py:class:`docker.errors.ImageLoadError`
+                If ``target`` fails to load the image.
+
+        Example:
 
-        return self.client.api.get_image(img, chunk_size)
+            >>> remote = docker.DockerClient(base_url='ssh://user@host')
+            >>> def report(p):
+            ...     print(f'{p.transferred >> 20} MiB, '
+            ...           f'{p.rate / 2 ** 20:.1f} MiB/s')
+            >>> image.transfer_to(remote, named=True, progress=report)
+        """
+        res = self.client.api._get_image_response(self._save_name(named))
+        body = stream_body(res)
+        data = body
+        if progress is not None:
+            data = _report_progress(data, progress)
+        if gzip:
+            if not isinstance(gzip, ParallelGzip):
+                gzip = ParallelGzip()
+            data = gzip.compress(data)
+        try:
+            return target.images.load(data)
+        finally:
+            # The generator only closes the response if it was started
+            body.close()
+            res.close()
 
     def tag(self, repository, tag=None, **kwargs):
         """
@@ -216,6 +277,7 @@ class RegistryData(Model):
 
 class ImageCollection(Collection):
     model = Image
+    mirror_resource = 'images'
 
     def build(self, **kwargs):
         """
@@ -279,6 +341,19 @@ class ImageCollection(Collection):
                 configuration file (``~/.docker/config.json`` by default)
                 contains a proxy configuration, the corresponding environment
                 variables will be set in the container being built.
+            stream_context (bool): If ``True``, and ``path`` is a local
+                directory, upload the build context while it is being
+                archived, with chunked transfer encoding, rather than
+                writing it to a temporary file first. Default: ``False``
+            context_cache (str or :py:class:`~docker.utils.ContextCache`): If
+                ``path`` is a local directory, a cache (or the directory of a
+                cache) of the archived context files, so that only the files
+                which changed since a previous build are read again.
+            reproducible_context (bool): If ``True``, and ``path`` is a local
+                directory, normalize the metadata of the archived context
+                (ordering, owners, modes and modification times), so that
+                identical trees produce identical contexts on any host.
+                Default: ``False``
 
         Returns:
             (tuple): The first item is the :py:class:`Image` object for the
@@ -330,6 +405,9 @@ class ImageCollection(Collection):
             :py:class:`docker.errors.APIError`
                 If the server returns an error.
         """
+        image = self._get_mirrored(name)
+        if image is not None:
+            return image
         return self.prepare_model(self.client.api.inspect_image(name))
 
     def get_registry_data(self, name, auth_config=None):
@@ -356,7 +434,7 @@ class ImageCollection(Collection):
             collection=self,
         )
 
-    def list(self, name=None, all=False, filters=None):
+    def list(self, name=None, all=False, filters=None, max_workers=None):
         """
         List images on the server.
 
@@ -369,6 +447,10 @@ class ImageCollection(Collection):
                 - ``dangling`` (bool)
                 - `label` (str|list): format either ``"key"``, ``"key=value"``
                     or a list of such.
+            max_workers (int): Inspect up to this many images concurrently,
+                on a thread pool shared by the client, at most 32. Results
+                are returned in the same order either way. Default: ``None``
+                (one at a time)
 
         Returns:
             (list of :py:class:`Image`): The images.
@@ -377,8 +459,19 @@ class ImageCollection(Collection):
             :py:class:`docker.errors.APIError`
                 If the server returns an error.
         """
+        check_max_workers(max_workers)
+        if name is None and not all and filters is None:
+            images = self._list_mirrored()
+            if images is not None:
+                return images
+
         resp = self.client.api.images(name=name, all=all, filters=filters)
-        return [self.get(r["Id"]) for r in resp]
+        ids = [r["Id"] for r in resp]
+        if max_workers is None:
+            return [self.get(image_id) for image_id in ids]
+        return list(bounded_map(
+            self.client._get_executor(), self.get, ids, max_workers
+        ))
 
     def load(self, data):
         """
@@ -503,3 +596,26 @@ def normalize_platform(platform, engine_info):
     if 'architecture' not in platform:
         platform['architecture'] = engine_info['Arch']
     return platform
+
+
+class TransferProgress(namedtuple('TransferProgress', 'transferred,elapsed')):
+    """
+    How far :py:meth:`Image.transfer_to` is: the number of bytes of the
+    tarball sent so far, and the seconds elapsed since it started.
+    """
+
+    @property
+    def rate(self):
+        """
+        The average throughput so far, in bytes per second.
+        """
+        return self.transferred / self.elapsed if self.elapsed else 0.0
+
+
+def _report_progress(chunks, progress):
+    start = time.monotonic()
+    transferred = 0
+    for chunk in chunks:
+        yield chunk
+        transferred += len(chunk)
+        progress(TransferProgress(transferred, time.monotonic() - start))
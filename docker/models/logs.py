@@ -0,0 +1,765 @@
+import array
+import logging
+import operator
+import selectors
+import socket
+import ssl
+import struct
+import threading
+import time
+from collections import namedtuple
+
+from ..constants import (
+    DEFAULT_DATA_CHUNK_SIZE,
+    DEFAULT_FRAME_BUFFER_SIZE,
+    STREAM_HEADER_SIZE_BYTES,
+)
+from ..errors import DockerException, NotFound
+from ..utils.socket import STDOUT
+from ..utils.utils import parse_timestamp
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+log = logging.getLogger(__name__)
+
+DEFAULT_RECONNECT_DELAY = 1
+
+_FRAME_HEADER = struct.Struct('>BxxxL')
+
+
+LogRecord = namedtuple('LogRecord', 'container_id,stream,timestamp,line')
+""" A line of the logs of a container, as yielded by
+    :py:class:`LogFollower`, with the properties ``container_id``,
+    ``stream``, ``timestamp`` and ``line``. """
+
+
+class LogFollower:
+    """
+    Follows the logs of many containers on a single thread.
+
+    The log streams of all the containers are read through one
+    :py:mod:`selectors` loop instead of a thread each. Lines are reassembled
+    per container and stream, so a line the daemon split into several
+    messages comes out whole. If a stream is cut off while its container is
+    still running, it is opened again from the timestamp of the last line
+    received, without repeating lines.
+
+    The streams of stopped containers end once their logs have been read.
+    Iteration stops when every stream has ended, or when :py:meth:`close`
+    is called, from any thread.
+
+    Not supported over Windows named pipes, which can't be waited on by a
+    selector.
+
+    Example:
+
+        >>> follower = client.containers.follow_logs(
+        ...     filters={'label': 'app=web'}
+        ... )
+        >>> for container_id, stream, timestamp, line in follower:
+        ...     print(container_id[:12], timestamp, line.decode())
+
+    Args:
+        client (:py:class:`~docker.client.DockerClient`): The client to use.
+        containers (list): The containers to follow, as
+            :py:class:`~docker.models.containers.Container` objects or
+            container names or IDs.
+        stdout (bool): Get ``STDOUT``. Default ``True``
+        stderr (bool): Get ``STDERR``. Default ``True``
+        since (datetime, int or float): Show logs since a given datetime,
+            integer epoch (in seconds) or float (in fractional seconds)
+        tail (str or int): Output specified number of lines at the end of
+            logs. Either an integer of number of lines or the string
+            ``all``. Default ``all``
+        reconnect_delay (float): How long to wait, in seconds, before
+            opening a stream again after it was cut off. Default: 1
+
+    Yields:
+        (:py:class:`LogRecord`): Tuples of ``(container_id, stream,
+        timestamp, line)``, where ``container_id`` is the full ID of the
+        container, ``stream`` is :py:data:`docker.utils.socket.STDOUT` or
+        :py:data:`docker.utils.socket.STDERR`, ``timestamp`` is the RFC 3339
+        timestamp the daemon gave the line, with nanoseconds, and ``line``
+        is the line, in bytes, without its line break.
+    """
+
+    def __init__(self, client, containers, stdout=True, stderr=True,
+                 since=None, tail='all',
+                 reconnect_delay=DEFAULT_RECONNECT_DELAY):
+        if client.api.base_url.startswith('http+docker://localnpipe'):
+            raise DockerException(
+                'Following logs on a single thread is not supported over '
+                'named pipes'
+            )
+        self.client = client
+        self.stdout = stdout
+        self.stderr = stderr
+        self.reconnect_delay = reconnect_delay
+
+        self._params = client.api._log_params(
+            stdout=stdout, stderr=stderr, timestamps=True, tail=tail,
+            since=since, follow=True
+        )
+
+        self._streams = [
+            _LogStream(getattr(c, 'id', c)) for c in containers
+        ]
+        self._closed = threading.Event()
+        self._started = False
+        self._wakeup = socket.socketpair()
+
+    def __iter__(self):
+        if self._started:
+            raise RuntimeError('The logs are already being followed')
+        self._started = True
+        return self._follow()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        """
+        Stop following the logs. Safe to call from any thread.
+        """
+        self._closed.set()
+        try:
+            self._wakeup[1].send(b'\0')
+        except OSError:
+            pass
+        if not self._started:
+            self._close_wakeup()
+
+    def _close_wakeup(self):
+        for sock in self._wakeup:
+            sock.close()
+
+    def _follow(self):
+        selector = selectors.DefaultSelector()
+        selector.register(self._wakeup[0], selectors.EVENT_READ)
+        # Streams to be opened, by when
+        pending = {stream: 0 for stream in self._streams}
+        try:
+            while (pending or len(selector.get_map()) > 1) and \
+                    not self._closed.is_set():
+                now = time.monotonic()
+                for stream, when in list(pending.items()):
+                    if when > now:
+                        continue
+                    del pending[stream]
+                    records, retry = self._open(stream, selector)
+                    yield from records
+                    if retry:
+                        pending[stream] = now + self.reconnect_delay
+                    if self._closed.is_set():
+                        return
+
+                if not pending and len(selector.get_map()) == 1:
+                    # Every stream ended as it was opened
+                    continue
+                timeout = None
+                if pending:
+                    timeout = max(
+                        min(pending.values()) - time.monotonic(), 0
+                    )
+                for key, _ in selector.select(timeout):
+                    stream = key.data
+                    if stream is None:
+                        # Woken up by close()
+                        continue
+                    data, ended = stream.read()
+                    yield from stream.feed(data)
+                    # A complete body may be followed by a connection kept
+                    # open
+                    if not ended and not stream.complete:
+                        continue
+                    selector.unregister(stream.sock)
+                    stream.close()
+                    records, retry = self._ended(stream)
+                    yield from records
+                    if retry:
+                        pending[stream] = time.monotonic() + \
+                            self.reconnect_delay
+                    if self._closed.is_set():
+                        return
+        finally:
+            for stream in self._streams:
+                stream.close()
+            selector.close()
+            self._close_wakeup()
+
+    def _open(self, stream, selector):
+        """
+        Open the log stream of a container, from where it was cut off if it
+        is reopened. Returns the records to yield, which are the last lines
+        of the container if it is gone, and whether to try again later.
+        """
+        api = self.client.api
+        try:
+            info = api.inspect_container(stream.container_id)
+            if stream.opened and not info['State']['Running'] and \
+                    stream.complete:
+                return stream.flush(), False
+            params = dict(self._params)
+            if stream.last_timestamp is not None:
+                params['since'] = _since(stream.last_timestamp)
+                params['tail'] = 'all'
+            response = api._get(
+                api._url('/containers/{0}/logs', info['Id']),
+                params=params, stream=True
+            )
+            api._raise_for_status(response)
+        except NotFound:
+            return stream.flush(), False
+        except Exception:
+            log.warning(
+                'Error opening the logs of %s', stream.container_id,
+                exc_info=True
+            )
+            return [], True
+
+        stream.container_id = info['Id']
+        stream.attach(response, info['Config']['Tty'])
+        # Body data already read along with the headers
+        records = stream.feed(stream.buffered())
+        if stream.complete:
+            stream.close()
+            more, retry = self._ended(stream)
+            return records + more, retry
+        selector.register(stream.sock, selectors.EVENT_READ, stream)
+        return records, False
+
+    def _ended(self, stream):
+        """
+        Decide what to do with a stream which ended: reopen it unless its
+        container stopped and its logs were read to the end.
+        """
+        try:
+            running = self.client.api.inspect_container(
+                stream.container_id
+            )['State']['Running']
+        except NotFound:
+            return stream.flush(), False
+        except Exception:
+            log.warning(
+                'Error inspecting %s', stream.container_id, exc_info=True
+            )
+            return [], True
+        if stream.complete and not running:
+            return stream.flush(), False
+        return [], True
+
+
+class _LogStream:
+    def __init__(self, container_id):
+        self.container_id = container_id
+        self.response = None
+        self.sock = None
+        self.tty = False
+        self.opened = False
+        self.complete = False
+        self._decoder = None
+        self._remaining = None
+        self._buffer = bytearray()
+        # stream -> [timestamp, bytearray] of a line not yet terminated
+        self._partial = {}
+        # The timestamp of the last message received and how many messages
+        # had it, to skip them when the stream is opened again since then
+        self.last_timestamp = None
+        self._last_count = 0
+        self._skip = None
+
+    def attach(self, response, tty):
+        self.response = response
+        self.tty = tty
+        self.opened = True
+        self.complete = False
+        self._buffer.clear()
+        fp = response.raw._fp
+        self._decoder = _ChunkDecoder() if fp.chunked else None
+        # What is left of a body sent with a Content-Length. Without one,
+        # the body ends when the daemon closes the connection.
+        self._remaining = None if fp.chunked else fp.length
+        if self.last_timestamp is not None:
+            self._skip = [self.last_timestamp, self._last_count]
+        self.sock = response.raw._fp.fp.raw
+        getattr(self.sock, '_sock', self.sock).setblocking(False)
+
+    def buffered(self):
+        # Non-blocking now, so this only returns what is buffered
+        try:
+            return self.response.raw._fp.fp.read1(DEFAULT_FRAME_BUFFER_SIZE)
+        except (BlockingIOError, ssl.SSLWantReadError, socket.timeout):
+            return b''
+
+    def read(self):
+        """
+        Read what is available. Returns the data and whether the stream
+        ended.
+        """
+        chunks = []
+        # Until the socket would block: SSL sockets may hold data which
+        # doesn't make them readable
+        while True:
+            try:
+                data = self.sock.read(DEFAULT_FRAME_BUFFER_SIZE)
+            except (BlockingIOError, ssl.SSLWantReadError, socket.timeout):
+                data = None
+            except OSError:
+                return b''.join(chunks), True
+            if data is None:
+                return b''.join(chunks), False
+            if not data:
+                if self._decoder is None and self._remaining is None:
+                    self.complete = True
+                return b''.join(chunks), True
+            chunks.append(data)
+
+    def close(self):
+        if self.response is not None:
+            self.response.close()
+            self.response = None
+            self.sock = None
+
+    def feed(self, data):
+        """
+        Parse data received from the stream. Returns the complete lines.
+        """
+        if self._decoder is not None:
+            data = self._decoder.feed(data)
+            self.complete = self._decoder.done
+        elif self._remaining is not None:
+            data = data[:self._remaining]
+            self._remaining -= len(data)
+            self.complete = not self._remaining
+        self._buffer += data
+        records = []
+        if self.tty:
+            # No frames: each line starts with its timestamp
+            start = 0
+            while True:
+                end = self._buffer.find(b'\n', start)
+                if end < 0:
+                    break
+                self._message(STDOUT, self._buffer[start:end + 1], records)
+                start = end + 1
+            del self._buffer[:start]
+            return records
+
+        start = 0
+        while len(self._buffer) - start >= STREAM_HEADER_SIZE_BYTES:
+            stream, length = _FRAME_HEADER.unpack_from(self._buffer, start)
+            end = start + STREAM_HEADER_SIZE_BYTES + length
+            if end > len(self._buffer):
+                break
+            # One message per frame
+            self._message(
+                stream,
+                self._buffer[start + STREAM_HEADER_SIZE_BYTES:end],
+                records
+            )
+            start = end
+        del self._buffer[:start]
+        return records
+
+    def _message(self, stream, message, records):
+        timestamp, _, content = bytes(message).partition(b' ')
+        timestamp = timestamp.decode('ascii', 'replace')
+
+        if self._skip is not None:
+            # Opened again since the last timestamp received, which the
+            # daemon includes
+            skip_timestamp, count = self._skip
+            if timestamp < skip_timestamp:
+                return
+            if timestamp == skip_timestamp and count > 0:
+                self._skip[1] -= 1
+                return
+            self._skip = None
+
+        if timestamp == self.last_timestamp:
+            self._last_count += 1
+        else:
+            self.last_timestamp, self._last_count = timestamp, 1
+
+        lines = content.split(b'\n')
+        for line in lines[:-1]:
+            partial = self._partial.pop(stream, None)
+            if partial is not None:
+                records.append(self._record(
+                    stream, partial[0], bytes(partial[1] + line)
+                ))
+            else:
+                records.append(self._record(stream, timestamp, line))
+        if lines[-1]:
+            # Continued in the next message
+            partial = self._partial.setdefault(
+                stream, [timestamp, bytearray()]
+            )
+            partial[1] += lines[-1]
+
+    def _record(self, stream, timestamp, line):
+        if self.tty and line.endswith(b'\r'):
+            line = line[:-1]
+        return LogRecord(self.container_id, stream, timestamp, line)
+
+    def flush(self):
+        """
+        Return the lines which were never terminated.
+        """
+        if self.tty and self._buffer:
+            self._message(STDOUT, self._buffer, [])
+            self._buffer.clear()
+        records = [
+            self._record(stream, timestamp, bytes(line))
+            for stream, (timestamp, line) in sorted(self._partial.items())
+        ]
+        self._partial.clear()
+        return records
+
+
+class LogColumns:
+    """
+    The logs of a container in columnar form, as returned by
+    :py:meth:`~docker.models.containers.Container.logs_columnar`.
+
+    Rather than a bytes object per line, the lines are stored one after the
+    other in a single buffer, with arrays of where each line starts, which
+    stream it came from and its timestamp. With NumPy installed, the arrays
+    are NumPy arrays, so finding lines by stream or time range is an array
+    operation:
+
+        >>> logs = container.logs_columnar()
+        >>> errors = logs.take(logs.streams == STDERR)
+        >>> last_hour = logs.take(
+        ...     logs.timestamps >= numpy.datetime64('2024-01-01T10:00')
+        ... )
+
+    Otherwise they are :py:class:`array.array` objects.
+
+    Indexing returns a tuple of ``(stream, timestamp, line)``, slicing
+    returns another :py:class:`LogColumns`. Iterating yields the tuples of
+    every line.
+
+    Attributes:
+        data (bytes): The lines, without their timestamps and line breaks,
+            one after the other.
+        offsets (array): Where each line starts in ``data``, followed by the
+            length of ``data``, so line ``i`` is
+            ``data[offsets[i]:offsets[i + 1]]``. 64-bit integers.
+        streams (array): The stream of each line,
+            :py:data:`docker.utils.socket.STDOUT` or
+            :py:data:`docker.utils.socket.STDERR`. 8-bit integers.
+        timestamps (array): The timestamp of each line. ``datetime64[ns]``
+            values with NumPy, 64-bit integers of nanoseconds since the epoch
+            otherwise.
+    """
+
+    def __init__(self, data, offsets, streams, timestamps):
+        self.data = data
+        self.offsets = offsets
+        self.streams = streams
+        self.timestamps = timestamps
+
+    def __len__(self):
+        return len(self.streams)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self._line(i)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                return self.take(range(start, stop, step))
+            stop = max(start, stop)
+            base = self.offsets[start]
+            offsets = self.offsets[start:stop + 1]
+            if numpy is not None and isinstance(offsets, numpy.ndarray):
+                offsets = offsets - base
+            else:
+                offsets = array.array('q', (o - base for o in offsets))
+            return LogColumns(
+                self.data[base:self.offsets[stop]], offsets,
+                self.streams[start:stop], self.timestamps[start:stop]
+            )
+        index = operator.index(index)
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('log line index out of range')
+        return self._line(index)
+
+    def _line(self, i):
+        return (
+            self.streams[i], self.timestamps[i],
+            self.data[self.offsets[i]:self.offsets[i + 1]]
+        )
+
+    def take(self, indices):
+        """
+        Select lines.
+
+        Args:
+            indices: The indices of the lines to select, in the order to
+                select them in, or a sequence of booleans telling for each
+                line whether to select it, like a NumPy mask.
+
+        Returns:
+            (:py:class:`LogColumns`): The lines selected.
+        """
+        if numpy is not None and isinstance(self.offsets, numpy.ndarray):
+            return self._take_numpy(indices)
+        indices = list(indices)
+        if indices and all(isinstance(i, bool) for i in indices):
+            indices = [i for i, selected in enumerate(indices) if selected]
+        data = bytearray()
+        offsets = array.array('q', [0])
+        for i in indices:
+            data += self.data[self.offsets[i]:self.offsets[i + 1]]
+            offsets.append(len(data))
+        return LogColumns(
+            bytes(data), offsets,
+            array.array('B', (self.streams[i] for i in indices)),
+            array.array('q', (self.timestamps[i] for i in indices)),
+        )
+
+    def _take_numpy(self, indices):
+        indices = numpy.asarray(indices)
+        if indices.dtype == bool:
+            indices = numpy.flatnonzero(indices)
+        indices = indices.astype(numpy.intp, copy=False)
+        starts = self.offsets[indices]
+        lengths = self.offsets[indices + 1] - starts
+        offsets = numpy.zeros(len(indices) + 1, dtype=numpy.int64)
+        numpy.cumsum(lengths, out=offsets[1:])
+        data = numpy.frombuffer(self.data, dtype=numpy.uint8)
+        if len(indices) < 2 or (numpy.diff(indices) > 0).all():
+            # In order: mask the bytes of the lines selected, one byte per
+            # byte of data
+            nonempty = lengths > 0
+            edges = numpy.zeros(len(data) + 1, dtype=numpy.int8)
+            edges[starts[nonempty]] += 1
+            edges[(starts + lengths)[nonempty]] -= 1
+            selected = data[numpy.cumsum(edges[:-1], dtype=numpy.int8) > 0]
+        else:
+            # Out of order or repeated: gather the bytes one by one
+            positions = numpy.repeat(starts - offsets[:-1], lengths) + \
+                numpy.arange(offsets[-1])
+            selected = data[positions]
+        return LogColumns(
+            selected.tobytes(), offsets, self.streams[indices],
+            self.timestamps[indices]
+        )
+
+
+class _ColumnsBuilder:
+    """
+    Parses a log stream read with timestamps into :py:class:`LogColumns`.
+    """
+
+    def __init__(self, tty):
+        self.tty = tty
+        self._buffer = bytearray()
+        self._data = bytearray()
+        self._offsets = array.array('q', [0])
+        self._streams = array.array('B')
+        self._timestamps = []
+        # stream -> [timestamp, bytearray] of a line not yet terminated
+        self._partial = {}
+
+    def feed(self, data):
+        buf = self._buffer
+        buf += data
+        start = 0
+        if self.tty:
+            # No frames: each line starts with its timestamp
+            while True:
+                end = buf.find(b'\n', start)
+                if end < 0:
+                    break
+                self._message(STDOUT, bytes(buf[start:end + 1]))
+                start = end + 1
+        else:
+            while len(buf) - start >= STREAM_HEADER_SIZE_BYTES:
+                stream, length = _FRAME_HEADER.unpack_from(buf, start)
+                end = start + STREAM_HEADER_SIZE_BYTES + length
+                if end > len(buf):
+                    break
+                self._message(
+                    stream, bytes(buf[start + STREAM_HEADER_SIZE_BYTES:end])
+                )
+                start = end
+        del buf[:start]
+
+    def _message(self, stream, message):
+        timestamp, _, content = message.partition(b' ')
+        if content.endswith(b'\n') and content.count(b'\n') == 1 and \
+                stream not in self._partial:
+            # The usual case: one whole line
+            self._line(stream, timestamp, content[:-1])
+            return
+        lines = content.split(b'\n')
+        for line in lines[:-1]:
+            partial = self._partial.pop(stream, None)
+            if partial is not None:
+                self._line(stream, partial[0], partial[1] + line)
+            else:
+                self._line(stream, timestamp, line)
+        if lines[-1]:
+            # Continued in the next message
+            partial = self._partial.setdefault(
+                stream, [timestamp, bytearray()]
+            )
+            partial[1] += lines[-1]
+
+    def _line(self, stream, timestamp, line):
+        if self.tty and line.endswith(b'\r'):
+            line = line[:-1]
+        self._data += line
+        self._offsets.append(len(self._data))
+        self._streams.append(stream)
+        self._timestamps.append(timestamp)
+
+    def finish(self):
+        if self.tty and self._buffer:
+            self._message(STDOUT, bytes(self._buffer))
+        for stream, (timestamp, line) in sorted(self._partial.items()):
+            self._line(stream, timestamp, line)
+        self._buffer.clear()
+        self._partial.clear()
+
+        data = bytes(self._data)
+        self._data = bytearray()
+        if numpy is None:
+            return LogColumns(
+                data, self._offsets, self._streams,
+                _timestamps(self._timestamps)
+            )
+        return LogColumns(
+            data,
+            numpy.frombuffer(self._offsets, dtype=numpy.int64),
+            numpy.frombuffer(self._streams, dtype=numpy.uint8),
+            _timestamps_numpy(self._timestamps),
+        )
+
+
+class _ChunkDecoder:
+    """
+    Incrementally decodes a body sent with chunked transfer encoding.
+    """
+
+    def __init__(self):
+        self._buffer = bytearray()
+        # Bytes left in the current chunk, including its trailing CRLF
+        self._remaining = 0
+        self.done = False
+
+    def feed(self, data):
+        self._buffer += data
+        out = bytearray()
+        while not self.done:
+            if self._remaining:
+                n = min(self._remaining, len(self._buffer))
+                # The chunk's data, then its CRLF
+                data_left = max(self._remaining - 2, 0)
+                out += self._buffer[:min(n, data_left)]
+                del self._buffer[:n]
+                self._remaining -= n
+                if self._remaining:
+                    break
+            end = self._buffer.find(b'\r\n')
+            if end < 0:
+                break
+            size = int(bytes(self._buffer[:end]).split(b';')[0], 16)
+            del self._buffer[:end + 2]
+            if size == 0:
+                # Trailers, if any, don't matter
+                self.done = True
+                break
+            self._remaining = size + 2
+        return bytes(out)
+
+
+def read_columns(api, container, stdout=True, stderr=True, since=None,
+                 until=None, tail='all'):
+    """
+    Read the logs of a container into :py:class:`LogColumns`.
+    """
+    params = api._log_params(
+        stdout=stdout, stderr=stderr, timestamps=True, tail=tail,
+        since=since, until=until
+    )
+    tty = api._check_is_tty(container)
+    response = api._get(
+        api._url('/containers/{0}/logs', container), params=params,
+        stream=True
+    )
+    try:
+        api._raise_for_status(response)
+        builder = _ColumnsBuilder(tty)
+        for chunk in response.iter_content(DEFAULT_DATA_CHUNK_SIZE):
+            builder.feed(chunk)
+    finally:
+        response.close()
+    return builder.finish()
+
+
+def _since(timestamp):
+    """
+    Convert an RFC 3339 timestamp with nanoseconds into the
+    ``seconds.nanoseconds`` form the daemon takes, without losing precision.
+    """
+    seconds, nanoseconds = parse_timestamp(timestamp)
+    return f'{seconds}.{nanoseconds:09d}'
+
+
+# The length of the timestamps the daemon gives in UTC, like
+# 2024-01-01T00:00:00.000000000Z
+_UTC_TIMESTAMP_LENGTH = 30
+
+
+def _timestamps(timestamps):
+    """
+    Parse timestamps into an array of nanoseconds since the epoch.
+    """
+    nanoseconds = array.array('q')
+    # Lines come many to a second: only parse the date and time once a
+    # second
+    seconds = {}
+    for timestamp in timestamps:
+        if len(timestamp) == _UTC_TIMESTAMP_LENGTH and \
+                timestamp.endswith(b'Z'):
+            prefix = timestamp[:19]
+            base = seconds.get(prefix)
+            if base is None:
+                base = seconds[prefix] = parse_timestamp(
+                    prefix.decode('ascii') + 'Z'
+                )[0] * 1000000000
+            nanoseconds.append(base + int(timestamp[20:29]))
+        else:
+            s, ns = parse_timestamp(timestamp.decode('ascii'))
+            nanoseconds.append(s * 1000000000 + ns)
+    return nanoseconds
+
+
+def _timestamps_numpy(timestamps):
+    """
+    Parse timestamps into a NumPy ``datetime64[ns]`` array, in bulk when
+    they are all in UTC with nanoseconds, as the daemon gives them.
+    """
+    length = _UTC_TIMESTAMP_LENGTH
+    if all(len(t) == length and t.endswith(b'Z') for t in timestamps):
+        # Without the Z, which NumPy would warn about
+        return numpy.frombuffer(
+            b''.join(timestamps), dtype=f'S{length}'
+        ).astype(f'S{length - 1}').astype('datetime64[ns]')
+    return numpy.frombuffer(
+        _timestamps(timestamps), dtype=numpy.int64
+    ).view('datetime64[ns]')
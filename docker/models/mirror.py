@@ -0,0 +1,355 @@
+import copy
+import email.utils
+import logging
+import threading
+import time
+
+from ..errors import NotFound
+from ..utils.concurrency import bounded_map, check_max_workers
+
+log = logging.getLogger(__name__)
+
+DEFAULT_MAX_STALENESS = 5
+
+# Event actions which don't change what inspecting the object returns
+_IGNORED_ACTIONS = {
+    'container': {
+        'attach', 'archive-path', 'commit', 'copy', 'detach', 'export',
+        'exec_create', 'exec_detach', 'exec_die', 'exec_start',
+        'extract-to-dir', 'resize', 'top',
+    },
+    'volume': {'mount', 'unmount'},
+}
+
+_REMOVE_ACTIONS = {
+    'container': {'destroy'},
+    'image': {'delete'},
+    'network': {'destroy', 'remove'},
+    'volume': {'destroy'},
+}
+
+# Event type -> name of the resource in the mirror
+_EVENT_TYPES = {
+    'container': 'containers',
+    'image': 'images',
+    'network': 'networks',
+    'volume': 'volumes',
+}
+
+
+class StateMirror:
+    """
+    An in-memory copy of the containers, images, networks and volumes on the
+    server, kept up to date from the daemon's event stream.
+
+    After one initial list and inspect pass, only the objects named by an
+    event are inspected again, so the cost of keeping the mirror current
+    grows with the number of events rather than the number of objects.
+
+    Once started, :py:meth:`~ContainerCollection.get` and
+    :py:meth:`~ContainerCollection.list` (and their image, network and
+    volume counterparts) are answered from the mirror, as long as it is no
+    more than ``max_staleness`` seconds behind the daemon. Otherwise, and for
+    ``list()`` calls with filters, they query the daemon as usual.
+    :py:meth:`~docker.models.containers.Container.reload` and its
+    counterparts always query the daemon.
+
+    Example:
+
+        >>> mirror = client.start_mirror()
+        >>> client.containers.list()  # no request to the daemon
+        [<Container: 8a4b0f9c2e11>]
+        >>> mirror.stop()
+
+    Args:
+        client (:py:class:`~docker.client.DockerClient`): The client to
+            mirror the server of.
+        resources (list of str): The resources to mirror, among
+            ``containers``, ``images``, ``networks`` and ``volumes``.
+            Default: all of them
+        max_staleness (float): How far behind the daemon, in seconds, the
+            mirror may be and still be used. Default: 5
+        max_workers (int): Inspect up to this many objects concurrently
+            during the initial pass, at most 32. Default: ``None`` (one at a
+            time)
+    """
+
+    def __init__(self, client, resources=None,
+                 max_staleness=DEFAULT_MAX_STALENESS, max_workers=None):
+        self.client = client
+        self.resources = tuple(resources or _EVENT_TYPES.values())
+        for resource in self.resources:
+            if resource not in _EVENT_TYPES.values():
+                raise ValueError(f'Unknown resource: {resource}')
+        self.max_staleness = max_staleness
+        check_max_workers(max_workers)
+        self.max_workers = max_workers
+
+        self._lock = threading.Lock()
+        self._objects = {resource: {} for resource in self.resources}
+        self._events = None
+        self._thread = None
+        self._stopped = threading.Event()
+        # Monotonic time since which the mirror has been out of sync with
+        # the daemon, or None if it is in sync
+        self._behind_since = time.monotonic()
+        self._last_event_time = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
+
+    @property
+    def is_fresh(self):
+        """
+        ``True`` if the mirror is no more than ``max_staleness`` seconds
+        behind the daemon.
+        """
+        behind_since = self._behind_since
+        return behind_since is None or (
+            time.monotonic() - behind_since <= self.max_staleness
+        )
+
+    def start(self):
+        """
+        Load the current state of the server, then keep it up to date in a
+        background thread, and answer the client's collections from it.
+        """
+        if self._thread is not None:
+            raise RuntimeError('The mirror has already been started')
+        self._stopped.clear()
+        self._sync()
+        self._thread = threading.Thread(
+            target=self._run, name='docker-state-mirror', daemon=True
+        )
+        self._thread.start()
+        self.client._mirror = self
+
+    def stop(self):
+        """
+        Stop following events. The client's collections query the daemon
+        again.
+        """
+        if getattr(self.client, '_mirror', None) is self:
+            self.client._mirror = None
+        self._stopped.set()
+        events = self._events
+        if events is not None:
+            try:
+                events.close()
+            except Exception:
+                log.debug('Failed to close the event stream', exc_info=True)
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _sync(self):
+        """
+        Subscribe to events, then (re)load every object. Events which occur
+        while loading are queued on the stream and applied afterwards.
+        """
+        self._behind_since = self._behind_since or time.monotonic()
+        since = self._last_event_time
+        self._events = self.client.api.events(
+            since=since, decode=True,
+            filters={'type': [t for t, r in _EVENT_TYPES.items()
+                              if r in self.resources]}
+        )
+        if since is None:
+            # By the daemon's clock, as the times of the events are
+            self._last_event_time = _server_time(self._events)
+        for resource in self.resources:
+            objects = self._load(resource)
+            with self._lock:
+                self._objects[resource] = objects
+        self._behind_since = None
+
+    def _load(self, resource):
+        api = self.client.api
+        if resource == 'containers':
+            ids = [c['Id'] for c in api.containers(all=True)]
+        elif resource == 'images':
+            ids = [i['Id'] for i in api.images()]
+        elif resource == 'networks':
+            ids = [n['Id'] for n in api.networks()]
+        else:
+            ids = [v['Name'] for v in api.volumes().get('Volumes') or []]
+
+        def inspect(object_id):
+            try:
+                return self._inspect(resource, object_id)
+            except NotFound:
+                return None
+
+        if self.max_workers is None:
+            results = map(inspect, ids)
+        else:
+            results = bounded_map(
+                self.client._get_executor(), inspect, ids, self.max_workers
+            )
+        return {
+            attrs[_id_attribute(resource)]: attrs
+            for attrs in results if attrs is not None
+        }
+
+    def _inspect(self, resource, object_id):
+        api = self.client.api
+        if resource == 'containers':
+            return api.inspect_container(object_id)
+        elif resource == 'images':
+            return api.inspect_image(object_id)
+        elif resource == 'networks':
+            return api.inspect_network(object_id)
+        return api.inspect_volume(object_id)
+
+    def _run(self):
+        while not self._stopped.is_set():
+            try:
+                for event in self._events:
+                    self._apply(event)
+                    self._last_event_time = event.get(
+                        'time', self._last_event_time
+                    )
+                    if self._stopped.is_set():
+                        return
+            except Exception:
+                if self._stopped.is_set():
+                    return
+                log.warning('Error following events', exc_info=True)
+            if self._stopped.is_set():
+                return
+            # The stream ended: reconnect, replaying the events we missed.
+            self._behind_since = time.monotonic()
+            while not self._stopped.is_set():
+                try:
+                    self._sync()
+                    break
+                except Exception:
+                    log.warning('Error reloading the mirror', exc_info=True)
+                    self._stopped.wait(1)
+
+    def _apply(self, event):
+        event_type = event.get('Type')
+        resource = _EVENT_TYPES.get(event_type)
+        if resource not in self.resources:
+            return
+        action = event.get('Action', '').split(':', 1)[0]
+        if action in _IGNORED_ACTIONS.get(event_type, ()):
+            return
+        actor = event.get('Actor', {})
+        object_id = actor.get('ID')
+        if event_type == 'volume' and not object_id:
+            object_id = actor.get('Attributes', {}).get('name')
+        if not object_id:
+            return
+
+        if action in _REMOVE_ACTIONS[event_type]:
+            self._remove(resource, object_id)
+            return
+
+        self._behind_since = self._behind_since or time.monotonic()
+        try:
+            attrs = self._inspect(resource, object_id)
+        except NotFound:
+            self._remove(resource, object_id)
+        else:
+            with self._lock:
+                self._objects[resource][attrs[_id_attribute(resource)]] = \
+                    attrs
+        self._behind_since = None
+
+    def _remove(self, resource, object_id):
+        with self._lock:
+            objects = self._objects[resource]
+            key = _find(resource, objects, object_id)
+            if key is not None:
+                del objects[key]
+
+    def get(self, resource, key):
+        """
+        Return a copy of the attributes of an object, looked up the same
+        way the daemon does (by ID, short ID or name), or ``None`` if the
+        object is unknown or the mirror is not fresh.
+        """
+        if resource not in self._objects or not self.is_fresh:
+            return None
+        with self._lock:
+            objects = self._objects[resource]
+            found = _find(resource, objects, key)
+            if found is None:
+                return None
+            return copy.deepcopy(objects[found])
+
+    def list(self, resource):
+        """
+        Return a copy of the attributes of all the objects of a resource,
+        newest first like the daemon lists them, or ``None`` if it is not
+        mirrored or the mirror is not fresh.
+        """
+        if resource not in self._objects or not self.is_fresh:
+            return None
+        with self._lock:
+            objects = copy.deepcopy(list(self._objects[resource].values()))
+        # RFC 3339 timestamps in UTC; without the trailing "Z" they sort
+        # correctly as strings even when their fractional parts differ in
+        # length
+        return sorted(
+            objects, key=lambda a: (a.get('Created') or '').rstrip('Z'),
+            reverse=True
+        )
+
+
+def _server_time(events):
+    """
+    When the daemon started sending ``events``, by its clock, in seconds
+    since the epoch, or ``None`` if it didn't say.
+    """
+    response = getattr(events, '_response', None)
+    date = response.headers.get('Date') if response is not None else None
+    if not date:
+        return None
+    try:
+        return int(email.utils.parsedate_to_datetime(date).timestamp())
+    except (TypeError, ValueError):
+        return None
+
+
+def _id_attribute(resource):
+    return 'Name' if resource == 'volumes' else 'Id'
+
+
+def _find(resource, objects, key):
+    if key in objects:
+        return key
+    if resource == 'volumes':
+        return None
+
+    if resource == 'images':
+        if ':' not in key.split('/')[-1] and not key.startswith('sha256:'):
+            tagged = f'{key}:latest'
+        else:
+            tagged = key
+        for object_id, attrs in objects.items():
+            if tagged in (attrs.get('RepoTags') or []) or \
+                    key in (attrs.get('RepoDigests') or []):
+                return object_id
+        if not key.startswith('sha256:'):
+            key = f'sha256:{key}'
+    elif resource == 'containers':
+        name = f'/{key}'
+        for object_id, attrs in objects.items():
+            if attrs.get('Name') == name:
+                return object_id
+    else:
+        for object_id, attrs in objects.items():
+            if attrs.get('Name') == key:
+                return object_id
+
+    # Unambiguous ID prefix
+    matches = [object_id for object_id in objects if object_id.startswith(key)]
+    if len(matches) == 1:
+        return matches[0]
+    return None
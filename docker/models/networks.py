@@ -96,6 +96,7 @@ class NetworkCollection(Collection):
     Networks on the Docker server.
     """
     model = Network
+    mirror_resource = 'networks'
 
     def create(self, name, *args, **kwargs):
         """
@@ -178,6 +179,10 @@ class NetworkCollection(Collection):
                 If the server returns an error.
 
         """
+        if not args and not kwargs:
+            network = self._get_mirrored(network_id)
+            if network is not None:
+                return network
         return self.prepare_model(
             self.client.api.inspect_network(network_id, *args, **kwargs)
         )
@@ -206,6 +211,10 @@ class NetworkCollection(Collection):
                 If the server returns an error.
         """
         greedy = kwargs.pop('greedy', False)
+        if not args and not kwargs:
+            networks = self._list_mirrored()
+            if networks is not None:
+                return networks
         resp = self.client.api.networks(*args, **kwargs)
         networks = [self.prepare_model(item) for item in resp]
         if greedy and version_gte(self.client.api._version, '1.28'):
@@ -141,7 +141,9 @@ class PluginCollection(Collection):
                 plugin_data_dir (string): Path to the plugin data directory.
                     Plugin data directory must contain the ``config.json``
                     manifest file and the ``rootfs`` directory.
-                gzip (bool): Compress the context using gzip. Default: False
+                gzip (bool or :py:class:`~docker.utils.ParallelGzip`):
+                    Compress the context using gzip, on several threads with
+                    a :py:class:`~docker.utils.ParallelGzip`. Default: False
 
             Returns:
                 (:py:class:`Plugin`): The newly created plugin.
@@ -1,3 +1,6 @@
+import copy
+
+
 class Model:
     """
     A base class for representing a single object on the server.
@@ -44,7 +47,7 @@ class Model:
         Load this object from the server again and update ``attrs`` with the
         new data.
         """
-        new_model = self.collection.get(self.id)
+        new_model = self.collection._unmirrored().get(self.id)
         self.attrs = new_model.attrs
 
 
@@ -57,6 +60,12 @@ class Collection:
     #: The type of object this collection represents, set by subclasses
     model = None
 
+    #: The name of this collection in a
+    #: :py:class:`~docker.models.mirror.StateMirror`, set by subclasses
+    mirror_resource = None
+
+    _use_mirror = True
+
     def __init__(self, client=None):
         #: The client pointing at the server that this collection of objects
         #: is on.
@@ -78,6 +87,45 @@ class Collection:
     def create(self, attrs=None):
         raise NotImplementedError
 
+    def _mirror(self):
+        """
+        The client's state mirror if it is started and holds this kind of
+        object, otherwise ``None``.
+        """
+        if not self._use_mirror:
+            return None
+        mirror = getattr(self.client, '_mirror', None)
+        if mirror is None or self.mirror_resource not in mirror.resources:
+            return None
+        return mirror
+
+    def _unmirrored(self):
+        """
+        A copy of this collection which always queries the daemon, even
+        when a state mirror is started.
+        """
+        collection = copy.copy(self)
+        collection._use_mirror = False
+        return collection
+
+    def _get_mirrored(self, key):
+        mirror = self._mirror()
+        if mirror is None:
+            return None
+        attrs = mirror.get(self.mirror_resource, key)
+        if attrs is None:
+            return None
+        return self.prepare_model(attrs)
+
+    def _list_mirrored(self):
+        mirror = self._mirror()
+        if mirror is None:
+            return None
+        attrs = mirror.list(self.mirror_resource)
+        if attrs is None:
+            return None
+        return [self.prepare_model(a) for a in attrs]
+
     def prepare_model(self, attrs):
         """
         Create a model from a set of attributes.
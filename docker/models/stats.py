@@ -0,0 +1,469 @@
+import array
+import logging
+import math
+import threading
+import time
+
+from ..errors import InvalidArgument, NotFound
+from ..utils import version_gte
+from ..utils.concurrency import bounded_map, check_max_workers
+from ..utils.utils import parse_timestamp
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+log = logging.getLogger(__name__)
+
+_GONE = object()
+
+DEFAULT_STATS_INTERVAL = 1
+DEFAULT_STATS_HISTORY = 60
+
+#: The values recorded for each sample, in the order they are stored
+FIELDS = (
+    'time', 'cpu_total', 'cpu_system', 'online_cpus', 'memory_usage',
+    'memory_limit', 'net_rx', 'net_tx', 'block_read', 'block_write',
+)
+(_TIME, _CPU_TOTAL, _CPU_SYSTEM, _ONLINE_CPUS, _MEMORY_USAGE, _MEMORY_LIMIT,
+ _NET_RX, _NET_TX, _BLOCK_READ, _BLOCK_WRITE) = range(len(FIELDS))
+
+#: The columns returned by :py:meth:`StatsCollector.rates`
+RATES = (
+    'cpu_percent', 'memory_usage', 'memory_limit', 'memory_percent',
+    'net_rx_rate', 'net_tx_rate', 'block_read_rate', 'block_write_rate',
+)
+
+
+class StatsCollector:
+    """
+    Samples the resource usage statistics of many containers, like
+    ``docker stats``.
+
+    Each round, the statistics of every container are fetched concurrently,
+    with a single (``one_shot``) sample each, and the figures needed to
+    compute usage and rates are kept in ring buffers backed by flat arrays:
+    the last ``history`` samples of each container. CPU usage, memory usage
+    and network and block I/O rates are then computed for all the containers
+    at once, from their last two samples. If `NumPy`_ is installed (install
+    ``docker[stats]``), the buffers are NumPy arrays and the computation is
+    vectorized.
+
+    Example:
+
+        >>> collector = client.containers.collect_stats(
+        ...     filters={'label': 'app=web'}
+        ... )
+        >>> rates = collector.rates()
+        >>> for container_id, cpu in zip(rates['id'], rates['cpu_percent']):
+        ...     print(container_id[:12], f'{cpu:.1f}%')
+        >>> collector.stop()
+
+    Args:
+        client (:py:class:`~docker.client.DockerClient`): The client to use.
+        containers (list): The containers to sample, as
+            :py:class:`~docker.models.containers.Container` objects or
+            container names or IDs.
+        filters (dict): Sample the running containers matching these filters
+            instead, as in :py:meth:`ContainerCollection.list`, listed again
+            every round. By default, all running containers are sampled.
+            Ignored if ``containers`` is given.
+        interval (float): Seconds between the start of two rounds.
+            Default: 1
+        history (int): How many samples to keep per container. Default: 60
+        max_workers (int): Fetch the statistics of up to this many
+            containers concurrently, on a thread pool shared by the client,
+            at most 32. Default: 8
+
+    .. _NumPy: https://numpy.org
+    """
+
+    def __init__(self, client, containers=None, filters=None,
+                 interval=DEFAULT_STATS_INTERVAL,
+                 history=DEFAULT_STATS_HISTORY, max_workers=8):
+        if history < 2:
+            raise InvalidArgument('history must be at least 2')
+        check_max_workers(max_workers)
+        self.client = client
+        self.containers = None
+        if containers is not None:
+            self.containers = [getattr(c, 'id', c) for c in containers]
+        self.filters = filters
+        self.interval = interval
+        self.history = history
+        self.max_workers = max_workers
+
+        self._lock = threading.Lock()
+        self._buffers = _buffers(history)
+        # Container ID -> row of the buffers
+        self._rows = {}
+        self._free_rows = []
+        self._thread = None
+        self._stopped = threading.Event()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def start(self):
+        """
+        Sample the containers every ``interval`` seconds in a background
+        thread.
+        """
+        if self._thread is not None:
+            raise RuntimeError('The collector has already been started')
+        self._stopped.clear()
+        self._thread = threading.Thread(
+            target=self._run, name='docker-stats', daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stop sampling. The samples collected so far are kept.
+        """
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while not self._stopped.is_set():
+            started = time.monotonic()
+            try:
+                self.sample()
+            except Exception:
+                log.warning('Error sampling stats', exc_info=True)
+            self._stopped.wait(
+                max(self.interval - (time.monotonic() - started), 0)
+            )
+
+    def sample(self):
+        """
+        Take one sample of every container now.
+
+        Returns:
+            (int): The number of containers sampled.
+
+        Raises:
+            :py:class:`docker.errors.APIError`
+                If listing the containers fails.
+        """
+        api = self.client.api
+        if self.containers is not None:
+            ids = self.containers
+        else:
+            ids = [c['Id'] for c in api.containers(filters=self.filters)]
+        one_shot = version_gte(api._version, '1.41') or None
+
+        def fetch(container_id):
+            try:
+                stats = api.stats(
+                    container_id, stream=False, one_shot=one_shot
+                )
+            except NotFound:
+                return _GONE
+            except Exception:
+                log.warning(
+                    'Error getting the stats of %s', container_id,
+                    exc_info=True
+                )
+                return None
+            return _parse(stats)
+
+        samples = list(bounded_map(
+            self.client._get_executor(), fetch, ids, self.max_workers
+        ))
+        rows, values = [], []
+        with self._lock:
+            if self.containers is None:
+                # Forget the containers which are gone
+                for container_id in set(self._rows) - set(ids):
+                    self._release(container_id)
+            for container_id, sample in zip(ids, samples):
+                if sample is _GONE and container_id in self._rows:
+                    self._release(container_id)
+                if sample is None or sample is _GONE:
+                    continue
+                rows.append(self._row(container_id))
+                values.append(sample)
+            self._buffers.write(rows, values)
+        return len(rows)
+
+    def _row(self, container_id):
+        row = self._rows.get(container_id)
+        if row is None:
+            if not self._free_rows:
+                # Grow geometrically
+                added = self._buffers.add_rows(max(self._buffers.rows, 16))
+                self._free_rows.extend(reversed(added))
+            row = self._rows[container_id] = self._free_rows.pop()
+        return row
+
+    def _release(self, container_id):
+        row = self._rows.pop(container_id)
+        self._buffers.reset(row)
+        self._free_rows.append(row)
+
+    def rates(self):
+        """
+        Compute the current usage of every container sampled, from its last
+        two samples.
+
+        Returns:
+            (dict): Columns of equal length, one entry per container:
+            ``id``, a list of container IDs, then ``cpu_percent``,
+            ``memory_usage`` and ``memory_limit`` (in bytes),
+            ``memory_percent``, ``net_rx_rate``, ``net_tx_rate``,
+            ``block_read_rate`` and ``block_write_rate`` (in bytes per
+            second), as NumPy arrays if NumPy is installed and lists
+            otherwise. Values which need two samples are ``nan`` for a
+            container sampled once.
+        """
+        with self._lock:
+            ids = list(self._rows)
+            rates = self._buffers.rates([self._rows[i] for i in ids])
+        rates['id'] = ids
+        return rates
+
+    def samples(self, container):
+        """
+        The samples kept for a container, oldest first.
+
+        Args:
+            container (str): The container's ID, or a
+                :py:class:`~docker.models.containers.Container` object
+
+        Returns:
+            (dict): A column per name in :py:data:`FIELDS`, or ``None`` if
+            the container hasn't been sampled. ``time`` is in seconds since
+            the epoch, the CPU times in nanoseconds and the others in
+            bytes.
+        """
+        container_id = getattr(container, 'id', container)
+        with self._lock:
+            row = self._rows.get(container_id)
+            if row is None:
+                return None
+            return self._buffers.samples(row)
+
+
+def _buffers(history):
+    if numpy is not None:
+        return _NumpyBuffers(history)
+    return _ArrayBuffers(history)
+
+
+class _ArrayBuffers:
+    """
+    Ring buffers of samples in a flat :py:class:`array.array`: ``capacity``
+    slots of ``len(FIELDS)`` values for each row.
+    """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.rows = 0
+        self.data = array.array('d')
+        # How many samples have been written to each row
+        self.counts = array.array('q')
+
+    def add_rows(self, n):
+        """
+        Add ``n`` empty rows. Returns their indices.
+        """
+        size = n * self.capacity * len(FIELDS)
+        self.data.extend(array.array('d', [0.0]) * size)
+        self.counts.extend([0] * n)
+        self.rows += n
+        return range(self.rows - n, self.rows)
+
+    def reset(self, row):
+        self.counts[row] = 0
+
+    def _offset(self, row, sample):
+        slot = sample % self.capacity
+        return (row * self.capacity + slot) * len(FIELDS)
+
+    def write(self, rows, values):
+        for row, sample in zip(rows, values):
+            start = self._offset(row, self.counts[row])
+            self.data[start:start + len(FIELDS)] = array.array('d', sample)
+            self.counts[row] += 1
+
+    def samples(self, row):
+        count = self.counts[row]
+        first = max(count - self.capacity, 0)
+        columns = {field: [] for field in FIELDS}
+        for sample in range(first, count):
+            start = self._offset(row, sample)
+            for field, value in zip(
+                FIELDS, self.data[start:start + len(FIELDS)]
+            ):
+                columns[field].append(value)
+        return columns
+
+    def rates(self, rows):
+        nan = math.nan
+        columns = {name: [] for name in RATES}
+        for row in rows:
+            count = self.counts[row]
+            start = self._offset(row, count - 1)
+            cur = self.data[start:start + len(FIELDS)]
+            columns['memory_usage'].append(cur[_MEMORY_USAGE])
+            columns['memory_limit'].append(cur[_MEMORY_LIMIT])
+            columns['memory_percent'].append(
+                cur[_MEMORY_USAGE] / cur[_MEMORY_LIMIT] * 100
+                if cur[_MEMORY_LIMIT] > 0 else nan
+            )
+            if count < 2:
+                for name in ('cpu_percent', 'net_rx_rate', 'net_tx_rate',
+                             'block_read_rate', 'block_write_rate'):
+                    columns[name].append(nan)
+                continue
+
+            start = self._offset(row, count - 2)
+            prev = self.data[start:start + len(FIELDS)]
+            cpu = cur[_CPU_TOTAL] - prev[_CPU_TOTAL]
+            system = cur[_CPU_SYSTEM] - prev[_CPU_SYSTEM]
+            columns['cpu_percent'].append(
+                cpu / system * cur[_ONLINE_CPUS] * 100
+                if system > 0 and cpu >= 0 else nan
+            )
+            elapsed = cur[_TIME] - prev[_TIME]
+            for name, field in (('net_rx_rate', _NET_RX),
+                                ('net_tx_rate', _NET_TX),
+                                ('block_read_rate', _BLOCK_READ),
+                                ('block_write_rate', _BLOCK_WRITE)):
+                delta = cur[field] - prev[field]
+                columns[name].append(
+                    delta / elapsed if elapsed > 0 and delta >= 0 else nan
+                )
+        return columns
+
+
+class _NumpyBuffers:
+    """
+    Ring buffers of samples in a NumPy array of shape
+    ``(rows, capacity, len(FIELDS))``.
+    """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.data = numpy.zeros((0, capacity, len(FIELDS)))
+        self.counts = numpy.zeros(0, dtype=numpy.int64)
+
+    @property
+    def rows(self):
+        return len(self.counts)
+
+    def add_rows(self, n):
+        rows = self.rows
+        self.data = numpy.concatenate(
+            [self.data, numpy.zeros((n, self.capacity, len(FIELDS)))]
+        )
+        self.counts = numpy.concatenate(
+            [self.counts, numpy.zeros(n, dtype=numpy.int64)]
+        )
+        return range(rows, rows + n)
+
+    def reset(self, row):
+        self.counts[row] = 0
+
+    def write(self, rows, values):
+        if not rows:
+            return
+        rows = numpy.asarray(rows)
+        self.data[rows, self.counts[rows] % self.capacity] = values
+        self.counts[rows] += 1
+
+    def samples(self, row):
+        count = int(self.counts[row])
+        slots = numpy.arange(max(count - self.capacity, 0), count) % \
+            self.capacity
+        data = self.data[row, slots]
+        return {field: data[:, i] for i, field in enumerate(FIELDS)}
+
+    def rates(self, rows):
+        rows = numpy.asarray(rows, dtype=numpy.int64)
+        counts = self.counts[rows]
+        cur = self.data[rows, (counts - 1) % self.capacity]
+        prev = self.data[rows, (counts - 2) % self.capacity]
+        # Rows with a single sample have nothing to compare with
+        prev[counts < 2] = numpy.nan
+
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            cpu = cur[:, _CPU_TOTAL] - prev[:, _CPU_TOTAL]
+            system = cur[:, _CPU_SYSTEM] - prev[:, _CPU_SYSTEM]
+            cpu_percent = numpy.where(
+                (system > 0) & (cpu >= 0),
+                cpu / system * cur[:, _ONLINE_CPUS] * 100, numpy.nan
+            )
+            limit = cur[:, _MEMORY_LIMIT]
+            memory_percent = numpy.where(
+                limit > 0, cur[:, _MEMORY_USAGE] / limit * 100, numpy.nan
+            )
+            elapsed = (cur[:, _TIME] - prev[:, _TIME])[:, None]
+            io = cur[:, _NET_RX:] - prev[:, _NET_RX:]
+            io_rates = numpy.where(
+                (elapsed > 0) & (io >= 0), io / elapsed, numpy.nan
+            )
+
+        return {
+            'cpu_percent': cpu_percent,
+            'memory_usage': cur[:, _MEMORY_USAGE],
+            'memory_limit': limit,
+            'memory_percent': memory_percent,
+            'net_rx_rate': io_rates[:, 0],
+            'net_tx_rate': io_rates[:, 1],
+            'block_read_rate': io_rates[:, 2],
+            'block_write_rate': io_rates[:, 3],
+        }
+
+
+def _parse(stats):
+    """
+    Extract the values in :py:data:`FIELDS` from the statistics of a
+    container. Returns ``None`` if the container isn't running.
+    """
+    read = stats.get('read')
+    if not read or read.startswith('0001-'):
+        return None
+    seconds, nanoseconds = parse_timestamp(read)
+
+    cpu = stats.get('cpu_stats') or {}
+    usage = cpu.get('cpu_usage') or {}
+    online_cpus = cpu.get('online_cpus') or \
+        len(usage.get('percpu_usage') or ()) or 1
+
+    memory = stats.get('memory_stats') or {}
+    memory_usage = memory.get('usage', 0)
+    # Like the docker CLI, leave out the page cache which can be reclaimed
+    # (cgroup v1, then v2)
+    for key in ('total_inactive_file', 'inactive_file'):
+        inactive = (memory.get('stats') or {}).get(key)
+        if inactive is not None and inactive < memory_usage:
+            memory_usage -= inactive
+            break
+
+    networks = (stats.get('networks') or {}).values()
+    io = (stats.get('blkio_stats') or {}).get('io_service_bytes_recursive')
+    io = io or ()
+
+    return (
+        seconds + nanoseconds / 1e9,
+        usage.get('total_usage', 0),
+        cpu.get('system_cpu_usage', 0),
+        online_cpus,
+        memory_usage,
+        memory.get('limit', 0),
+        sum(n.get('rx_bytes', 0) for n in networks),
+        sum(n.get('tx_bytes', 0) for n in networks),
+        sum(e.get('value', 0) for e in io
+            if e.get('op', '').lower() == 'read'),
+        sum(e.get('value', 0) for e in io
+            if e.get('op', '').lower() == 'write'),
+    )
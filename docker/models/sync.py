@@ -0,0 +1,192 @@
+import errno
+import hashlib
+import os
+import posixpath
+import stat
+from collections import namedtuple
+
+from ..constants import IS_WINDOWS_PLATFORM
+from ..errors import DockerException
+from ..utils import stream_archive
+from ..utils.build import PatternMatcher
+
+# Total length of the paths passed to a single command run in the container
+_MAX_ARGS_LENGTH = 64 * 1024
+
+SyncResult = namedtuple('SyncResult', 'sent,deleted')
+SyncResult.__doc__ = """
+What :py:meth:`~docker.models.containers.Container.sync_path` changed in
+the container: the paths sent and the paths deleted, relative to the
+directory synced.
+"""
+
+# Type, size, modification time (in seconds) and permission bits of a file
+_Entry = namedtuple('_Entry', 'type,size,mtime,mode')
+
+
+def sync_path(container, src, path, exclude=None, delete=True,
+              checksum=False, gzip=False):
+    root = os.path.abspath(src)
+    if not os.path.isdir(root):
+        raise NotADirectoryError(errno.ENOTDIR, 'Not a directory', src)
+    path = posixpath.normpath(path)
+    matcher = PatternMatcher(exclude or [])
+    local = _local_entries(root, matcher)
+    remote = _remote_entries(container, path)
+
+    sent = []
+    replaced = []
+    candidates = []
+    for name, entry in local.items():
+        other = remote.get(name)
+        if other is None:
+            sent.append(name)
+        elif other.type != entry.type:
+            replaced.append(name)
+            sent.append(name)
+        elif not IS_WINDOWS_PLATFORM and entry.mode != other.mode:
+            # Directories too: the archive holds them without their contents
+            sent.append(name)
+        elif entry.type == stat.S_IFDIR:
+            continue
+        elif entry.size != other.size:
+            sent.append(name)
+        elif entry.mtime != other.mtime:
+            candidates.append(name)
+    if checksum:
+        candidates = _differing(container, root, path, candidates)
+    sent.extend(candidates)
+
+    deleted = replaced
+    if delete:
+        # Paths excluded locally are left alone
+        deleted = deleted + [
+            name for name in remote
+            if name not in local and not matcher.matches(name)
+        ]
+    # Deleting a directory deletes its contents
+    deleting = set(deleted)
+    deleted = sorted(
+        name for name in deleted
+        if not any(parent in deleting for parent in _parents(name))
+    )
+    if deleted:
+        _run(container, ['rm', '-rf', '--'], [
+            posixpath.join(path, name) for name in deleted
+        ])
+
+    sent.sort()
+    if sent:
+        data = stream_archive(root, files=sent)
+        try:
+            container.put_archive(path, data, gzip=gzip)
+        finally:
+            data.close()
+    return SyncResult(sent, deleted)
+
+
+def _parents(name):
+    parent = posixpath.dirname(name)
+    while parent:
+        yield parent
+        parent = posixpath.dirname(parent)
+
+
+def _local_entries(root, matcher):
+    entries = {}
+    for name in matcher.walk(root):
+        st = os.lstat(os.path.join(root, name))
+        entries[name.replace(os.sep, '/')] = _Entry(
+            stat.S_IFMT(st.st_mode), st.st_size, int(st.st_mtime),
+            stat.S_IMODE(st.st_mode)
+        )
+    return entries
+
+
+def _remote_entries(container, path):
+    # GNU and BusyBox find and stat both support these. Paths with a
+    # newline in their name can't be told apart and are left out.
+    output = _run(container, [
+        'find', path, '-mindepth', '1',
+        '-exec', 'stat', '-c', '%f %s %Y %n', '{}', '+'
+    ])
+    prefix = path.rstrip('/') + '/'
+    entries = {}
+    for line in output.decode('utf-8', 'surrogateescape').split('\n'):
+        fields = line.split(' ', 3)
+        if len(fields) != 4 or not fields[3].startswith(prefix):
+            continue
+        try:
+            mode = int(fields[0], 16)
+            entries[fields[3][len(prefix):]] = _Entry(
+                stat.S_IFMT(mode), int(fields[1]), int(fields[2]),
+                stat.S_IMODE(mode)
+            )
+        except ValueError:
+            continue
+    return entries
+
+
+def _differing(container, root, path, names):
+    """
+    The regular files among ``names`` whose SHA-256 digests differ between
+    ``root`` and ``path`` in the container.
+    """
+    names = [
+        name for name in names
+        if os.path.isfile(os.path.join(root, name))
+        and not os.path.islink(os.path.join(root, name))
+    ]
+    if not names:
+        return []
+    output = _run(container, ['sha256sum', '--'], [
+        posixpath.join(path, name) for name in names
+    ])
+    prefix = path.rstrip('/') + '/'
+    remote = {}
+    for line in output.decode('utf-8', 'surrogateescape').split('\n'):
+        digest, _, filename = line.partition('  ')
+        if filename.startswith(prefix):
+            remote[filename[len(prefix):]] = digest
+    return [
+        name for name in names
+        if remote.get(name) != _sha256(os.path.join(root, name))
+    ]
+
+
+def _sha256(filename):
+    h = hashlib.sha256()
+    with open(filename, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _run(container, cmd, args=None):
+    """
+    Run ``cmd`` in the container, with ``args`` appended over as many runs
+    as it takes to stay under the length limit of a command line, and
+    return what it wrote to stdout.
+    """
+    batches = [[]]
+    if args:
+        batches = []
+        length = _MAX_ARGS_LENGTH
+        for arg in args:
+            if length + len(arg) >= _MAX_ARGS_LENGTH:
+                batches.append([])
+                length = 0
+            batches[-1].append(arg)
+            length += len(arg) + 1
+    output = []
+    for batch in batches:
+        exit_code, (stdout, stderr) = container.exec_run(
+            cmd + batch, demux=True
+        )
+        if exit_code != 0:
+            raise DockerException(
+                f'{cmd[0]} failed in container {container.short_id}: '
+                f'{(stderr or b"").decode("utf-8", "replace").strip()}'
+            )
+        output.append(stdout or b'')
+    return b''.join(output)
@@ -28,6 +28,7 @@ class Volume(Model):
 class VolumeCollection(Collection):
     """Volumes on the Docker server."""
     model = Volume
+    mirror_resource = 'volumes'
 
     def create(self, name=None, **kwargs):
         """
@@ -73,6 +74,9 @@ class VolumeCollection(Collection):
             :py:class:`docker.errors.APIError`
                 If the server returns an error.
         """
+        volume = self._get_mirrored(volume_id)
+        if volume is not None:
+            return volume
         return self.prepare_model(self.client.api.inspect_volume(volume_id))
 
     def list(self, **kwargs):
@@ -89,6 +93,10 @@ class VolumeCollection(Collection):
             :py:class:`docker.errors.APIError`
                 If the server returns an error.
         """
+        if not kwargs:
+            volumes = self._list_mirrored()
+            if volumes is not None:
+                return volumes
         resp = self.client.api.volumes(**kwargs)
         if not resp.get('Volumes'):
             return []
@@ -0,0 +1,477 @@
+import asyncio
+import collections
+import json
+import os
+import ssl
+import urllib.parse
+import zlib
+
+import requests.structures
+
+from .. import constants
+from ..errors import DockerException
+
+_CHUNK_SIZE = 65536
+
+
+class FileBody:
+    """
+    A request body read from a file on disk. The file is only opened when
+    the request is sent, and closed once it has been fully uploaded.
+    """
+    def __init__(self, path):
+        self.path = path
+
+
+class AsyncHTTPConnection:
+    """
+    A single HTTP/1.1 connection to the Docker daemon.
+    """
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+
+    @property
+    def closed(self):
+        return self.writer.is_closing() or self.reader.at_eof()
+
+    def close(self):
+        self.writer.close()
+
+
+class AsyncResponse:
+    """
+    The response to a request sent through an
+    :py:class:`AsyncConnectionPool`. The status line and headers are
+    available as soon as the response is returned; the body is read with
+    :py:meth:`read` or iterated over with :py:meth:`iter_chunks`.
+    """
+    def __init__(self, pool, conn, url, status_code, reason, headers,
+                 timeout=None):
+        self._pool = pool
+        self._conn = conn
+        self.url = url
+        self.status_code = status_code
+        self.reason = reason
+        self.headers = headers
+        self.timeout = timeout
+        self._content = None
+        self._buffer = bytearray()
+        self._chunk_left = 0
+
+        if status_code in (204, 304) or 100 <= status_code < 200 \
+                and status_code != 101:
+            self._mode, self._left = 'length', 0
+        elif status_code == 101:
+            # The connection was hijacked, everything the daemon sends from
+            # now on is the raw stream.
+            self._mode, self._left = 'close', None
+        elif 'chunked' in headers.get('Transfer-Encoding', '').lower():
+            self._mode, self._left = 'chunked', None
+        elif 'Content-Length' in headers:
+            self._mode, self._left = 'length', int(headers['Content-Length'])
+        else:
+            self._mode, self._left = 'close', None
+        self._decoder = None
+        if headers.get('Content-Encoding', '').lower() in ('gzip', 'deflate'):
+            # Accept both gzip and zlib headers
+            self._decoder = zlib.decompressobj(zlib.MAX_WBITS | 32)
+        self._eof = self._mode == 'length' and not self._left
+        if self._eof:
+            self._release()
+
+    @property
+    def connection(self):
+        """
+        The underlying :py:class:`AsyncHTTPConnection`, which gives access to
+        the raw stream of hijacked (``attach``/``exec``) requests.
+        """
+        return self._conn
+
+    @property
+    def closed(self):
+        return self._conn is None
+
+    @property
+    def content(self):
+        return self._content
+
+    @property
+    def text(self):
+        if self._content is None:
+            return None
+        return self._content.decode('utf-8', 'replace')
+
+    def json(self, **kwargs):
+        return json.loads(self._content, **kwargs)
+
+    async def _wait(self, aw):
+        if self.timeout is None:
+            return await aw
+        return await asyncio.wait_for(aw, self.timeout)
+
+    async def _read_decoded(self, n):
+        data = await self._read_raw(n)
+        if self._decoder is None:
+            return data
+        while data:
+            decoded = self._decoder.decompress(data)
+            if decoded:
+                return decoded
+            data = await self._read_raw(n)
+        return self._decoder.flush()
+
+    async def _read_raw(self, n):
+        """
+        Read at most n bytes of the body, decoding the transfer encoding.
+        Returns an empty bytes object at the end of the body.
+        """
+        reader = self._conn.reader
+        if self._mode == 'chunked':
+            if not self._chunk_left:
+                line = await self._wait(reader.readline())
+                size = int(line.split(b';', 1)[0].strip() or b'0', 16)
+                if size == 0:
+                    # Consume trailers, up to the final empty line
+                    while line not in (b'\r\n', b'\n', b''):
+                        line = await self._wait(reader.readline())
+                    return b''
+                self._chunk_left = size
+            data = await self._wait(reader.read(min(n, self._chunk_left)))
+            if not data:
+                raise DockerException('Connection closed mid-chunk')
+            self._chunk_left -= len(data)
+            if not self._chunk_left:
+                await self._wait(reader.readexactly(2))
+            return data
+        if self._mode == 'length':
+            if not self._left:
+                return b''
+            data = await self._wait(reader.read(min(n, self._left)))
+            if not data:
+                raise DockerException('Connection closed before end of body')
+            self._left -= len(data)
+            return data
+        return await self._wait(reader.read(n))
+
+    async def read_some(self, n=_CHUNK_SIZE):
+        """
+        Read at most n bytes of the body, as soon as any are available.
+        Returns an empty bytes object once the body is exhausted.
+        """
+        if self._buffer:
+            data = bytes(self._buffer[:n])
+            del self._buffer[:n]
+            return data
+        if self._eof:
+            return b''
+        data = await self._read_decoded(n)
+        if not data:
+            self._eof = True
+            self._release()
+        return data
+
+    async def read_exactly(self, n):
+        """
+        Read exactly n bytes of the body. Returns an empty bytes object if
+        the body ends before n bytes could be read.
+        """
+        while len(self._buffer) < n:
+            if self._eof:
+                return b''
+            data = await self._read_decoded(
+                max(n - len(self._buffer), _CHUNK_SIZE)
+            )
+            if not data:
+                self._eof = True
+                self._release()
+                return b''
+            self._buffer += data
+        data = bytes(self._buffer[:n])
+        del self._buffer[:n]
+        return data
+
+    async def iter_chunks(self, chunk_size=None):
+        """
+        Iterate over the body as it arrives. With ``chunk_size``, every item
+        but the last is exactly ``chunk_size`` bytes long.
+        """
+        if chunk_size is None:
+            while True:
+                data = await self.read_some()
+                if not data:
+                    return
+                yield data
+        while True:
+            data = await self.read_exactly(chunk_size)
+            if not data:
+                break
+            yield data
+        if self._buffer:
+            data = bytes(self._buffer)
+            self._buffer.clear()
+            yield data
+
+    async def read(self):
+        """
+        Read the remainder of the body and return it. The result is also
+        kept on the :py:attr:`content` attribute.
+        """
+        if self._content is None:
+            parts = []
+            async for data in self.iter_chunks():
+                parts.append(data)
+            self._content = b''.join(parts)
+        return self._content
+
+    def _release(self):
+        conn, self._conn = self._conn, None
+        if conn is None:
+            return
+        reusable = (
+            self._mode != 'close' and
+            self.headers.get('Connection', '').lower() != 'close'
+        )
+        self._pool.release(conn, reusable)
+
+    def close(self):
+        """
+        Close the response. The connection is discarded unless the body has
+        been read in full.
+        """
+        conn, self._conn = self._conn, None
+        if conn is not None:
+            self._pool.release(conn, False)
+
+
+class AsyncConnectionPool:
+    """
+    A pool of keep-alive connections to the Docker daemon, shared by every
+    coroutine of an event loop. Connections are opened on demand, so the
+    number of requests in flight is not limited; at most ``maxsize`` idle
+    connections are kept around for reuse.
+
+    Args:
+        base_url (str): A URL as returned by
+            :py:func:`~docker.utils.parse_host`, either ``http+unix://``,
+            ``http://`` or ``https://``.
+        timeout (int): Timeout in seconds for connecting and for each read.
+        maxsize (int): The maximum number of idle connections to keep.
+        ssl_context (:py:class:`ssl.SSLContext`): Used for ``https://``.
+    """
+    def __init__(self, base_url, timeout=constants.DEFAULT_TIMEOUT_SECONDS,
+                 maxsize=constants.DEFAULT_MAX_POOL_SIZE, ssl_context=None):
+        self.timeout = timeout
+        self.maxsize = maxsize
+        self.ssl_context = ssl_context
+        self._idle = collections.deque()
+
+        if base_url.startswith('http+unix://'):
+            socket_path = base_url.replace('http+unix://', '', 1)
+            if not socket_path.startswith('/'):
+                socket_path = f'/{socket_path}'
+            self.socket_path = socket_path
+            self.host = 'localhost'
+            self.port = None
+        elif base_url.startswith(('http://', 'https://')):
+            parsed = urllib.parse.urlparse(base_url)
+            self.socket_path = None
+            self.host = parsed.hostname
+            self.port = parsed.port or (
+                443 if parsed.scheme == 'https' else 80
+            )
+            if parsed.scheme == 'https' and self.ssl_context is None:
+                self.ssl_context = ssl.create_default_context()
+            elif parsed.scheme == 'http':
+                self.ssl_context = None
+        else:
+            raise DockerException(
+                f'Unsupported protocol for asynchronous connections: '
+                f'{base_url}'
+            )
+
+    async def _connect(self):
+        if self.socket_path is not None:
+            aw = asyncio.open_unix_connection(self.socket_path)
+        else:
+            aw = asyncio.open_connection(
+                self.host, self.port, ssl=self.ssl_context
+            )
+        if self.timeout is not None:
+            aw = asyncio.wait_for(aw, self.timeout)
+        return AsyncHTTPConnection(*await aw)
+
+    async def _get_conn(self):
+        while self._idle:
+            conn = self._idle.pop()
+            if not conn.closed:
+                return conn, True
+            conn.close()
+        return await self._connect(), False
+
+    def release(self, conn, reusable=True):
+        if reusable and not conn.closed and len(self._idle) < self.maxsize:
+            self._idle.append(conn)
+        else:
+            conn.close()
+
+    def close(self):
+        while self._idle:
+            self._idle.pop().close()
+
+    async def request(self, method, path, headers=None, body=None,
+                      timeout=None):
+        """
+        Send a request and return an :py:class:`AsyncResponse` as soon as
+        the status line and headers have been received.
+        """
+        conn, reused = await self._get_conn()
+        try:
+            return await self._send(conn, method, path, headers, body, timeout)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            conn.close()
+            if not reused or not isinstance(body, (type(None), str, bytes)):
+                raise
+        # The daemon may have closed an idle keep-alive connection just as
+        # we were reusing it; retry once on a fresh one.
+        conn = await self._connect()
+        try:
+            return await self._send(conn, method, path, headers, body, timeout)
+        except BaseException:
+            conn.close()
+            raise
+
+    async def _send(self, conn, method, path, headers, body, timeout):
+        try:
+            headers = dict(headers or {})
+            headers.setdefault('Host', self.host)
+            body, length = _prepare_body(body)
+            if body is None:
+                if method in ('POST', 'PUT'):
+                    headers.setdefault('Content-Length', '0')
+            elif length is not None:
+                headers['Content-Length'] = str(length)
+            else:
+                headers['Transfer-Encoding'] = 'chunked'
+
+            lines = [f'{method} {path} HTTP/1.1']
+            lines.extend(f'{k}: {v}' for k, v in headers.items())
+            conn.writer.write(
+                ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1')
+            )
+            if isinstance(body, bytes):
+                conn.writer.write(body)
+            elif body is not None:
+                await _write_chunked(conn.writer, body)
+            await conn.writer.drain()
+
+            aw = _read_head(conn.reader)
+            if timeout is not None:
+                aw = asyncio.wait_for(aw, timeout)
+            status_code, reason, response_headers = await aw
+        except BaseException:
+            conn.close()
+            raise
+        return AsyncResponse(
+            self, conn, path, status_code, reason, response_headers,
+            timeout=timeout,
+        )
+
+
+def _prepare_body(body):
+    """
+    Return the body to send and its length, or ``None`` as the length if
+    the body has to be sent with chunked transfer encoding.
+    """
+    if body is None:
+        return None, None
+    if isinstance(body, str):
+        body = body.encode('utf-8')
+    if isinstance(body, (bytes, bytearray, memoryview)):
+        body = bytes(body)
+        return body, len(body)
+    return body, None
+
+
+async def _iter_body(body):
+    if isinstance(body, FileBody):
+        with open(body.path, 'rb') as f:
+            while True:
+                data = f.read(_CHUNK_SIZE)
+                if not data:
+                    return
+                yield data
+    elif hasattr(body, 'read'):
+        while True:
+            data = body.read(_CHUNK_SIZE)
+            if not data:
+                return
+            yield data
+    elif hasattr(body, '__aiter__'):
+        async for data in body:
+            yield data
+    else:
+        for data in body:
+            yield data
+
+
+async def _write_chunked(writer, body):
+    async for data in _iter_body(body):
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        if not data:
+            continue
+        writer.write(f'{len(data):x}\r\n'.encode('ascii'))
+        writer.write(data)
+        writer.write(b'\r\n')
+        # Apply backpressure: don't read more from the source than the
+        # transport has been able to send.
+        await writer.drain()
+    writer.write(b'0\r\n\r\n')
+
+
+async def _read_head(reader):
+    while True:
+        line = await reader.readline()
+        if not line:
+            raise ConnectionResetError(
+                'Connection closed before a response was received'
+            )
+        parts = line.decode('latin-1').rstrip('\r\n').split(' ', 2)
+        status_code = int(parts[1])
+        reason = parts[2] if len(parts) > 2 else ''
+        headers = requests.structures.CaseInsensitiveDict()
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            key, _, value = line.decode('latin-1').partition(':')
+            key, value = key.strip(), value.strip()
+            if key in headers:
+                headers[key] = f'{headers[key]}, {value}'
+            else:
+                headers[key] = value
+        # Skip informational responses, but not protocol switches
+        if status_code != 100:
+            return status_code, reason, headers
+
+
+def ssl_context_from_tls_config(tls):
+    """
+    Build an :py:class:`ssl.SSLContext` matching a
+    :py:class:`~docker.tls.TLSConfig`, or ``True`` for default settings.
+    """
+    context = ssl.create_default_context()
+    if tls is True:
+        return context
+    verify = tls.verify
+    if verify and tls.ca_cert:
+        context.load_verify_locations(tls.ca_cert)
+    elif isinstance(verify, str) and os.path.exists(verify):
+        context.load_verify_locations(verify)
+    elif not verify:
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+    if tls.cert:
+        context.load_cert_chain(*tls.cert)
+    return context
@@ -1,6 +1,17 @@
+import urllib.parse
+
 import requests.adapters
 
 
+def pool_key(url):
+    """
+    The key of the connection pool for ``url``: requests to any path on
+    the same daemon share keep-alive connections.
+    """
+    parsed = urllib.parse.urlsplit(url)
+    return f'{parsed.scheme}://{parsed.netloc}'
+
+
 class BaseHTTPAdapter(requests.adapters.HTTPAdapter):
     def close(self):
         super().close()
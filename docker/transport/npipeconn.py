@@ -5,7 +5,7 @@ import urllib3
 import urllib3.connection
 
 from .. import constants
-from .basehttpadapter import BaseHTTPAdapter
+from .basehttpadapter import BaseHTTPAdapter, pool_key
 from .npipesocket import NpipeSocket
 
 RecentlyUsedContainer = urllib3._collections.RecentlyUsedContainer
@@ -80,8 +80,9 @@ class NpipeHTTPAdapter(BaseHTTPAdapter):
         super().__init__()
 
     def get_connection(self, url, proxies=None):
+        key = pool_key(url)
         with self.pools.lock:
-            pool = self.pools.get(url)
+            pool = self.pools.get(key)
             if pool:
                 return pool
 
@@ -89,7 +90,7 @@ class NpipeHTTPAdapter(BaseHTTPAdapter):
                 self.npipe_path, self.timeout,
                 maxsize=self.max_pool_size
             )
-            self.pools[url] = pool
+            self.pools[key] = pool
 
         return pool
 
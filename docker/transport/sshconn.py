@@ -12,7 +12,7 @@ import urllib3
 import urllib3.connection
 
 from .. import constants
-from .basehttpadapter import BaseHTTPAdapter
+from .basehttpadapter import BaseHTTPAdapter, pool_key
 
 RecentlyUsedContainer = urllib3._collections.RecentlyUsedContainer
 
@@ -225,8 +225,9 @@ class SSHHTTPAdapter(BaseHTTPAdapter):
                 maxsize=self.max_pool_size,
                 host=self.ssh_host
             )
+        key = pool_key(url)
         with self.pools.lock:
-            pool = self.pools.get(url)
+            pool = self.pools.get(key)
             if pool:
                 return pool
 
@@ -240,7 +241,7 @@ class SSHHTTPAdapter(BaseHTTPAdapter):
                 maxsize=self.max_pool_size,
                 host=self.ssh_host
             )
-            self.pools[url] = pool
+            self.pools[key] = pool
 
         return pool
 
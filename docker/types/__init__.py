@@ -1,5 +1,5 @@
 from .containers import ContainerConfig, DeviceRequest, HostConfig, LogConfig, Ulimit
-from .daemon import CancellableStream
+from .daemon import AsyncCancellableStream, CancellableStream
 from .healthcheck import Healthcheck
 from .networks import EndpointConfig, IPAMConfig, IPAMPool, NetworkingConfig
 from .services import (
@@ -69,3 +69,36 @@ class CancellableStream:
 
             sock.shutdown(socket.SHUT_RDWR)
             sock.close()
+
+
+class AsyncCancellableStream:
+    """
+    Asynchronous counterpart of :py:class:`CancellableStream`, returned by
+    the streaming methods of :py:class:`~docker.api.AsyncAPIClient`.
+
+    Example:
+        >>> events = await client.events(decode=True)
+        >>> async for event in events:
+        ...   print(event)
+        >>> # and cancel from another task
+        >>> events.close()
+    """
+
+    def __init__(self, stream, response):
+        self._stream = stream
+        self._response = response
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return await self._stream.__anext__()
+        except OSError:
+            raise StopAsyncIteration from None
+
+    def close(self):
+        """
+        Closes the stream.
+        """
+        self._response.close()
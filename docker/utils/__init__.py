@@ -1,5 +1,14 @@
 
-from .build import create_archive, exclude_paths, match_tag, mkbuildcontext, tar
+from .build import (
+    create_archive,
+    exclude_paths,
+    match_tag,
+    mkbuildcontext,
+    stream_archive,
+    tar,
+)
+from .compression import ParallelGzip
+from .context_cache import ContextCache
 from .decorators import check_resource, minimum_version, update_headers
 from .utils import (
     compare_version,
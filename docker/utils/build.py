@@ -1,11 +1,19 @@
 import io
 import os
+import queue
 import re
 import tarfile
 import tempfile
+import threading
+from gzip import GzipFile
 
-from ..constants import IS_WINDOWS_PLATFORM
-from .fnmatch import fnmatch
+from ..constants import (
+    IS_WINDOWS_PLATFORM,
+    STREAM_ARCHIVE_CHUNK_SIZE,
+    STREAM_ARCHIVE_MAX_CHUNKS,
+)
+from .compression import ParallelGzip
+from .fnmatch import translate
 
 _SEP = re.compile('/|\\\\') if IS_WINDOWS_PLATFORM else re.compile('/')
 _TAG = re.compile(
@@ -19,7 +27,8 @@ def match_tag(tag: str) -> bool:
     return bool(_TAG.match(tag))
 
 
-def tar(path, exclude=None, dockerfile=None, fileobj=None, gzip=False):
+def tar(path, exclude=None, dockerfile=None, fileobj=None, gzip=False,
+        stream=False, cache=None, reproducible=False):
     root = os.path.abspath(path)
     exclude = exclude or []
     dockerfile = dockerfile or (None, None)
@@ -32,9 +41,15 @@ def tar(path, exclude=None, dockerfile=None, fileobj=None, gzip=False):
             ('.dockerignore', dockerignore_contents),
             dockerfile,
         ]
+    files = sorted(exclude_paths(root, exclude, dockerfile=dockerfile[0]))
+    if stream:
+        return stream_archive(
+            root, files=files, gzip=gzip, extra_files=extra_files,
+            cache=cache, reproducible=reproducible
+        )
     return create_archive(
-        files=sorted(exclude_paths(root, exclude, dockerfile=dockerfile[0])),
-        root=root, fileobj=fileobj, gzip=gzip, extra_files=extra_files
+        files=files, root=root, fileobj=fileobj, gzip=gzip,
+        extra_files=extra_files, cache=cache, reproducible=reproducible
     )
 
 
@@ -68,19 +83,154 @@ def build_file_list(root):
 
 
 def create_archive(root, files=None, fileobj=None, gzip=False,
-                   extra_files=None):
-    extra_files = extra_files or []
+                   extra_files=None, cache=None, reproducible=False):
+    """
+    Write an archive of ``files``, paths relative to ``root`` (every path
+    under it by default), and ``extra_files``, ``(name, contents)`` tuples,
+    to ``fileobj`` (a temporary file by default), and return it.
+
+    ``gzip`` is ``True`` to compress the archive, or a
+    :py:class:`~docker.utils.ParallelGzip` to compress it on several threads.
+
+    If ``reproducible`` is ``True``, the archive only depends on the names,
+    contents and executable bits of the files: entries are sorted, owners
+    are root, modification times are the epoch and modes are ``0755`` for
+    directories and executables, ``0644`` for other files. Gzip headers
+    carry no name or timestamp either.
+    """
     if not fileobj:
         fileobj = tempfile.NamedTemporaryFile()
-    t = tarfile.open(mode='w:gz' if gzip else 'w', fileobj=fileobj)
+    _write_archive(fileobj, root, files, gzip, extra_files, cache,
+                   reproducible)
+    fileobj.seek(0)
+    return fileobj
+
+
+def stream_archive(root, files=None, gzip=False, extra_files=None,
+                   chunk_size=STREAM_ARCHIVE_CHUNK_SIZE,
+                   max_chunks=STREAM_ARCHIVE_MAX_CHUNKS, cache=None,
+                   reproducible=False):
+    """
+    Like :py:func:`create_archive`, but return a generator of chunks of the
+    archive, produced by a background thread while the previous chunks are
+    consumed (for instance, sent as a chunked request body).
+
+    At most ``max_chunks`` chunks of ``chunk_size`` bytes are buffered: the
+    thread waits for the consumer to catch up. Closing the generator stops
+    the thread. Errors raised while producing the archive, such as a file
+    which can't be read, are raised by the generator.
+    """
+    pipe = _ChunkPipe(chunk_size, max_chunks)
+
+    def produce():
+        try:
+            _write_archive(pipe, root, files, gzip, extra_files, cache,
+                           reproducible)
+            pipe.finish()
+        except BaseException as e:
+            pipe.finish(e)
+
+    def consume():
+        thread = threading.Thread(
+            target=produce, name='docker-build-context', daemon=True
+        )
+        thread.start()
+        try:
+            yield from pipe
+        finally:
+            pipe.abandon()
+            thread.join()
+
+    return consume()
+
+
+class _ChunkPipe:
+    """
+    A write-only file object which hands what is written to it over to a
+    reader in another thread, in chunks, through a bounded queue.
+    """
+
+    def __init__(self, chunk_size, max_chunks):
+        self.chunk_size = chunk_size
+        self._queue = queue.Queue(max_chunks)
+        self._buffer = bytearray()
+        self._offset = 0
+        self._abandoned = threading.Event()
+
+    def write(self, data):
+        if self._abandoned.is_set():
+            raise BrokenPipeError('The archive is no longer being read')
+        self._buffer += data
+        self._offset += len(data)
+        if len(self._buffer) >= self.chunk_size:
+            self._put(bytes(self._buffer))
+            self._buffer.clear()
+        return len(data)
+
+    def tell(self):
+        return self._offset
+
+    def flush(self):
+        pass
+
+    def finish(self, error=None):
+        if error is None and self._buffer:
+            self._put(bytes(self._buffer))
+        self._buffer.clear()
+        self._put((error,))
+
+    def _put(self, item):
+        while not self._abandoned.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                pass
+
+    def abandon(self):
+        self._abandoned.set()
+
+    def __iter__(self):
+        while True:
+            item = self._queue.get()
+            if isinstance(item, tuple):
+                error, = item
+                if error is not None:
+                    raise error
+                return
+            yield item
+
+
+def _write_archive(fileobj, root, files, gzip, extra_files, cache=None,
+                   reproducible=False):
+    extra_files = extra_files or []
+    gz = None
+    if isinstance(gzip, ParallelGzip):
+        gz = gzip.open(fileobj)
+    elif gzip and reproducible:
+        # tarfile would write the name of fileobj and the current time
+        gz = GzipFile(filename='', mode='wb', fileobj=fileobj, mtime=0)
+    if gz is not None:
+        t = tarfile.open(mode='w', fileobj=gz)
+    else:
+        t = tarfile.open(mode='w:gz' if gzip else 'w', fileobj=fileobj)
     if files is None:
         files = build_file_list(root)
+    if reproducible:
+        files = sorted(files)
     extra_names = {e[0] for e in extra_files}
+    if cache is not None:
+        root = os.path.abspath(root)
+    archived = []
     for path in files:
         if path in extra_names:
             # Extra files override context files with the same name
             continue
         full_path = os.path.join(root, path)
+        if cache is not None:
+            archived.append(full_path)
+            if cache.add_cached(t, full_path, path, reproducible):
+                continue
 
         i = t.gettarinfo(full_path, arcname=path)
         if i is None:
@@ -97,10 +247,16 @@ def create_archive(root, files=None, fileobj=None, gzip=False,
             # and directories executable by default.
             i.mode = i.mode & 0o755 | 0o111
 
+        if reproducible:
+            _normalize_tarinfo(i)
+
         if i.isfile():
             try:
                 with open(full_path, 'rb') as f:
-                    t.addfile(i, f)
+                    if cache is not None and i.type == tarfile.REGTYPE:
+                        cache.add_new(t, i, f, full_path, reproducible)
+                    else:
+                        t.addfile(i, f)
             except OSError as oe:
                 raise OSError(
                     f'Can not read file in context: {full_path}'
@@ -116,8 +272,22 @@ def create_archive(root, files=None, fileobj=None, gzip=False,
         t.addfile(info, io.BytesIO(contents_encoded))
 
     t.close()
-    fileobj.seek(0)
-    return fileobj
+    if gz is not None:
+        gz.close()
+    if cache is not None:
+        cache.save(root, archived)
+
+
+def _normalize_tarinfo(info):
+    info.mtime = 0
+    info.uid = info.gid = 0
+    info.uname = info.gname = ''
+    if info.issym():
+        info.mode = 0o777
+    elif info.isdir() or info.mode & 0o111:
+        info.mode = 0o755
+    else:
+        info.mode = 0o644
 
 
 def mkbuildcontext(dockerfile):
@@ -162,61 +332,79 @@ class PatternMatcher:
             lambda p: p.dirs, [Pattern(p) for p in patterns]
         ))
         self.patterns.append(Pattern('!.dockerignore'))
+        self._compile()
+
+    def _compile(self):
+        # The last pattern matching a path decides whether it's excluded.
+        # A pattern also matches a path if it matches the path's first
+        # components, as many as the pattern has. All the patterns are
+        # compiled into one regex, most significant first, which matches
+        # the path once and tells which pattern won. Patterns which can
+        # match across a "/" ("**", "[!x]"...) can't be tied to a number of
+        # components in a regex: their parent-path match is checked apart.
+        alternatives = []
+        self._prefix_patterns = []
+        for index in reversed(range(len(self.patterns))):
+            pattern = self.patterns[index]
+            body = translate(pattern.cleaned_pattern.lower())[1:-1]
+            if pattern.crosses_separators:
+                self._prefix_patterns.append((index, pattern))
+                alternatives.append(f'(?P<p{index}>{body})')
+            else:
+                alternatives.append(f'(?P<p{index}>{body}(?:/(?s:.*))?)')
+        self._regex = re.compile('(?:{})$'.format('|'.join(alternatives)))
 
-    def matches(self, filepath):
-        matched = False
-        parent_path = os.path.dirname(filepath)
-        parent_path_dirs = split_path(parent_path)
-
+        # Character prefixes of the exclusions: a directory whose path is
+        # one of them may contain files which are re-included
+        self._exclusion_prefixes = set()
         for pattern in self.patterns:
-            negative = pattern.exclusion
-            match = pattern.match(filepath)
-            if not match and parent_path != '':
-                if len(pattern.dirs) <= len(parent_path_dirs):
-                    match = pattern.match(
-                        os.path.sep.join(parent_path_dirs[:len(pattern.dirs)])
-                    )
-
-            if match:
-                matched = not negative
+            if pattern.exclusion:
+                cleaned = pattern.cleaned_pattern
+                self._exclusion_prefixes.update(
+                    cleaned[:i] for i in range(len(cleaned) + 1)
+                )
 
-        return matched
+    def matches(self, filepath):
+        normalized = normalize_slashes(filepath).lower()
+        match = self._regex.match(normalized)
+        winner = int(match.lastgroup[1:]) if match else -1
+
+        if self._prefix_patterns:
+            parent_path_dirs = split_path(os.path.dirname(filepath))
+            for index, pattern in self._prefix_patterns:
+                if index <= winner:
+                    break
+                if len(pattern.dirs) <= len(parent_path_dirs) and \
+                        pattern.match('/'.join(
+                            parent_path_dirs[:len(pattern.dirs)]
+                        )):
+                    winner = index
+                    break
+
+        return winner >= 0 and not self.patterns[winner].exclusion
 
     def walk(self, root):
-        def rec_walk(current_dir):
-            for f in os.listdir(current_dir):
-                fpath = os.path.join(
-                    os.path.relpath(current_dir, root), f
-                )
-                if fpath.startswith(f".{os.path.sep}"):
-                    fpath = fpath[2:]
+        def rec_walk(current_dir, prefix):
+            with os.scandir(current_dir) as entries:
+                entries = list(entries)
+            for entry in entries:
+                fpath = prefix + entry.name
                 match = self.matches(fpath)
                 if not match:
                     yield fpath
 
-                cur = os.path.join(root, fpath)
-                if not os.path.isdir(cur) or os.path.islink(cur):
+                if not entry.is_dir(follow_symlinks=False):
                     continue
 
-                if match:
-                    # If we want to skip this file and it's a directory
-                    # then we should first check to see if there's an
-                    # excludes pattern (e.g. !dir/file) that starts with this
-                    # dir. If so then we can't skip this dir.
-                    skip = True
-
-                    for pat in self.patterns:
-                        if not pat.exclusion:
-                            continue
-                        if pat.cleaned_pattern.startswith(
-                                normalize_slashes(fpath)):
-                            skip = False
-                            break
-                    if skip:
-                        continue
-                yield from rec_walk(cur)
+                # If we want to skip this directory, we should first check
+                # to see if there's an excludes pattern (e.g. !dir/file)
+                # that starts with this dir. If so then we can't skip it.
+                if match and normalize_slashes(fpath) not in \
+                        self._exclusion_prefixes:
+                    continue
+                yield from rec_walk(entry.path, fpath + os.path.sep)
 
-        return rec_walk(root)
+        return rec_walk(root, '')
 
 
 class Pattern:
@@ -228,6 +416,15 @@ class Pattern:
 
         self.dirs = self.normalize(pattern_str)
         self.cleaned_pattern = '/'.join(self.dirs)
+        self._regex = re.compile(translate(self.cleaned_pattern.lower()))
+
+    @property
+    def crosses_separators(self):
+        """
+        Whether the pattern can match a different number of path
+        components than it has.
+        """
+        return '**' in self.cleaned_pattern or '[' in self.cleaned_pattern
 
     @classmethod
     def normalize(cls, p):
@@ -257,4 +454,5 @@ class Pattern:
         return split
 
     def match(self, filepath):
-        return fnmatch(normalize_slashes(filepath), self.cleaned_pattern)
+        return self._regex.match(normalize_slashes(filepath).lower()) \
+            is not None
@@ -0,0 +1,208 @@
+import collections
+import os
+import struct
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+from ..constants import DEFAULT_GZIP_BLOCK_SIZE
+from ..errors import InvalidArgument
+
+# The header of a gzip member without a name nor a timestamp
+_GZIP_HEADER = b'\x1f\x8b\x08\x00\x00\x00\x00\x00'
+_GZIP_OS_UNKNOWN = b'\xff'
+# Deflate can refer back to 32 KiB of history
+_WINDOW_SIZE = 32 * 1024
+
+
+class ParallelGzip:
+    """
+    Gzip compression options for build contexts and archive uploads, which
+    compress blocks of data on several threads, like `pigz`_.
+
+    Each block is deflated independently, with the end of the previous block
+    as a preset dictionary, and the blocks are concatenated into a single
+    gzip stream which any gzip decoder reads. :py:mod:`zlib` releases the
+    GIL while compressing, so throughput scales with the number of threads.
+
+    Pass it as the ``gzip`` argument of
+    :py:meth:`~docker.api.build.BuildApiMixin.build`,
+    :py:meth:`~docker.api.container.ContainerApiMixin.put_archive` or
+    :py:meth:`~docker.api.plugin.PluginApiMixin.create_plugin`.
+
+    Args:
+        level (int): Compression level, from 0 (none) to 9 (smallest output).
+            Default: 6
+        threads (int): Number of compression threads. Default: the number of
+            CPUs
+        block_size (int): Size of the blocks of uncompressed data compressed
+            by each thread. Default: 128 KiB
+
+    .. _pigz: https://zlib.net/pigz/
+    """
+
+    def __init__(self, level=6, threads=None,
+                 block_size=DEFAULT_GZIP_BLOCK_SIZE):
+        if not 0 <= level <= 9:
+            raise InvalidArgument(
+                f'Invalid compression level {level}, expected 0 to 9'
+            )
+        if threads is not None and threads < 1:
+            raise InvalidArgument('threads must be greater than 0')
+        if block_size < 1:
+            raise InvalidArgument('block_size must be greater than 0')
+        self.level = level
+        self.threads = threads or os.cpu_count() or 1
+        self.block_size = block_size
+
+    def open(self, fileobj):
+        """
+        Return a :py:class:`ParallelGzipWriter` which compresses what is
+        written to it into ``fileobj``.
+        """
+        return ParallelGzipWriter(
+            fileobj, self.level, self.threads, self.block_size
+        )
+
+    def compress(self, data):
+        """
+        Compress ``data``, which can be :py:class:`bytes`, a file-like object
+        or an iterable of :py:class:`bytes`.
+
+        Returns:
+            (generator): The compressed data, in chunks, produced as the
+            generator is consumed.
+        """
+        out = _ChunkList()
+        with self.open(out) as writer:
+            for chunk in _iter_chunks(data, self.block_size):
+                writer.write(chunk)
+                yield from out.drain()
+        yield from out.drain()
+
+
+class ParallelGzipWriter:
+    """
+    A write-only file object compressing what is written to it into
+    ``fileobj``, in parallel. See :py:class:`ParallelGzip`. ``fileobj`` is
+    not closed by :py:meth:`close`.
+    """
+
+    def __init__(self, fileobj, level, threads, block_size):
+        self.fileobj = fileobj
+        self.level = level
+        self.block_size = block_size
+        self._max_pending = threads * 2
+        self._executor = ThreadPoolExecutor(
+            threads, thread_name_prefix='docker-gzip'
+        )
+        self._pending = collections.deque()
+        self._buffer = bytearray()
+        self._dictionary = b''
+        self._crc = 0
+        self._size = 0
+        self.closed = False
+
+        if level == 9:
+            flags = b'\x02'
+        elif level == 1:
+            flags = b'\x04'
+        else:
+            flags = b'\x00'
+        fileobj.write(_GZIP_HEADER + flags + _GZIP_OS_UNKNOWN)
+
+    def write(self, data):
+        if self.closed:
+            raise ValueError('write() on closed ParallelGzipWriter')
+        self._buffer += data
+        while len(self._buffer) >= self.block_size:
+            block = bytes(self._buffer[:self.block_size])
+            del self._buffer[:self.block_size]
+            self._submit(block, last=False)
+        return len(data)
+
+    def _submit(self, block, last):
+        self._crc = zlib.crc32(block, self._crc)
+        self._size += len(block)
+        self._pending.append(self._executor.submit(
+            _deflate, block, self.level, self._dictionary, last
+        ))
+        self._dictionary = block[-_WINDOW_SIZE:]
+        while len(self._pending) > self._max_pending:
+            self.fileobj.write(self._pending.popleft().result())
+
+    def tell(self):
+        return self._size + len(self._buffer)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        try:
+            self._submit(bytes(self._buffer), last=True)
+            self._buffer.clear()
+            while self._pending:
+                self.fileobj.write(self._pending.popleft().result())
+            self.fileobj.write(struct.pack(
+                '<LL', self._crc & 0xffffffff, self._size & 0xffffffff
+            ))
+        finally:
+            self._shutdown()
+
+    def _shutdown(self):
+        for future in self._pending:
+            future.cancel()
+        self._executor.shutdown(wait=False)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            # Don't write out a stream which won't be complete anyway
+            self.closed = True
+            self._shutdown()
+
+
+def _deflate(block, level, dictionary, last):
+    if dictionary:
+        compressor = zlib.compressobj(
+            level, zlib.DEFLATED, -zlib.MAX_WBITS, zlib.DEF_MEM_LEVEL,
+            zlib.Z_DEFAULT_STRATEGY, dictionary
+        )
+    else:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+    # A sync flush ends the block on a byte boundary without ending the
+    # deflate stream, so that the next block can be appended to it
+    return compressor.compress(block) + compressor.flush(
+        zlib.Z_FINISH if last else zlib.Z_SYNC_FLUSH
+    )
+
+
+class _ChunkList:
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(data)
+
+    def drain(self):
+        chunks, self._chunks = self._chunks, []
+        return chunks
+
+
+def _iter_chunks(data, size):
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        yield data
+    elif hasattr(data, 'read'):
+        while True:
+            chunk = data.read(size)
+            if not chunk:
+                return
+            yield chunk
+    else:
+        yield from data
@@ -0,0 +1,71 @@
+import collections
+import concurrent.futures
+
+from ..constants import DEFAULT_MAX_WORKERS
+from ..errors import InvalidArgument
+
+
+def check_max_workers(max_workers):
+    """
+    Check that ``max_workers`` asks for no more threads than the pool shared
+    by the methods of :py:class:`~docker.client.DockerClient` has, so that
+    the concurrency a caller asks for is the concurrency it gets. ``None``
+    means one call at a time.
+    """
+    if max_workers is not None and \
+            not 1 <= max_workers <= DEFAULT_MAX_WORKERS:
+        raise InvalidArgument(
+            f'max_workers must be between 1 and {DEFAULT_MAX_WORKERS}'
+        )
+
+
+def bounded_map(executor, fn, iterable, max_workers):
+    """
+    Like :py:meth:`concurrent.futures.Executor.map`, but with at most
+    ``max_workers`` calls in flight at once, so that a shared executor can
+    serve several callers with different concurrency limits. Results are
+    yielded in the order of ``iterable``. If a call raises, the calls which
+    have not started yet are cancelled and the exception is propagated.
+    """
+    if max_workers < 1:
+        raise ValueError('max_workers must be greater than 0')
+    pending = collections.deque()
+    try:
+        for item in iterable:
+            if len(pending) >= max_workers:
+                yield pending.popleft().result()
+            pending.append(executor.submit(fn, item))
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+def bounded_as_completed(executor, fn, iterable, max_workers):
+    """
+    Like :py:func:`bounded_map`, but results are yielded as the calls
+    complete rather than in the order of ``iterable``, and a new call is
+    submitted as soon as one completes.
+    """
+    if max_workers < 1:
+        raise ValueError('max_workers must be greater than 0')
+    items = iter(iterable)
+    pending = set()
+    try:
+        for item in items:
+            pending.add(executor.submit(fn, item))
+            if len(pending) >= max_workers:
+                break
+        while pending:
+            done, pending = concurrent.futures.wait(
+                pending, return_when=concurrent.futures.FIRST_COMPLETED
+            )
+            for future in done:
+                for item in items:
+                    pending.add(executor.submit(fn, item))
+                    break
+                yield future.result()
+    finally:
+        for future in pending:
+            future.cancel()
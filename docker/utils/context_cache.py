@@ -0,0 +1,234 @@
+import contextlib
+import hashlib
+import json
+import os
+import tarfile
+import tempfile
+import threading
+import time
+
+from ..constants import IS_WINDOWS_PLATFORM
+
+if IS_WINDOWS_PLATFORM:
+    import msvcrt
+else:
+    import fcntl
+
+INDEX_VERSION = 2
+
+# Members no file uses are kept this many seconds, unless this cache object
+# used them: another process may have stored them without saving its index
+# yet
+UNUSED_GRACE_PERIOD = 3600
+
+
+class ContextCache:
+    """
+    A persistent cache of the tar members of build context files.
+
+    The member of a regular file (its tar header, contents and padding) is
+    stored once, named after the SHA-256 digest of its bytes, and recorded in
+    an index under the file's absolute path along with its size, modification
+    and change times, inode, mode and owner. When a context is archived
+    again, a file whose ``lstat()`` still matches its record is copied from
+    the cache without being opened; only new or changed files are read.
+
+    The same cache can be shared by several build contexts and clients,
+    and by several processes: the index is saved under a file lock, merged
+    with what other processes saved meanwhile.
+
+    Args:
+        directory (str): Where to keep the cache. Created if it doesn't
+            exist.
+
+    Example:
+
+        >>> cache = ContextCache(os.path.expanduser('~/.cache/docker-ctx'))
+        >>> client.api.build(path='.', context_cache=cache)
+    """
+
+    def __init__(self, directory):
+        self.directory = os.path.abspath(directory)
+        self._blobs = os.path.join(self.directory, 'blobs')
+        self._index_path = os.path.join(self.directory, 'index.json')
+        self._lock_path = os.path.join(self.directory, 'index.lock')
+        self._entries = None
+        # Entries added since the index was read, and the members this
+        # object has seen used
+        self._added = {}
+        self._known = set()
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self._entries is not None:
+            return self._entries
+        os.makedirs(self._blobs, exist_ok=True)
+        self._entries = self._read_index()
+        self._known.update(entry[-1][1] for entry in self._entries.values())
+        return self._entries
+
+    def _read_index(self):
+        try:
+            with open(self._index_path, 'rb') as f:
+                index = json.load(f)
+        except (FileNotFoundError, ValueError):
+            # A missing or corrupt index only means starting afresh
+            index = {}
+        if not isinstance(index, dict) or \
+                index.get('version') != INDEX_VERSION:
+            index = {}
+        return index.get('entries', {})
+
+    @contextlib.contextmanager
+    def _index_lock(self):
+        # Held while the index is read, merged and written, so that
+        # processes sharing the cache don't overwrite each other's entries
+        with open(self._lock_path, 'a+b') as f:
+            if IS_WINDOWS_PLATFORM:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            else:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if IS_WINDOWS_PLATFORM:
+                    f.seek(0)
+                    msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+                else:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+    @staticmethod
+    def _key(st):
+        # The owner is part of the tar header, and a change of owner or mode
+        # changes st_ctime
+        return [
+            st.st_size, st.st_mtime_ns, st.st_ctime_ns, st.st_ino,
+            st.st_mode, st.st_uid, st.st_gid,
+        ]
+
+    def _blob(self, digest):
+        return os.path.join(self._blobs, digest)
+
+    def add_cached(self, t, full_path, arcname, reproducible=False):
+        """
+        Write the cached member of ``full_path`` to the tar file ``t`` if the
+        file is unchanged. Returns ``False``, without writing anything, if it
+        must be read instead.
+        """
+        try:
+            st = os.lstat(full_path)
+        except OSError:
+            return False
+        with self._lock:
+            entry = self._load().get(full_path)
+        if entry is None or entry[:-1] != self._key(st):
+            return False
+        inode = (st.st_ino, st.st_dev)
+        if st.st_nlink > 1 and inode in t.inodes:
+            # A hard link to a file already in the archive
+            return False
+        # The name and the normalization are part of the tar header
+        if entry[-1][0] != arcname or entry[-1][2] != reproducible:
+            return False
+        try:
+            with open(self._blob(entry[-1][1]), 'rb') as blob:
+                _copy_raw(t, blob)
+        except FileNotFoundError:
+            return False
+        if st.st_nlink > 1:
+            t.inodes[inode] = arcname
+        return True
+
+    def add_new(self, t, tarinfo, fileobj, full_path, reproducible=False):
+        """
+        Write the member of a regular file to the tar file ``t``, reading the
+        file from ``fileobj``, and store it in the cache.
+        """
+        # Taken before reading: if the file changes meanwhile, its record
+        # won't match next time
+        st = os.fstat(fileobj.fileno())
+        with self._lock:
+            self._load()
+        fd, tmp = tempfile.mkstemp(dir=self._blobs, prefix='.tmp-')
+        try:
+            with os.fdopen(fd, 'wb') as blob:
+                tee = _Tee(t.fileobj, blob)
+                tee.write(tarinfo.tobuf(t.format, t.encoding, t.errors))
+                tarfile.copyfileobj(
+                    fileobj, tee, tarinfo.size, exception=OSError
+                )
+                _, remainder = divmod(tarinfo.size, tarfile.BLOCKSIZE)
+                if remainder > 0:
+                    tee.write(tarfile.NUL * (tarfile.BLOCKSIZE - remainder))
+            t.offset += tee.written
+            t.members.append(tarinfo)
+            digest = tee.hash.hexdigest()
+            os.replace(tmp, self._blob(digest))
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        with self._lock:
+            entry = self._key(st) + [[tarinfo.name, digest, reproducible]]
+            self._entries[full_path] = self._added[full_path] = entry
+            self._known.add(digest)
+
+    def save(self, root, paths):
+        """
+        Forget the files under ``root`` other than ``paths``, the absolute
+        paths of the files in the last archive of ``root``, delete the
+        members no file uses anymore, and write the index, merged with the
+        entries other processes saved since it was read.
+        """
+        prefix = os.path.join(os.path.abspath(root), '')
+        paths = set(paths)
+        with self._lock, self._index_lock():
+            self._load()
+            entries = self._read_index()
+            entries.update(self._added)
+            for path in list(entries):
+                if path.startswith(prefix) and path not in paths:
+                    del entries[path]
+            used = {entry[-1][1] for entry in entries.values()}
+            expired = time.time() - UNUSED_GRACE_PERIOD
+            for name in os.listdir(self._blobs):
+                if name in used or name.startswith('.tmp-'):
+                    continue
+                try:
+                    if name in self._known or \
+                            os.stat(self._blob(name)).st_mtime < expired:
+                        os.unlink(self._blob(name))
+                except FileNotFoundError:
+                    # Deleted by another process
+                    pass
+            fd, tmp = tempfile.mkstemp(dir=self.directory, prefix='.tmp-')
+            with os.fdopen(fd, 'w') as f:
+                json.dump({'version': INDEX_VERSION, 'entries': entries}, f)
+            os.replace(tmp, self._index_path)
+            self._entries = entries
+            self._added = {}
+            self._known = used
+
+
+class _Tee:
+    def __init__(self, fileobj, blob):
+        self.fileobj = fileobj
+        self.blob = blob
+        self.hash = hashlib.sha256()
+        self.written = 0
+
+    def write(self, data):
+        self.fileobj.write(data)
+        self.blob.write(data)
+        self.hash.update(data)
+        self.written += len(data)
+
+
+def _copy_raw(t, fileobj):
+    # Members are written the same way TarFile.addfile() does
+    while True:
+        data = fileobj.read(tarfile.RECORDSIZE * 16)
+        if not data:
+            break
+        t.fileobj.write(data)
+        t.offset += len(data)
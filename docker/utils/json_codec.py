@@ -0,0 +1,124 @@
+import json
+
+from ..errors import DockerException, InvalidArgument
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+
+class JSONCodec:
+    """
+    Encodes the JSON bodies of requests and decodes the JSON bodies of
+    responses, with the standard library's :py:mod:`json` module.
+
+    Subclass it, or pass any object with the same two methods, to use
+    another JSON library.
+    """
+
+    name = 'json'
+
+    def loads(self, data):
+        """
+        Decode a JSON document from :py:class:`bytes` or :py:class:`str`.
+        Raises :py:class:`ValueError` if the document is invalid.
+        """
+        return json.loads(data)
+
+    def dumps(self, obj):
+        """
+        Encode an object to a JSON document, as :py:class:`bytes` or
+        :py:class:`str`.
+        """
+        return json.dumps(obj)
+
+
+class OrjsonCodec(JSONCodec):
+    """A :py:class:`JSONCodec` using `orjson`_.
+
+    .. _orjson: https://github.com/ijl/orjson
+    """
+
+    name = 'orjson'
+
+    def __init__(self):
+        if orjson is None:
+            raise DockerException(
+                'Install orjson package to use the orjson codec'
+            )
+
+    def loads(self, data):
+        return orjson.loads(data)
+
+    def dumps(self, obj):
+        return orjson.dumps(obj)
+
+
+class UjsonCodec(JSONCodec):
+    """A :py:class:`JSONCodec` using `ujson`_.
+
+    .. _ujson: https://github.com/ultrajson/ultrajson
+    """
+
+    name = 'ujson'
+
+    def __init__(self):
+        if ujson is None:
+            raise DockerException(
+                'Install ujson package to use the ujson codec'
+            )
+
+    def loads(self, data):
+        return ujson.loads(data)
+
+    def dumps(self, obj):
+        return ujson.dumps(
+            obj, ensure_ascii=False, escape_forward_slashes=False
+        )
+
+
+JSON_CODECS = {
+    codec.name: codec for codec in (JSONCodec, OrjsonCodec, UjsonCodec)
+}
+
+
+def get_json_codec(codec=None):
+    """
+    Resolve the ``json_codec`` argument of the clients to a codec object.
+
+    Args:
+        codec (str or :py:class:`JSONCodec`): The name of a codec (``json``,
+            ``orjson`` or ``ujson``), ``auto`` for the fastest one installed,
+            or a codec object, which is returned as is. Default: ``json``
+
+    Returns:
+        A codec object.
+
+    Raises:
+        :py:class:`docker.errors.InvalidArgument`
+            If the name is unknown.
+        :py:class:`docker.errors.DockerException`
+            If the library of the codec is not installed.
+    """
+    if codec is None:
+        codec = 'json'
+    if not isinstance(codec, str):
+        return codec
+    if codec == 'auto':
+        if orjson is not None:
+            return OrjsonCodec()
+        if ujson is not None:
+            return UjsonCodec()
+        return JSONCodec()
+    if codec not in JSON_CODECS:
+        raise InvalidArgument(
+            f'Unknown JSON codec {codec!r}, expected one of '
+            f'{", ".join(["auto", *JSON_CODECS])}'
+        )
+    return JSON_CODECS[codec]()
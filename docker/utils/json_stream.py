@@ -2,6 +2,9 @@ import json
 import json.decoder
 
 from ..errors import StreamParseError
+from .json_codec import get_json_codec
+
+fast_loads = get_json_codec('auto').loads
 
 json_decoder = json.JSONDecoder()
 
@@ -32,12 +35,109 @@ def json_splitter(buffer):
         return None
 
 
-def json_stream(stream):
-    """Given a stream of text, return a stream of json objects.
+class JSONStreamDecoder:
+    """Incrementally decode a stream of newline-delimited JSON objects.
+
+    Data is buffered as bytes and only the newly received part is searched
+    for newlines, so each complete line is parsed exactly once, with
+    ``loads``. Lines which aren't a single JSON document (several objects
+    on one line, or one object spread over several lines) are split with
+    :py:func:`json_splitter` instead.
+
+    Args:
+        loads (callable): Parses one JSON document from :py:class:`bytes`.
+            Default: ``orjson.loads`` or ``ujson.loads`` if either is
+            installed, otherwise :py:func:`json.loads`.
+    """
+
+    def __init__(self, loads=None):
+        self.loads = loads or fast_loads
+        self._buffer = bytearray()
+        # How much of the buffer is known not to contain a newline
+        self._scanned = 0
+
+    def decode(self, data):
+        """Add data (bytes or text) to the stream and return the list of
+        objects it completes."""
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        buffer = self._buffer
+        buffer += data
+        objects = []
+        start = 0
+        index = buffer.find(b'\n', self._scanned)
+        while index != -1:
+            with memoryview(buffer) as view:
+                line = view[start:index].tobytes()
+            rest = self._decode_line(line, objects)
+            if rest:
+                # Part of a document spread over several lines: keep it and
+                # retry once the next line is there
+                buffer[start:index] = rest
+                index = start + len(rest)
+            else:
+                start = index + 1
+            index = buffer.find(b'\n', index + 1)
+        del buffer[:start]
+        self._scanned = len(buffer)
+        if buffer.rstrip()[-1:] in (b'}', b']'):
+            # Don't wait for a newline which may never come after what
+            # looks like the end of a document
+            try:
+                objects.append(self.loads(bytes(buffer)))
+            except ValueError:
+                pass
+            else:
+                del buffer[:]
+                self._scanned = 0
+        return objects
+
+    def flush(self):
+        """Return the objects left in the buffer at the end of the stream.
+
+        Raises:
+            :py:class:`docker.errors.StreamParseError`
+                If the stream ends with an incomplete document.
+        """
+        objects = []
+        line, self._buffer, self._scanned = bytes(self._buffer), bytearray(), 0
+        rest = self._decode_line(line, objects)
+        if rest:
+            try:
+                json_decoder.decode(rest.decode('utf-8'))
+            except Exception as e:
+                raise StreamParseError(e) from e
+        return objects
+
+    def _decode_line(self, line, objects):
+        """Append the objects in a line to ``objects``, and return what's
+        left of the line if it ends with an incomplete document."""
+        if not line.strip():
+            return b''
+        try:
+            objects.append(self.loads(line))
+            return b''
+        except ValueError:
+            pass
+        buffered = line.decode('utf-8', 'replace')
+        while True:
+            buffer_split = json_splitter(buffered)
+            if buffer_split is None:
+                break
+            obj, buffered = buffer_split
+            objects.append(obj)
+        return buffered.strip().encode('utf-8')
+
+
+def json_stream(stream, loads=None):
+    """Given a stream of bytes or text, return a stream of json objects.
     This handles streams which are inconsistently buffered (some entries may
     be newline delimited, and others are not).
     """
-    return split_buffer(stream, json_splitter, json_decoder.decode)
+    decoder = JSONStreamDecoder(loads)
+    for data in stream:
+        yield from decoder.decode(data)
+    yield from decoder.flush()
 
 
 def line_splitter(buffer, separator='\n'):
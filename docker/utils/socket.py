@@ -3,6 +3,9 @@ import os
 import select
 import socket as pysocket
 import struct
+import time
+
+from ..constants import DEFAULT_FRAME_BUFFER_SIZE, STREAM_HEADER_SIZE_BYTES
 
 try:
     from ..transport import NpipeSocket
@@ -22,14 +25,16 @@ class SocketError(Exception):
 # pywintypes.error: (109, 'ReadFile', 'The pipe has been ended.')
 NPIPE_ENDED = 109
 
+RECOVERABLE_ERRORS = (errno.EINTR, errno.EDEADLK, errno.EWOULDBLOCK)
+
+_FRAME_HEADER = struct.Struct('>BxxxL')
+
 
 def read(socket, n=4096):
     """
     Reads at most n bytes from socket
     """
 
-    recoverable_errors = (errno.EINTR, errno.EDEADLK, errno.EWOULDBLOCK)
-
     if not isinstance(socket, NpipeSocket):
         if not hasattr(select, "poll"):
             # Limited to 1024
@@ -46,31 +51,34 @@ def read(socket, n=4096):
             return socket.read(n)
         return os.read(socket.fileno(), n)
     except OSError as e:
-        if e.errno not in recoverable_errors:
+        if e.errno not in RECOVERABLE_ERRORS:
             raise
     except Exception as e:
-        is_pipe_ended = (isinstance(socket, NpipeSocket) and
-                         len(e.args) > 0 and
-                         e.args[0] == NPIPE_ENDED)
-        if is_pipe_ended:
+        if _is_pipe_ended(socket, e):
             # npipes don't support duplex sockets, so we interpret
             # a PIPE_ENDED error as a close operation (0-length read).
             return ''
         raise
 
 
+def _is_pipe_ended(socket, e):
+    return (isinstance(socket, NpipeSocket) and
+            len(e.args) > 0 and
+            e.args[0] == NPIPE_ENDED)
+
+
 def read_exactly(socket, n):
     """
     Reads exactly n bytes from socket
     Raises SocketError if there isn't enough data
     """
-    data = b""
+    data = bytearray()
     while len(data) < n:
         next_data = read(socket, n - len(data))
         if not next_data:
             raise SocketError("Unexpected EOF")
         data += next_data
-    return data
+    return bytes(data)
 
 
 def next_frame_header(socket):
@@ -85,10 +93,218 @@ def next_frame_header(socket):
     except SocketError:
         return (-1, -1)
 
-    stream, actual = struct.unpack('>BxxxL', data)
+    stream, actual = _FRAME_HEADER.unpack(data)
     return (stream, actual)
 
 
+class FrameReader:
+    """
+    Reads the frames of an attach, exec or log stream from a socket.
+
+    Data is received into one reusable buffer, as much as is available at
+    once, and frame headers are parsed out of it in place, so that a burst of
+    small frames costs a single read. Payloads are handed out as
+    :py:class:`memoryview` objects over that buffer.
+
+    Args:
+        socket: The socket to read from, as returned by
+            ``APIClient._get_raw_response_socket``, or a file object to read
+            from with ``readinto()``, such as the ``raw`` body of a streamed
+            response.
+        tty (bool): Whether the stream is a raw TTY stream rather than a
+            multiplexed one. Everything read from a TTY stream is treated as
+            stdout.
+        bufsize (int): The size of the buffer, which is also the largest
+            chunk a payload is handed out in.
+        timeout (float): Give up reading the stream this many seconds from
+            now, raising :py:class:`socket.timeout`. Default: no timeout.
+            Not supported with file objects.
+    """
+
+    def __init__(self, socket, tty=False, bufsize=DEFAULT_FRAME_BUFFER_SIZE,
+                 timeout=None):
+        self.socket = socket
+        self.tty = tty
+        self._deadline = None
+        if timeout is not None:
+            self._deadline = time.monotonic() + timeout
+        self._buffer = bytearray(max(bufsize, STREAM_HEADER_SIZE_BYTES))
+        self._view = memoryview(self._buffer)
+        self._start = 0
+        self._end = 0
+
+        # File objects may hold data already read from their socket: don't
+        # wait for the socket, just read
+        self._file = not hasattr(socket, 'recv') and \
+            not isinstance(socket, pysocket.SocketIO) and \
+            hasattr(socket, 'readinto')
+
+        self._poll = None
+        if self._file:
+            pass
+        elif not isinstance(socket, NpipeSocket) and hasattr(select, 'poll'):
+            self._poll = select.poll()
+            self._poll.register(socket, select.POLLIN | select.POLLPRI)
+
+        if hasattr(socket, 'recv_into'):
+            self._recv_into = socket.recv_into
+        elif hasattr(socket, 'recv'):
+            self._recv_into = self._copy_into(socket.recv)
+        elif self._file or isinstance(socket, pysocket.SocketIO):
+            self._recv_into = socket.readinto
+        elif hasattr(os, 'readv'):
+            fd = socket.fileno()
+            self._recv_into = lambda buf: os.readv(fd, [buf])
+        else:
+            fd = socket.fileno()
+            self._recv_into = self._copy_into(lambda n: os.read(fd, n))
+
+    @staticmethod
+    def _copy_into(recv):
+        def recv_into(buf):
+            data = recv(len(buf))
+            if data is None:
+                return None
+            buf[:len(data)] = data
+            return len(data)
+        return recv_into
+
+    def _wait(self):
+        if self._file:
+            return
+        remaining = None
+        if self._deadline is not None:
+            remaining = self._deadline - time.monotonic()
+            if remaining <= 0:
+                raise pysocket.timeout('Timed out reading the stream')
+        pending = getattr(self.socket, 'pending', None)
+        if pending is not None and pending():
+            # Data already decrypted by an SSL socket doesn't make it readable
+            return
+        if self._poll is not None:
+            ready = self._poll.poll(
+                None if remaining is None else remaining * 1000
+            )
+        elif not isinstance(self.socket, NpipeSocket):
+            # Limited to 1024
+            ready = select.select([self.socket], [], [], remaining)[0]
+        else:
+            if remaining is not None:
+                self.socket.settimeout(remaining)
+            return
+        if not ready:
+            raise pysocket.timeout('Timed out reading the stream')
+
+    def _fill(self):
+        """
+        Receive more data after what is buffered. Returns ``False`` at EOF.
+        """
+        if self._start == self._end:
+            self._start = self._end = 0
+        elif self._end == len(self._buffer):
+            # Only ever the beginning of a frame header is left over
+            pending = self._end - self._start
+            self._view[:pending] = self._view[self._start:self._end]
+            self._start, self._end = 0, pending
+
+        while True:
+            self._wait()
+            try:
+                n = self._recv_into(self._view[self._end:])
+            except OSError as e:
+                if e.errno not in RECOVERABLE_ERRORS:
+                    raise
+                continue
+            except Exception as e:
+                if _is_pipe_ended(self.socket, e):
+                    return False
+                raise
+            if n is None:
+                continue
+            if not n:
+                return False
+            self._end += n
+            return True
+
+    def frames(self):
+        """
+        A generator of ``(stream, payload)`` tuples, where ``stream`` is
+        :py:data:`STDOUT` or :py:data:`STDERR` and ``payload`` is a
+        :py:class:`memoryview` holding all or part of a frame.
+
+        A payload is only valid until the next tuple is requested: copy it
+        with ``bytes()`` to keep it.
+        """
+        stream, remaining = STDOUT, 0
+        while True:
+            if self.tty or remaining:
+                if self._start == self._end and not self._fill():
+                    return
+                n = self._end - self._start
+                if not self.tty:
+                    n = min(n, remaining)
+                    remaining -= n
+                start = self._start
+                self._start += n
+                yield stream, self._view[start:start + n]
+                continue
+
+            while self._end - self._start < STREAM_HEADER_SIZE_BYTES:
+                if not self._fill():
+                    return
+            stream, remaining = _FRAME_HEADER.unpack_from(
+                self._buffer, self._start
+            )
+            self._start += STREAM_HEADER_SIZE_BYTES
+
+    def write_to(self, stdout=None, stderr=None):
+        """
+        Read the stream to the end, writing payloads straight from the
+        buffer to file-like objects, such as files opened in binary mode or
+        :py:class:`io.BytesIO` objects, or to file descriptors.
+
+        Args:
+            stdout: Where to write stdout. Discarded if ``None``.
+            stderr: Where to write stderr. Discarded if ``None``.
+
+        Returns:
+            (tuple): The number of bytes of stdout and of stderr read.
+        """
+        sinks = {STDOUT: _writable(stdout), STDERR: _writable(stderr)}
+        counts = {STDOUT: 0, STDERR: 0}
+        for stream, payload in self.frames():
+            sink = sinks.get(stream)
+            if sink is not None:
+                sink.write(payload)
+            if stream in counts:
+                counts[stream] += len(payload)
+        return counts[STDOUT], counts[STDERR]
+
+
+def _writable(sink):
+    if isinstance(sink, int):
+        # Unbuffered, so there is nothing left to flush when done
+        return open(sink, 'wb', buffering=0, closefd=False)
+    return sink
+
+
+def output_sinks(output):
+    """
+    Where to write stdout and stderr to, given the ``output`` argument of
+    :py:meth:`~docker.api.container.ContainerApiMixin.logs` or
+    :py:meth:`~docker.api.exec_api.ExecApiMixin.exec_start`: a
+    ``(stdout, stderr)`` tuple, or a single sink for both. Sinks are file
+    objects, file descriptors, which are returned as file objects, or
+    ``None``.
+    """
+    if not isinstance(output, tuple):
+        output = _writable(output)
+        return output, output
+    if len(output) != 2:
+        raise ValueError('output should be a (stdout, stderr) tuple')
+    return tuple(_writable(sink) for sink in output)
+
+
 def frames_iter(socket, tty):
     """
     Return a generator of frames read from socket. A frame is a tuple where
@@ -97,10 +313,10 @@ def frames_iter(socket, tty):
     If the tty setting is enabled, the streams are multiplexed into the stdout
     stream.
     """
-    if tty:
-        return ((STDOUT, frame) for frame in frames_iter_tty(socket))
-    else:
-        return frames_iter_no_tty(socket)
+    return (
+        (stream, bytes(payload))
+        for stream, payload in FrameReader(socket, tty).frames()
+    )
 
 
 def frames_iter_no_tty(socket):
@@ -108,20 +324,8 @@ def frames_iter_no_tty(socket):
     Returns a generator of data read from the socket when the tty setting is
     not enabled.
     """
-    while True:
-        (stream, n) = next_frame_header(socket)
-        if n < 0:
-            break
-        while n > 0:
-            result = read(socket, n)
-            if result is None:
-                continue
-            data_length = len(result)
-            if data_length == 0:
-                # We have reached EOF
-                return
-            n -= data_length
-            yield (stream, result)
+    for stream, payload in FrameReader(socket).frames():
+        yield (stream, bytes(payload))
 
 
 def frames_iter_tty(socket):
@@ -129,12 +333,8 @@ def frames_iter_tty(socket):
     Return a generator of data read from the socket when the tty setting is
     enabled.
     """
-    while True:
-        result = read(socket)
-        if len(result) == 0:
-            # We have reached EOF
-            return
-        yield result
+    for _, payload in FrameReader(socket, tty=True).frames():
+        yield bytes(payload)
 
 
 def consume_socket_output(frames, demux=False):
@@ -155,23 +355,18 @@ def consume_socket_output(frames, demux=False):
         return b"".join(frames)
 
     # If the streams are demultiplexed, the generator yields tuples
-    # (stdout, stderr)
-    out = [None, None]
+    # (stdout, stderr). Collect the chunks of each and join them once, as
+    # growing bytes one chunk at a time would be quadratic.
+    out = ([], [])
     for frame in frames:
         # It is guaranteed that for each frame, one and only one stream
         # is not None.
         assert frame != (None, None)
         if frame[0] is not None:
-            if out[0] is None:
-                out[0] = frame[0]
-            else:
-                out[0] += frame[0]
+            out[0].append(frame[0])
         else:
-            if out[1] is None:
-                out[1] = frame[1]
-            else:
-                out[1] += frame[1]
-    return tuple(out)
+            out[1].append(frame[1])
+    return tuple(b''.join(chunks) if chunks else None for chunks in out)
 
 
 def demux_adaptor(stream_id, data):
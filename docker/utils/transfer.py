@@ -0,0 +1,466 @@
+import collections
+import concurrent.futures
+import contextlib
+import io
+import mmap
+import os
+import shutil
+import tarfile
+import tempfile
+import threading
+
+import requests.exceptions
+
+from ..constants import (
+    DEFAULT_DATA_CHUNK_SIZE,
+    STREAM_ARCHIVE_CHUNK_SIZE,
+    STREAM_ARCHIVE_MAX_CHUNKS,
+)
+from ..errors import DockerException
+from .build import _ChunkPipe
+from .compression import ParallelGzip
+
+
+@contextlib.contextmanager
+def open_destination(dest):
+    """
+    Open where to write data to, given as a path, which is created or
+    truncated, a file descriptor or a file object opened in binary mode.
+    Yields a file object, which is only closed if it was opened from a path.
+    """
+    if isinstance(dest, (str, os.PathLike)):
+        with open(dest, 'wb') as f:
+            yield f
+    elif isinstance(dest, int):
+        with open(dest, 'wb', closefd=False) as f:
+            yield f
+    else:
+        yield dest
+
+
+def iter_body(response, bufsize=DEFAULT_DATA_CHUNK_SIZE):
+    """
+    Iterate over the body of a streamed :py:class:`requests.Response`.
+
+    Unless the body is compressed, it is received from the socket straight
+    into one reused buffer, as much as is available at once, and chunked
+    transfer encoding is decoded in place: the data is yielded as
+    :py:class:`memoryview` objects over that buffer, which are only valid
+    until the next one is requested. Once the body is read to the end, the
+    connection goes back to the pool.
+
+    Compressed bodies are decompressed and yielded in chunks of up to
+    ``bufsize`` bytes.
+    """
+    httpresp = getattr(response.raw, '_fp', None)
+    fp = getattr(httpresp, 'fp', None)
+    encoding = response.headers.get('Content-Encoding', 'identity')
+    if encoding != 'identity' or not isinstance(fp, io.BufferedReader):
+        yield from response.raw.stream(bufsize, decode_content=True)
+        return
+
+    if httpresp.chunked:
+        yield from _iter_chunked(fp, bufsize)
+    else:
+        yield from _iter_length(fp, httpresp.length, bufsize)
+    # Read to the end: let the connection be reused
+    httpresp._close_conn()
+    response.raw.release_conn()
+
+
+def _reader(fp, bufsize):
+    """
+    Returns a function receiving data into a reused buffer, which returns
+    the buffer and how much data is in it. The data buffered by ``fp`` along
+    with the headers comes first, after which ``fp`` is empty and the socket
+    can be read from directly.
+    """
+    buf = bytearray(bufsize)
+    view = memoryview(buf)
+    # All that is buffered, or what a single read returns if nothing is
+    buffered = [fp.read(len(fp.peek()))]
+
+    def read(limit=bufsize):
+        if buffered:
+            data = buffered.pop()
+            return data, len(data)
+        return buf, fp.raw.readinto(view[:limit]) or 0
+    return read
+
+
+def _iter_length(fp, length, bufsize):
+    # length is None for a body which ends with the connection
+    if length == 0:
+        return
+    read = _reader(fp, bufsize)
+    while True:
+        limit = bufsize if length is None else min(length, bufsize)
+        buf, n = read(limit)
+        if not n:
+            if length is None:
+                return
+            raise requests.exceptions.ChunkedEncodingError(
+                'Connection closed before the end of the response'
+            )
+        if length is not None:
+            n = min(n, length)
+            length -= n
+        yield memoryview(buf)[:n]
+        if length == 0:
+            return
+
+
+def _iter_chunked(fp, bufsize):
+    read = _reader(fp, bufsize)
+    # Data left in the current chunk, the CRLF after it left, and a chunk
+    # size or trailer line not received in full yet
+    remaining = 0
+    crlf = 0
+    line = bytearray()
+    trailers = False
+    while True:
+        buf, end = read()
+        if not end:
+            raise requests.exceptions.ChunkedEncodingError(
+                'Connection closed before the end of the response'
+            )
+        view = memoryview(buf)
+        pos = 0
+        while pos < end:
+            if remaining:
+                n = min(remaining, end - pos)
+                yield view[pos:pos + n]
+                pos += n
+                remaining -= n
+                if not remaining:
+                    crlf = 2
+                continue
+            if crlf:
+                n = min(crlf, end - pos)
+                pos += n
+                crlf -= n
+                continue
+
+            newline = buf.find(b'\n', pos, end)
+            if newline < 0:
+                line += view[pos:end]
+                break
+            line += view[pos:newline + 1]
+            pos = newline + 1
+            if trailers:
+                if not line.strip():
+                    return
+            else:
+                try:
+                    remaining = int(bytes(line).split(b';')[0], 16)
+                except ValueError:
+                    raise requests.exceptions.ChunkedEncodingError(
+                        f'Invalid chunk size: {bytes(line)!r}'
+                    ) from None
+                # The last chunk is followed by trailers, if any, up to an
+                # empty line
+                trailers = remaining == 0
+            line.clear()
+
+
+def write_body(response, dest, bufsize=DEFAULT_DATA_CHUNK_SIZE):
+    """
+    Write the body of a streamed :py:class:`requests.Response` to ``dest``,
+    as taken by :py:func:`open_destination`, straight out of the buffer
+    :py:func:`iter_body` receives it into, and close the response.
+
+    Returns:
+        (int): The number of bytes written.
+    """
+    written = 0
+    try:
+        with open_destination(dest) as f:
+            for data in iter_body(response, bufsize):
+                f.write(data)
+                written += len(data)
+    finally:
+        response.close()
+    return written
+
+
+def stream_body(response, chunk_size=STREAM_ARCHIVE_CHUNK_SIZE,
+                max_chunks=STREAM_ARCHIVE_MAX_CHUNKS):
+    """
+    Return a generator of chunks of the body of a streamed
+    :py:class:`requests.Response`, received by a background thread while the
+    previous chunks are consumed (for instance, sent as the body of another
+    request).
+
+    At most ``max_chunks`` chunks of ``chunk_size`` bytes are buffered: the
+    thread stops receiving until the consumer catches up, which in turn
+    slows the sender down. Closing the generator closes the response.
+    """
+    pipe = _ChunkPipe(chunk_size, max_chunks)
+
+    def produce():
+        try:
+            for data in iter_body(response):
+                pipe.write(data)
+            pipe.finish()
+        except BaseException as e:
+            pipe.finish(e)
+
+    def consume():
+        thread = threading.Thread(
+            target=produce, name='docker-stream-body', daemon=True
+        )
+        thread.start()
+        try:
+            yield from pipe
+        finally:
+            pipe.abandon()
+            response.close()
+            thread.join()
+
+    return consume()
+
+
+def shared_buffer(data, gzip=False):
+    """
+    Store ``data``, which can be :py:class:`bytes`, a file-like object or
+    an iterable of :py:class:`bytes`, once, in a buffer which can be sent by
+    any number of threads at the same time.
+
+    The data is written to a temporary file, compressed on the way if
+    ``gzip`` is set (``True`` or a :py:class:`~docker.utils.ParallelGzip`),
+    and mapped into memory read-only, so it is left to the page cache
+    rather than copied for each reader. Bytes-like data which is not to be
+    compressed is used as it is.
+
+    Returns:
+        (memoryview): The data.
+    """
+    if gzip:
+        if not isinstance(gzip, ParallelGzip):
+            gzip = ParallelGzip()
+        data = gzip.compress(data)
+    elif isinstance(data, (bytes, bytearray, memoryview)):
+        return memoryview(data)
+
+    with tempfile.TemporaryFile() as f:
+        if isinstance(data, (bytes, bytearray, memoryview)):
+            f.write(data)
+        elif hasattr(data, 'read'):
+            shutil.copyfileobj(data, f)
+        else:
+            for chunk in data:
+                f.write(chunk)
+        f.flush()
+        if not f.tell():
+            return memoryview(b'')
+        # The map stays valid once the file is closed, until the last view
+        # of it is released
+        return memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+
+# Regular files up to this size are read whole and written on a worker
+# thread; larger ones are written piecewise as they are received
+EXTRACT_INLINE_SIZE = 1024 * 1024
+
+
+class _ChunkReader:
+    """
+    A minimal file object reading from an iterable of chunks of bytes, as
+    :py:func:`tarfile.open` takes in streaming mode. Chunks are copied, so
+    they only need to be valid until the next one is requested.
+    """
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._buf = bytearray()
+
+    def read(self, size=-1):
+        while size < 0 or len(self._buf) < size:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            self._buf += chunk
+        if size < 0:
+            size = len(self._buf)
+        data = bytes(self._buf[:size])
+        del self._buf[:size]
+        return data
+
+
+class _Extractor:
+    def __init__(self, dest, rename, executor, max_workers):
+        self.dest = os.path.abspath(dest)
+        self.real_dest = os.path.realpath(self.dest)
+        self.rename = rename
+        self.executor = executor
+        self.slots = threading.BoundedSemaphore(max_workers)
+        self.pending = collections.deque()
+        # Path -> the future of the write to it, while it may be pending
+        self.writing = {}
+        self.directories = []
+        # Directories checked not to lead out of dest, until a symlink is
+        # extracted
+        self.safe_dirs = set()
+
+    def target(self, name):
+        parts = [p for p in name.split('/') if p not in ('', '.')]
+        if not parts or '..' in parts:
+            raise DockerException(f'Unsafe path in archive: {name!r}')
+        if self.rename:
+            parts[0] = self.rename
+        path = os.path.join(self.dest, *parts)
+        parent = os.path.dirname(path)
+        if parent not in self.safe_dirs:
+            real = os.path.realpath(parent)
+            if real != self.real_dest and not real.startswith(
+                    self.real_dest + os.sep):
+                raise DockerException(
+                    f'Archive member {name!r} would be extracted outside '
+                    f'of {self.dest}'
+                )
+            self.safe_dirs.add(parent)
+        return path
+
+    def extract(self, tar, member):
+        path = self.target(member.name)
+        # A write still queued for the same path must be done before the
+        # path is replaced, or it could follow a symlink put there
+        future = self.writing.pop(path, None)
+        if future is not None:
+            future.result()
+        if member.isdir():
+            if not os.path.isdir(path):
+                _unlink(path)
+                os.makedirs(path, exist_ok=True)
+            self.directories.append(member)
+            return True
+        if not (member.isfile() or member.issym() or member.islnk()):
+            # Devices and FIFOs are left out, as docker cp does unprivileged
+            return False
+        self.check()
+        _unlink(path)
+        if member.issym():
+            os.symlink(member.linkname, path)
+            self.safe_dirs.clear()
+        elif member.islnk():
+            # The link target must have been written in full
+            self.wait()
+            os.link(self.target(member.linkname), path)
+        elif member.size <= EXTRACT_INLINE_SIZE:
+            data = tar.extractfile(member).read()
+            self.slots.acquire()
+            try:
+                future = self.executor.submit(self.write, path, data, member)
+            except BaseException:
+                self.slots.release()
+                raise
+            self.pending.append(future)
+            self.writing[path] = future
+        else:
+            f = tar.extractfile(member)
+            with _create(path) as out:
+                for data in iter(
+                        lambda: f.read(EXTRACT_INLINE_SIZE), b''):
+                    out.write(data)
+            _set_attributes(path, member)
+        return True
+
+    def write(self, path, data, member):
+        try:
+            with _create(path) as f:
+                f.write(data)
+            _set_attributes(path, member)
+        finally:
+            self.slots.release()
+
+    def check(self):
+        # Raise the first error of the writes done so far
+        while self.pending and self.pending[0].done():
+            self.pending.popleft().result()
+        if not self.pending:
+            self.writing.clear()
+
+    def wait(self):
+        while self.pending:
+            self.pending.popleft().result()
+        self.writing.clear()
+
+    def finish(self):
+        self.wait()
+        # Deepest first, once nothing more is written into them
+        for member in reversed(self.directories):
+            _set_attributes(self.target(member.name), member)
+
+    def cancel(self):
+        for future in self.pending:
+            future.cancel()
+        for future in self.pending:
+            if not future.cancelled():
+                future.exception()
+
+
+def _unlink(path):
+    # Replace whatever is there, without following a symlink to it
+    if os.path.islink(path) or (
+            os.path.exists(path) and not os.path.isdir(path)):
+        os.unlink(path)
+
+
+def _create(path):
+    # Fails rather than write through a symlink at path
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | \
+        getattr(os, 'O_NOFOLLOW', 0) | getattr(os, 'O_BINARY', 0)
+    return open(os.open(path, flags, 0o666), 'wb')
+
+
+def _set_attributes(path, member):
+    # Permission bits only: setuid, setgid and sticky bits are dropped. A
+    # symlink's own are ignored, and chmod would follow it.
+    if not os.path.islink(path):
+        os.chmod(path, member.mode & 0o777)
+    os.utime(
+        path, (member.mtime, member.mtime),
+        follow_symlinks=os.utime not in os.supports_follow_symlinks
+    )
+
+
+def extract_archive(chunks, dest, rename=None, executor=None, max_workers=8):
+    """
+    Extract a tar archive, given as an iterable of chunks of bytes, into the
+    directory ``dest`` as it is received, without keeping more than a few
+    files of it in memory.
+
+    Regular files are written on ``executor``, at most ``max_workers`` at a
+    time, with their permission bits and modification times. Members with
+    ``..`` in their path or which would be written through a symlink out of
+    ``dest`` raise a :py:class:`~docker.errors.DockerException`; device and
+    FIFO members are skipped.
+
+    Args:
+        chunks (iterable): The tar archive.
+        dest (str): The directory to extract into. Must exist.
+        rename (str): If set, replaces the first component of the path of
+            every member, as ``docker cp`` does when copying to a new name.
+        executor (:py:class:`concurrent.futures.Executor`): Where to write
+            files. A thread pool of ``max_workers`` is used if not set.
+        max_workers (int): The maximum number of files written at once.
+
+    Returns:
+        (int): The number of members extracted.
+    """
+    own_executor = executor is None
+    if own_executor:
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers)
+    extractor = _Extractor(dest, rename, executor, max_workers)
+    count = 0
+    try:
+        with tarfile.open(fileobj=_ChunkReader(chunks), mode='r|') as tar:
+            for member in tar:
+                count += extractor.extract(tar, member)
+        extractor.finish()
+    except BaseException:
+        extractor.cancel()
+        raise
+    finally:
+        if own_executor:
+            executor.shutdown()
+    return count
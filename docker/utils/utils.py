@@ -3,6 +3,7 @@ import collections
 import json
 import os
 import os.path
+import re
 import shlex
 import string
 from datetime import datetime, timezone
@@ -408,6 +409,26 @@ def datetime_to_timestamp(dt):
     return delta.seconds + delta.days * 24 * 3600
 
 
+_RFC3339 = re.compile(
+    r'^(\d{4}-\d\d-\d\dT\d\d:\d\d:\d\d)(?:\.(\d+))?(Z|[+-]\d\d:\d\d)$'
+)
+
+
+def parse_timestamp(value):
+    """
+    Parse an RFC 3339 timestamp, such as the daemon's, into a tuple of whole
+    seconds since the epoch and nanoseconds, without losing precision.
+    """
+    match = _RFC3339.match(value)
+    if match is None:
+        raise ValueError(f'Invalid timestamp: {value}')
+    base, fraction, zone = match.groups()
+    if zone == 'Z':
+        zone = '+00:00'
+    seconds = int(datetime.fromisoformat(base + zone).timestamp())
+    return seconds, int(((fraction or '') + '0' * 9)[:9])
+
+
 def parse_bytes(s):
     if isinstance(s, (int, float,)):
         return s
@@ -0,0 +1,163 @@
+"""
+Time the .dockerignore matching of a build context over a synthetic tree,
+against the previous matcher which tried every pattern on every path with
+fnmatch.
+
+Run from the root of the repository with::
+
+    python -m tests.benchmarks.dockerignore --files 300000
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+from docker.utils.build import PatternMatcher, normalize_slashes, split_path
+from docker.utils.fnmatch import fnmatch
+
+PATTERNS = [
+    '.git',
+    '**/node_modules',
+    '**/__pycache__',
+    '**/*.pyc',
+    '*.log',
+    'build',
+    'dist',
+    'docs/_build',
+    'coverage*',
+    '**/.pytest_cache',
+    'tmp/*',
+    '!tmp/keep',
+    'services/*/tests',
+    '!services/*/tests/fixtures',
+    '**/*.swp',
+    '.env*',
+    '**/.DS_Store',
+    'vendor/**/testdata',
+    '*.tar.gz',
+    'scratch',
+]
+
+NAMES = ['main.py', 'util.pyc', 'README.md', 'index.js', 'debug.log']
+DIRS = ['src', 'lib', 'node_modules', '__pycache__', 'tests', 'fixtures']
+
+
+def make_tree(root, files):
+    """Create about ``files`` empty files under ``root``."""
+    count = 0
+    services = max(1, files // 2000)
+    for service in range(services):
+        for top in DIRS:
+            for sub in DIRS:
+                path = os.path.join(
+                    root, 'services', f'service-{service}', top, sub
+                )
+                os.makedirs(path, exist_ok=True)
+                for i in range(10):
+                    name = NAMES[i % len(NAMES)]
+                    open(os.path.join(path, f'{i}-{name}'), 'w').close()
+                    count += 1
+                    if count >= files:
+                        return count
+    return count
+
+
+class ReferenceMatcher:
+    """The matcher before patterns were compiled together."""
+
+    def __init__(self, patterns):
+        self.patterns = PatternMatcher(patterns).patterns
+
+    def matches(self, filepath):
+        matched = False
+        parent_path = os.path.dirname(filepath)
+        parent_path_dirs = split_path(parent_path)
+
+        for pattern in self.patterns:
+            negative = pattern.exclusion
+            match = fnmatch(
+                normalize_slashes(filepath), pattern.cleaned_pattern
+            )
+            if not match and parent_path != '':
+                if len(pattern.dirs) <= len(parent_path_dirs):
+                    match = fnmatch(
+                        os.path.sep.join(
+                            parent_path_dirs[:len(pattern.dirs)]
+                        ),
+                        pattern.cleaned_pattern
+                    )
+            if match:
+                matched = not negative
+        return matched
+
+    def walk(self, root):
+        def rec_walk(current_dir):
+            for f in os.listdir(current_dir):
+                fpath = os.path.join(os.path.relpath(current_dir, root), f)
+                if fpath.startswith(f".{os.path.sep}"):
+                    fpath = fpath[2:]
+                match = self.matches(fpath)
+                if not match:
+                    yield fpath
+
+                cur = os.path.join(root, fpath)
+                if not os.path.isdir(cur) or os.path.islink(cur):
+                    continue
+
+                if match:
+                    skip = True
+                    for pat in self.patterns:
+                        if not pat.exclusion:
+                            continue
+                        if pat.cleaned_pattern.startswith(
+                                normalize_slashes(fpath)):
+                            skip = False
+                            break
+                    if skip:
+                        continue
+                yield from rec_walk(cur)
+
+        return rec_walk(root)
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--files', type=int, default=50000)
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp()
+    try:
+        count = make_tree(root, args.files)
+        paths = []
+        for dirname, dirnames, filenames in os.walk(root):
+            for name in dirnames + filenames:
+                paths.append(os.path.relpath(os.path.join(dirname, name), root))
+        print(f'{count} files, {len(paths)} paths, {len(PATTERNS)} patterns')
+
+        reference = ReferenceMatcher(list(PATTERNS))
+        matcher = PatternMatcher(list(PATTERNS))
+
+        old, old_matches = timed(lambda: [reference.matches(p) for p in paths])
+        new, new_matches = timed(lambda: [matcher.matches(p) for p in paths])
+        assert old_matches == new_matches
+        print(f'matches() on every path: {old:.2f}s -> {new:.2f}s '
+              f'(x{old / new:.1f})')
+
+        old, old_walk = timed(lambda: set(reference.walk(root)))
+        new, new_walk = timed(lambda: set(matcher.walk(root)))
+        assert old_walk == new_walk
+        print(f'walk() with pruning:     {old:.2f}s -> {new:.2f}s '
+              f'(x{old / new:.1f}), {len(new_walk)} paths kept')
+    finally:
+        shutil.rmtree(root)
+
+
+if __name__ == '__main__':
+    main()
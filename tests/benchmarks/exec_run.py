@@ -0,0 +1,120 @@
+"""
+Measure the latency of Container.exec_run against a fake daemon listening on
+a UNIX socket, which adds a delay to every new connection to stand for TCP
+and TLS handshakes. exec_start hijacks its connection, so exec_inspect needs
+another one: compare opening it after the command ends with having it opened
+while the command runs.
+
+Run from the root of the repository with::
+
+    python -m tests.benchmarks.exec_run --connect-ms 5 --command-ms 5
+"""
+import argparse
+import json
+import os
+import socketserver
+import statistics
+import struct
+import tempfile
+import threading
+import time
+
+import docker
+from docker.constants import DEFAULT_DOCKER_API_VERSION
+
+CONTAINER_ID = 'a' * 64
+EXEC_ID = 'e' * 64
+
+
+class FakeDaemon(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path, connect_delay, command_delay):
+        self.connect_delay = connect_delay
+        self.command_delay = command_delay
+        self.connections = 0
+        super().__init__(path, Handler)
+
+
+class Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        self.server.connections += 1
+        time.sleep(self.server.connect_delay)
+        while True:
+            request_line = self.rfile.readline()
+            if not request_line:
+                return
+            method, path, _ = request_line.decode().split(' ', 2)
+            headers = {}
+            while True:
+                line = self.rfile.readline().decode().strip()
+                if not line:
+                    break
+                name, value = line.split(':', 1)
+                headers[name.lower()] = value.strip()
+            self.rfile.read(int(headers.get('content-length', 0)))
+
+            if path.endswith('/start'):
+                self.wfile.write(
+                    b'HTTP/1.1 101 UPGRADED\r\n'
+                    b'Content-Type: application/vnd.docker.raw-stream\r\n'
+                    b'Connection: Upgrade\r\nUpgrade: tcp\r\n\r\n'
+                )
+                time.sleep(self.server.command_delay)
+                self.wfile.write(struct.pack('>BxxxL', 1, 3) + b'ok\n')
+                return
+            if path.endswith('/exec'):
+                status, body = '201 Created', {'Id': EXEC_ID}
+            elif path.endswith(f'/exec/{EXEC_ID}/json'):
+                status, body = '200 OK', {'ExitCode': 0, 'Running': False}
+            else:
+                status, body = '200 OK', {'Id': CONTAINER_ID}
+            data = json.dumps(body).encode()
+            self.wfile.write(
+                f'HTTP/1.1 {status}\r\nContent-Type: application/json\r\n'
+                f'Content-Length: {len(data)}\r\n\r\n'.encode() + data
+            )
+
+
+def run(client, iterations, preconnect=False):
+    container = client.containers.prepare_model({'Id': CONTAINER_ID})
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        result = container.exec_run('true', preconnect=preconnect)
+        timings.append(time.perf_counter() - start)
+        assert result == (0, b'ok\n')
+    return statistics.median(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--connect-ms', type=float, default=5)
+    parser.add_argument('--command-ms', type=float, default=5)
+    parser.add_argument('--iterations', type=int, default=50)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), 'docker.sock')
+    server = FakeDaemon(path, args.connect_ms / 1000, args.command_ms / 1000)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        client = docker.DockerClient(
+            base_url=f'unix://{path}', version=DEFAULT_DOCKER_API_VERSION
+        )
+        run(client, 1)
+        server.connections = 0
+        before = run(client, args.iterations)
+        before_connections = server.connections
+        server.connections = 0
+        after = run(client, args.iterations, preconnect=True)
+        print(f'exec_run median: {before:.2f}ms -> {after:.2f}ms '
+              f'({before_connections} -> {server.connections} connections '
+              f'for {args.iterations} runs)')
+        client.close()
+    finally:
+        server.shutdown()
+        os.unlink(path)
+
+
+if __name__ == '__main__':
+    main()
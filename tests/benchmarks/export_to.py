@@ -0,0 +1,103 @@
+"""
+Measure the throughput of writing a container export out, writing what
+Container.export() yields against Container.export_to(), from a fake daemon
+streaming a chunked tar archive over a UNIX socket.
+
+The archive is written to /dev/null by default, to measure the client rather
+than the disk. Run from the root of the repository with::
+
+    python -m tests.benchmarks.export_to --size-mb 1024
+"""
+import argparse
+import multiprocessing
+import os
+import socketserver
+import statistics
+import tempfile
+import time
+
+import docker
+from docker.constants import DEFAULT_DOCKER_API_VERSION
+
+# Docker streams archives in 32 KiB writes, each sent as a chunk
+CHUNK = os.urandom(32 * 1024)
+
+
+class FakeDaemon(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path, size):
+        self.size = size
+        super().__init__(path, Handler)
+
+
+class Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        while True:
+            request_line = self.rfile.readline()
+            if not request_line:
+                return
+            while self.rfile.readline().strip():
+                pass
+            self.wfile.write(
+                b'HTTP/1.1 200 OK\r\nContent-Type: application/x-tar\r\n'
+                b'Transfer-Encoding: chunked\r\n\r\n'
+            )
+            frame = b'%x\r\n%s\r\n' % (len(CHUNK), CHUNK)
+            for _ in range(self.server.size // len(CHUNK)):
+                self.wfile.write(frame)
+            self.wfile.write(b'0\r\n\r\n')
+            self.wfile.flush()
+
+
+def serve(path, size):
+    # In a process of its own, so as not to compete with the client for the
+    # GIL
+    FakeDaemon(path, size).serve_forever()
+
+
+def export(container, dest):
+    with open(dest, 'wb') as f:
+        for chunk in container.export():
+            f.write(chunk)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--size-mb', type=int, default=1024)
+    parser.add_argument('--rounds', type=int, default=5)
+    parser.add_argument('--dest', default=os.devnull,
+                        help='Where to write the archive')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, 'docker.sock')
+        server = multiprocessing.Process(
+            target=serve, args=(path, args.size_mb * 1024 * 1024),
+            daemon=True
+        )
+        server.start()
+        while not os.path.exists(path):
+            time.sleep(0.01)
+        client = docker.DockerClient(
+            base_url=f'unix://{path}', version=DEFAULT_DOCKER_API_VERSION
+        )
+        container = client.containers.prepare_model({'Id': 'a' * 64})
+        rates = {'export': [], 'export_to': []}
+        for _ in range(args.rounds):
+            for name, fn in (('export', export),
+                             ('export_to', lambda c, d: c.export_to(d))):
+                start = time.perf_counter()
+                fn(container, args.dest)
+                rates[name].append(
+                    args.size_mb / (time.perf_counter() - start)
+                )
+        for name, values in rates.items():
+            print(f'{name:<10} {statistics.median(values):8.0f} MB/s')
+
+        client.close()
+        server.terminate()
+
+
+if __name__ == '__main__':
+    main()
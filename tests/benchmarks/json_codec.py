@@ -0,0 +1,133 @@
+"""
+Compare the JSON codecs on large response and request bodies.
+
+Run from the root of the repository with::
+
+    python -m tests.benchmarks.json_codec
+
+Codecs whose library isn't installed are skipped.
+"""
+import argparse
+import copy
+import json
+import timeit
+from unittest import mock
+
+import requests
+
+from docker.api import APIClient
+from docker.constants import DEFAULT_DOCKER_API_VERSION
+from docker.errors import DockerException
+from docker.utils.json_codec import JSON_CODECS
+
+from ..unit import fake_api
+
+
+def make_inspect_container(mounts=50, env=200, networks=10):
+    _, attrs = fake_api.get_fake_inspect_container()
+    attrs = copy.deepcopy(attrs)
+    attrs['Config']['Env'] = [f'VARIABLE_{i}=value-{i}' for i in range(env)]
+    attrs['Config']['Labels'] = {
+        f'com.example.label-{i}': f'value-{i}' for i in range(env)
+    }
+    attrs['Mounts'] = [{
+        'Type': 'bind',
+        'Source': f'/var/lib/data/{i}',
+        'Destination': f'/data/{i}',
+        'Mode': 'rw',
+        'RW': True,
+        'Propagation': 'rprivate',
+    } for i in range(mounts)]
+    attrs['NetworkSettings'] = {'Networks': {
+        f'network-{i}': {
+            'NetworkID': f'{i:064x}',
+            'EndpointID': f'{i + 1:064x}',
+            'Gateway': f'172.{i}.0.1',
+            'IPAddress': f'172.{i}.0.2',
+            'IPPrefixLen': 16,
+            'MacAddress': '02:42:ac:11:00:02',
+            'Aliases': [f'alias-{i}', f'other-{i}'],
+        } for i in range(networks)
+    }}
+    return attrs
+
+
+def make_images(count=2000):
+    return [{
+        'Id': f'sha256:{i:064x}',
+        'ParentId': '',
+        'RepoTags': [f'registry.example.com/project/image-{i}:latest'],
+        'RepoDigests': [f'registry.example.com/project/image-{i}@sha256:'
+                        f'{i:064x}'],
+        'Created': 1700000000 + i,
+        'Size': 100000000 + i,
+        'SharedSize': -1,
+        'VirtualSize': 100000000 + i,
+        'Labels': {'maintainer': 'someone@example.com'},
+        'Containers': -1,
+    } for i in range(count)]
+
+
+def make_response(body):
+    response = requests.Response()
+    response.status_code = 200
+    response._content = body
+    return response
+
+
+def bench(fn, number):
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number
+
+
+def run(client, inspect_body, images_body, create_config, number):
+    inspect = bench(
+        lambda: client._result(make_response(inspect_body), json=True),
+        number
+    )
+    images = bench(
+        lambda: client._result(make_response(images_body), json=True),
+        number
+    )
+    with mock.patch.object(client, '_post'):
+        post = bench(
+            lambda: client._post_json('url', create_config), number * 10
+        )
+    return inspect, images, post
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--number', type=int, default=20)
+    args = parser.parse_args()
+
+    inspect_body = json.dumps(make_inspect_container()).encode()
+    images_body = json.dumps(make_images()).encode()
+    create_config = make_inspect_container()['Config']
+
+    print(f'inspect_container: {len(inspect_body) / 1024:.0f} KiB, '
+          f'images(): {len(images_body) / 1024:.0f} KiB')
+    print(f'{"codec":<8} {"inspect":>12} {"images":>12} {"post_json":>12}')
+
+    baseline = None
+    for name in JSON_CODECS:
+        try:
+            client = APIClient(
+                version=DEFAULT_DOCKER_API_VERSION, json_codec=name
+            )
+        except DockerException:
+            print(f'{name:<8} (not installed)')
+            continue
+
+        timings = run(
+            client, inspect_body, images_body, create_config, args.number
+        )
+        if baseline is None:
+            baseline = timings
+        print(f'{name:<8} ' + ' '.join(
+            f'{t * 1e6:>7.0f}us x{b / t:<3.1f}'
+            for t, b in zip(timings, baseline)
+        ))
+
+
+if __name__ == '__main__':
+    main()
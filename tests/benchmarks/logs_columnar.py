@@ -0,0 +1,102 @@
+"""
+Compare parsing and filtering container logs line by line with parsing them
+into LogColumns and filtering those.
+
+Run from the root of the repository with::
+
+    python -m tests.benchmarks.logs_columnar --lines 1000000
+"""
+import argparse
+import datetime
+import struct
+import time
+from unittest import mock
+
+from docker.models import logs
+from docker.models.logs import _ColumnsBuilder
+from docker.utils.socket import STDERR, STDOUT
+
+
+def make_stream(lines):
+    frames = []
+    for i in range(lines):
+        second, fraction = divmod(i, 1000)
+        message = (
+            f'2024-01-01T{second // 3600:02d}:{second // 60 % 60:02d}:'
+            f'{second % 60:02d}.{fraction * 1000000:09d}Z '
+            f'request {i} handled in {i % 97} ms\n'
+        ).encode()
+        stream = STDERR if i % 10 == 0 else STDOUT
+        frames.append(struct.pack('>BxxxL', stream, len(message)) + message)
+    return b''.join(frames)
+
+
+def per_line(data, since):
+    # How client code filters logs without the columns: parse each frame
+    # and timestamp in pure Python
+    selected = []
+    start = 0
+    while start < len(data):
+        stream, length = struct.unpack_from('>BxxxL', data, start)
+        message = data[start + 8:start + 8 + length]
+        start += 8 + length
+        timestamp, _, line = message.partition(b' ')
+        parsed = datetime.datetime.strptime(
+            timestamp[:26].decode(), '%Y-%m-%dT%H:%M:%S.%f'
+        )
+        if stream == STDERR and parsed >= since:
+            selected.append(line.rstrip(b'\n'))
+    return selected
+
+
+def columnar(data, since):
+    builder = _ColumnsBuilder(tty=False)
+    for i in range(0, len(data), 2 * 1024 * 1024):
+        builder.feed(data[i:i + 2 * 1024 * 1024])
+    columns = builder.finish()
+    parsed = time.perf_counter()
+    if logs.numpy is not None:
+        columns = columns.take(
+            (columns.streams == STDERR) &
+            (columns.timestamps >= logs.numpy.datetime64(since))
+        )
+    else:
+        since = int(since.replace(tzinfo=datetime.timezone.utc).timestamp())
+        since *= 1000000000
+        columns = columns.take([
+            stream == STDERR and timestamp >= since
+            for stream, timestamp in zip(columns.streams, columns.timestamps)
+        ])
+    return columns, time.perf_counter() - parsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--lines', type=int, default=1000000)
+    args = parser.parse_args()
+
+    data = make_stream(args.lines)
+    since = datetime.datetime(2024, 1, 1) + \
+        datetime.timedelta(seconds=args.lines // 2000)
+
+    start = time.perf_counter()
+    expected = per_line(data, since)
+    baseline = time.perf_counter() - start
+    print(f'{"per line":<12} {baseline:8.2f} s '
+          f'({len(data) / 2 ** 20:.0f} MiB, {args.lines} lines)')
+
+    backends = [('pure Python', None)]
+    if logs.numpy is not None:
+        backends.append(('NumPy', logs.numpy))
+    for name, numpy in backends:
+        with mock.patch.object(logs, 'numpy', numpy):
+            start = time.perf_counter()
+            columns, filtering = columnar(data, since)
+            elapsed = time.perf_counter() - start
+        assert [line for _, _, line in columns] == expected
+        print(f'{name:<12} {elapsed:8.2f} s, of which filtering '
+              f'{filtering * 1000:.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
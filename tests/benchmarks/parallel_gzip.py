@@ -0,0 +1,69 @@
+"""
+Compare the throughput of tarfile's gzip compression and ParallelGzip.
+
+Run from the root of the repository with::
+
+    python -m tests.benchmarks.parallel_gzip --size 256 --threads 1 2 4
+"""
+import argparse
+import gzip
+import io
+import os
+import time
+
+from docker.utils import ParallelGzip
+
+
+def make_data(size):
+    # Compressible like source trees, with some incompressible assets
+    text = b''.join(
+        f'def function_{i}(value):\n    return value * {i}\n'.encode()
+        for i in range(size // 64)
+    )
+    return (text + os.urandom(size // 4))[:size]
+
+
+def measure(compress, data):
+    start = time.perf_counter()
+    out = io.BytesIO()
+    compress(data, out)
+    elapsed = time.perf_counter() - start
+    assert gzip.decompress(out.getvalue()) == data
+    return elapsed, len(out.getvalue())
+
+
+def gzipfile(level):
+    def compress(data, out):
+        with gzip.GzipFile(fileobj=out, mode='wb', compresslevel=level) as f:
+            f.write(data)
+    return compress
+
+
+def parallel(level, threads):
+    def compress(data, out):
+        with ParallelGzip(level, threads).open(out) as f:
+            for i in range(0, len(data), 64 * 1024):
+                f.write(data[i:i + 64 * 1024])
+    return compress
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--size', type=int, default=128, help='MiB')
+    parser.add_argument('--level', type=int, default=6)
+    parser.add_argument('--threads', type=int, nargs='+', default=[1, 2, 4])
+    args = parser.parse_args()
+
+    data = make_data(args.size * 1024 * 1024)
+    runs = [('GzipFile', gzipfile(args.level))] + [
+        (f'ParallelGzip x{threads}', parallel(args.level, threads))
+        for threads in args.threads
+    ]
+    for name, compress in runs:
+        elapsed, size = measure(compress, data)
+        print(f'{name:<18} {len(data) / elapsed / 2 ** 20:8.1f} MiB/s '
+              f'ratio {size / len(data):.3f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+"""
+Compare computing the usage of many containers one stats dict at a time
+with StatsCollector's batched computation.
+
+Run from the root of the repository with::
+
+    python -m tests.benchmarks.stats --containers 5000 --rounds 20
+"""
+import argparse
+import time
+from unittest import mock
+
+from docker.models import stats
+from docker.models.stats import StatsCollector
+
+
+def make_stats(i, r):
+    return {
+        'read': f'2024-01-01T00:{r // 60:02d}:{r % 60:02d}.000000000Z',
+        'cpu_stats': {
+            'cpu_usage': {'total_usage': r * 10 * (i + 1)},
+            'system_cpu_usage': r * 100000,
+            'online_cpus': 4,
+        },
+        'precpu_stats': {
+            'cpu_usage': {'total_usage': (r - 1) * 10 * (i + 1)},
+            'system_cpu_usage': (r - 1) * 100000,
+        },
+        'memory_stats': {
+            'usage': 1000 + i, 'limit': 10000,
+            'stats': {'inactive_file': 10},
+        },
+        'networks': {'eth0': {'rx_bytes': r * i, 'tx_bytes': r * 2 * i}},
+        'blkio_stats': {'io_service_bytes_recursive': [
+            {'op': 'Read', 'value': r * 3 * i},
+            {'op': 'Write', 'value': r * 4 * i},
+        ]},
+    }
+
+
+def per_dict(samples, previous):
+    # How client code computes usage without the collector: a pass over
+    # each pair of dicts in pure Python
+    rates = {}
+    for container_id, s in samples.items():
+        cpu = s['cpu_stats']['cpu_usage']['total_usage'] - \
+            s['precpu_stats']['cpu_usage']['total_usage']
+        system = s['cpu_stats']['system_cpu_usage'] - \
+            s['precpu_stats']['system_cpu_usage']
+        memory = s['memory_stats']['usage'] - \
+            s['memory_stats']['stats']['inactive_file']
+        prev = previous[container_id]
+        rx = sum(n['rx_bytes'] for n in s['networks'].values()) - \
+            sum(n['rx_bytes'] for n in prev['networks'].values())
+        tx = sum(n['tx_bytes'] for n in s['networks'].values()) - \
+            sum(n['tx_bytes'] for n in prev['networks'].values())
+        rates[container_id] = (
+            cpu / system * s['cpu_stats']['online_cpus'] * 100,
+            memory, memory / s['memory_stats']['limit'] * 100, rx, tx,
+        )
+    return rates
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--containers', type=int, default=5000)
+    parser.add_argument('--rounds', type=int, default=20)
+    args = parser.parse_args()
+
+    ids = [str(i) for i in range(args.containers)]
+    rounds = [
+        {i: make_stats(n, r) for n, i in enumerate(ids)}
+        for r in range(1, args.rounds + 1)
+    ]
+
+    start = time.perf_counter()
+    for previous, samples in zip(rounds, rounds[1:]):
+        per_dict(samples, previous)
+    baseline = time.perf_counter() - start
+
+    backends = [('pure Python', None)]
+    if stats.numpy is not None:
+        backends.append(('NumPy', stats.numpy))
+    for name, numpy in backends:
+        with mock.patch.object(stats, 'numpy', numpy):
+            collector = StatsCollector(mock.Mock(), containers=ids)
+            collector._buffers.add_rows(len(ids))
+        rows = list(range(len(ids)))
+        parsed = [[stats._parse(s[i]) for i in ids] for s in rounds]
+        collector._rows = dict(zip(ids, rows))
+        collector._buffers.write(rows, parsed[0])
+        start = time.perf_counter()
+        for values in parsed[1:]:
+            collector._buffers.write(rows, values)
+            collector.rates()
+        elapsed = time.perf_counter() - start
+        print(f'{name:<12} {elapsed / (len(rounds) - 1) * 1000:8.2f} ms '
+              f'per round vs {baseline / (len(rounds) - 1) * 1000:.2f} ms '
+              f'per dict ({args.containers} containers)')
+
+
+if __name__ == '__main__':
+    main()
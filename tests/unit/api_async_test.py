@@ -0,0 +1,303 @@
+import asyncio
+import io
+import json
+import os
+import shutil
+import struct
+import tempfile
+import unittest
+
+import pytest
+
+import docker
+from docker.api import AsyncAPIClient
+from docker.constants import DEFAULT_DOCKER_API_VERSION
+
+from . import fake_api
+
+
+def _encode_response(status_code, content, headers=None):
+    if not isinstance(content, bytes):
+        content = json.dumps(content).encode('ascii')
+    head = [f'HTTP/1.1 {status_code} Whatever']
+    head.extend(f'{k}: {v}' for k, v in (headers or {}).items())
+    head.append(f'Content-Length: {len(content)}')
+    return ('\r\n'.join(head) + '\r\n\r\n').encode('ascii') + content
+
+
+def _chunked(status_code, chunks):
+    head = (
+        f'HTTP/1.1 {status_code} OK\r\n'
+        'Transfer-Encoding: chunked\r\n\r\n'
+    ).encode('ascii')
+    body = b''.join(
+        f'{len(c):x}\r\n'.encode('ascii') + c + b'\r\n' for c in chunks
+    )
+    return head + body + b'0\r\n\r\n'
+
+
+def _frame(stream, data):
+    return struct.pack('>BxxxL', stream, len(data)) + data
+
+
+@pytest.mark.skipif(
+    docker.constants.IS_WINDOWS_PLATFORM, reason='Unix only'
+)
+class AsyncAPIClientTest(unittest.TestCase):
+    def setUp(self):
+        socket_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, socket_dir)
+        self.socket_file = os.path.join(socket_dir, 'docker.sock')
+        self.requests = []
+        self.connections = 0
+        self.handlers = {}
+        self.server_tasks = []
+
+    async def handle(self, reader, writer):
+        self.connections += 1
+        self.server_tasks.append(asyncio.current_task())
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    return
+                method, path, _ = line.decode('ascii').split(' ', 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line == b'\r\n':
+                        break
+                    key, _, value = line.decode('ascii').partition(':')
+                    headers[key.strip().lower()] = value.strip()
+                body = b''
+                if 'content-length' in headers:
+                    body = await reader.readexactly(
+                        int(headers['content-length'])
+                    )
+                elif headers.get('transfer-encoding') == 'chunked':
+                    while True:
+                        size = int(await reader.readline(), 16)
+                        body += await reader.readexactly(size + 2)
+                        if not size:
+                            break
+                self.requests.append((method, path, headers, body))
+                url, _, _ = path.partition('?')
+                handler = self.handlers.get(url)
+                if handler is not None:
+                    writer.write(handler())
+                    await writer.drain()
+                    writer.close()
+                    return
+                key = f'{fake_api.prefix}{url}'
+                if (key, method) in fake_api.fake_responses:
+                    key = (key, method)
+                if key not in fake_api.fake_responses:
+                    writer.write(_encode_response(
+                        404, {'message': 'No such container: nope'}
+                    ))
+                else:
+                    writer.write(_encode_response(
+                        *fake_api.fake_responses[key]()
+                    ))
+                await writer.drain()
+        finally:
+            writer.close()
+
+    def run_client(self, coro_fn, version=DEFAULT_DOCKER_API_VERSION):
+        async def main():
+            server = await asyncio.start_unix_server(
+                self.handle, path=self.socket_file
+            )
+            try:
+                async with AsyncAPIClient(
+                        base_url=f'unix://{self.socket_file}',
+                        version=version) as client:
+                    return await coro_fn(client)
+            finally:
+                # Idle connections are closed, let their handlers finish
+                await asyncio.gather(*self.server_tasks)
+                server.close()
+                await server.wait_closed()
+        return asyncio.run(main())
+
+    def test_inspect_container(self):
+        async def fn(client):
+            return await client.inspect_container(fake_api.FAKE_CONTAINER_ID)
+
+        result = self.run_client(fn)
+        assert result['Id'] == fake_api.FAKE_CONTAINER_ID
+        method, path, headers, _ = self.requests[0]
+        assert method == 'GET'
+        assert path == (
+            f'/{fake_api.CURRENT_VERSION}/containers/'
+            f'{fake_api.FAKE_CONTAINER_ID}/json'
+        )
+        assert headers['user-agent'] == docker.constants.DEFAULT_USER_AGENT
+
+    def test_concurrent_calls_share_connections(self):
+        async def fn(client):
+            return await asyncio.gather(*(
+                client.inspect_container(fake_api.FAKE_CONTAINER_ID)
+                for _ in range(50)
+            ))
+
+        results = self.run_client(fn)
+        assert len(results) == 50
+        assert len(self.requests) == 50
+        assert self.connections <= 50
+
+    def test_sequential_calls_reuse_connection(self):
+        async def fn(client):
+            for _ in range(5):
+                await client.version()
+
+        self.run_client(fn)
+        assert len(self.requests) == 5
+        assert self.connections == 1
+
+    def test_query_params(self):
+        async def fn(client):
+            return await client.containers(all=True, quiet=True)
+
+        result = self.run_client(fn)
+        assert result == [{'Id': fake_api.FAKE_CONTAINER_ID}]
+        path = self.requests[0][1]
+        assert path.startswith(f'/{fake_api.CURRENT_VERSION}/containers/json?')
+        assert 'all=1' in path
+
+    def test_post_json(self):
+        async def fn(client):
+            return await client.exec_create(
+                fake_api.FAKE_CONTAINER_ID, ['echo', 'hello']
+            )
+
+        result = self.run_client(fn)
+        assert result['Id'] == fake_api.FAKE_EXEC_ID
+        _, _, headers, body = self.requests[0]
+        assert headers['content-type'] == 'application/json'
+        assert json.loads(body)['Cmd'] == ['echo', 'hello']
+
+    def test_raise_for_status(self):
+        async def fn(client):
+            return await client.inspect_container('nope')
+
+        with pytest.raises(docker.errors.NotFound) as excinfo:
+            self.run_client(fn)
+        assert excinfo.value.explanation == 'No such container: nope'
+
+    def test_auto_version(self):
+        async def fn(client):
+            await client.version(api_version=False)
+            return client.api_version
+
+        assert self.run_client(fn, version='auto') == (
+            fake_api.get_fake_version()[1]['ApiVersion']
+        )
+        assert [r[1] for r in self.requests] == ['/version', '/version']
+
+    def test_builders_stay_synchronous(self):
+        client = AsyncAPIClient(
+            base_url=f'unix://{self.socket_file}',
+            version=DEFAULT_DOCKER_API_VERSION
+        )
+        host_config = client.create_host_config(privileged=True)
+        assert host_config['Privileged'] is True
+
+    def test_logs_runs_inspect_then_decodes(self):
+        url = (
+            f'/{fake_api.CURRENT_VERSION}/containers/'
+            f'{fake_api.FAKE_CONTAINER_ID}/logs'
+        )
+        self.handlers[url] = lambda: _encode_response(
+            200, _frame(1, b'hello ') + _frame(2, b'world\n')
+        )
+
+        async def fn(client):
+            return await client.logs(fake_api.FAKE_CONTAINER_ID)
+
+        assert self.run_client(fn) == b'hello world\n'
+        assert [r[1].split('?')[0] for r in self.requests] == [
+            url,
+            f'/{fake_api.CURRENT_VERSION}/containers/'
+            f'{fake_api.FAKE_CONTAINER_ID}/json',
+        ]
+
+    def test_logs_stream(self):
+        url = (
+            f'/{fake_api.CURRENT_VERSION}/containers/'
+            f'{fake_api.FAKE_CONTAINER_ID}/logs'
+        )
+        self.handlers[url] = lambda: _chunked(
+            200, [_frame(1, b'hello '), _frame(2, b'world\n')]
+        )
+
+        async def fn(client):
+            stream = await client.logs(fake_api.FAKE_CONTAINER_ID, stream=True)
+            return [line async for line in stream]
+
+        assert self.run_client(fn) == [b'hello ', b'world\n']
+
+    def test_export_to(self):
+        url = (
+            f'/{fake_api.CURRENT_VERSION}/containers/'
+            f'{fake_api.FAKE_CONTAINER_ID}/export'
+        )
+        self.handlers[url] = lambda: _chunked(200, [b'tar', b'data'])
+        dest = io.BytesIO()
+
+        async def fn(client):
+            return await client.export_to(fake_api.FAKE_CONTAINER_ID, dest)
+
+        assert self.run_client(fn) == 7
+        assert dest.getvalue() == b'tardata'
+        assert len(self.requests) == 1
+
+    def test_events_decode(self):
+        url = f'/{fake_api.CURRENT_VERSION}/events'
+        self.handlers[url] = lambda: _chunked(200, [
+            b'{"status": "start", "id": "a"}\n{"status"',
+            b': "die", "id": "a"}\n',
+        ])
+
+        async def fn(client):
+            events = await client.events(decode=True)
+            return [event async for event in events]
+
+        assert self.run_client(fn) == [
+            {'status': 'start', 'id': 'a'},
+            {'status': 'die', 'id': 'a'},
+        ]
+
+    def test_exec_start_hijacked(self):
+        url = f'/{fake_api.CURRENT_VERSION}/exec/{fake_api.FAKE_EXEC_ID}/start'
+        self.handlers[url] = lambda: (
+            b'HTTP/1.1 101 UPGRADED\r\n'
+            b'Content-Type: application/vnd.docker.raw-stream\r\n'
+            b'Connection: Upgrade\r\nUpgrade: tcp\r\n\r\n' +
+            _frame(1, b'out') + _frame(2, b'err')
+        )
+
+        async def fn(client):
+            return await client.exec_start(fake_api.FAKE_EXEC_ID, demux=True)
+
+        assert self.run_client(fn) == (b'out', b'err')
+        headers = self.requests[0][2]
+        assert headers['upgrade'] == 'tcp'
+
+    def test_exec_start_output(self):
+        url = f'/{fake_api.CURRENT_VERSION}/exec/{fake_api.FAKE_EXEC_ID}/start'
+        self.handlers[url] = lambda: (
+            b'HTTP/1.1 101 UPGRADED\r\n'
+            b'Content-Type: application/vnd.docker.raw-stream\r\n'
+            b'Connection: Upgrade\r\nUpgrade: tcp\r\n\r\n' +
+            _frame(1, b'out') + _frame(2, b'err') + _frame(1, b'put')
+        )
+        stdout = io.BytesIO()
+
+        async def fn(client):
+            return await client.exec_start(
+                fake_api.FAKE_EXEC_ID, output=(stdout, None)
+            )
+
+        assert self.run_client(fn) == (6, 3)
+        assert stdout.getvalue() == b'output'
@@ -1,6 +1,11 @@
 import gzip
 import io
+import json
+import os
 import shutil
+import tarfile
+import tempfile
+from unittest import mock
 
 import pytest
 
@@ -118,6 +123,45 @@ class BuildTest(BaseAPIClientTest):
     def test_build_container_with_named_dockerfile(self):
         self.client.build(".", dockerfile="nameddockerfile")
 
+    def test_build_stream_context(self):
+        base = make_tree([], ['Dockerfile', 'a.py'])
+        self.addCleanup(shutil.rmtree, base)
+        bodies = []
+
+        def post(url, data=None, **kwargs):
+            bodies.append(b''.join(data))
+            return fake_request('POST', url, data=data, **kwargs)
+
+        with mock.patch.object(self.client, 'post', side_effect=post):
+            self.client.build(base, stream_context=True, gzip=True)
+
+        headers = fake_request.call_args[1]['headers']
+        assert headers['Content-Encoding'] == 'gzip'
+        archive = tarfile.open(fileobj=io.BytesIO(bodies[0]))
+        assert sorted(archive.getnames()) == ['Dockerfile', 'a.py']
+
+    def test_build_context_cache(self):
+        base = make_tree([], ['Dockerfile', 'a.py'])
+        self.addCleanup(shutil.rmtree, base)
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir)
+        bodies = []
+
+        def post(url, data=None, **kwargs):
+            bodies.append(data.read())
+            return fake_request('POST', url, data=data, **kwargs)
+
+        with mock.patch.object(self.client, 'post', side_effect=post):
+            self.client.build(base, context_cache=cache_dir)
+            self.client.build(base, context_cache=cache_dir)
+
+        assert bodies[0] == bodies[1]
+        with open(os.path.join(cache_dir, 'index.json')) as f:
+            index = json.load(f)
+        assert sorted(index['entries']) == [
+            os.path.join(base, 'Dockerfile'), os.path.join(base, 'a.py')
+        ]
+
     def test_build_with_invalid_tag(self):
         with pytest.raises(errors.DockerException):
             self.client.build(".", tag="https://example.com")
@@ -1,4 +1,6 @@
 import datetime
+import gzip
+import io
 import json
 import signal
 from unittest import mock
@@ -7,6 +9,7 @@ import pytest
 
 import docker
 from docker.api import APIClient
+from docker.api.client import TTYCache
 
 from ..helpers import requires_api_version
 from . import fake_api
@@ -15,6 +18,7 @@ from .api_test import (
     BaseAPIClientTest,
     fake_inspect_container,
     fake_request,
+    response,
     url_base,
     url_prefix,
 )
@@ -1343,6 +1347,58 @@ class ContainerTest(BaseAPIClientTest):
             stream=True
         )
 
+    def test_logs_tty_is_cached(self):
+        inspect_url = (
+            url_prefix + 'containers/' + fake_api.FAKE_CONTAINER_ID + '/json'
+        )
+
+        def inspects():
+            return [
+                c for c in fake_request.call_args_list if c[0][1] == inspect_url
+            ]
+
+        before = len(inspects())
+        self.client.logs(fake_api.FAKE_CONTAINER_ID)
+        self.client.logs(fake_api.FAKE_CONTAINER_ID, since=42)
+        assert len(inspects()) == before + 1
+
+    def test_logs_with_known_tty(self):
+        with mock.patch('docker.api.client.APIClient.inspect_container') as m:
+            logs = self.client.logs(fake_api.FAKE_CONTAINER_ID, tty=False)
+        assert not m.called
+        assert logs == b'Flowering Nights\n(Sakuya Iyazoi)\n'
+
+    def test_logs_output(self):
+        frames = (
+            b'\x01\0\0\0\0\0\0\x04out\n' b'\x02\0\0\0\0\0\0\x04err\n'
+        )
+        res = response(raw=io.BytesIO(frames))
+        stdout, stderr = io.BytesIO(), io.BytesIO()
+        with mock.patch.object(self.client, '_get', return_value=res) as get:
+            written = self.client.logs(
+                fake_api.FAKE_CONTAINER_ID, tty=False, output=(stdout, stderr)
+            )
+        assert get.call_args[1]['stream'] is True
+        assert written == (4, 4)
+        assert (stdout.getvalue(), stderr.getvalue()) == (b'out\n', b'err\n')
+
+    def test_logs_output_with_stream(self):
+        with pytest.raises(docker.errors.InvalidArgument):
+            self.client.logs(
+                fake_api.FAKE_CONTAINER_ID, stream=True, output=io.BytesIO()
+            )
+
+    def test_tty_cache(self):
+        cache = TTYCache(maxsize=2)
+        cache.remember({'Id': 'a', 'Config': {'Tty': True}})
+        cache.remember({'Id': 'b', 'Config': {'Tty': False}})
+        cache.remember({'Name': '/c'})
+        assert cache.get('a') is True
+        cache.remember({'Id': 'c', 'Config': {'Tty': False}})
+        assert cache.get('a') is True
+        assert cache.get('b') is None
+        assert cache.get('c') is False
+
     def test_diff(self):
         self.client.diff(fake_api.FAKE_CONTAINER_ID)
 
@@ -1592,3 +1648,16 @@ class ContainerTest(BaseAPIClientTest):
             'Memory': 2 * 1024, 'CpuShares': 124, 'BlkioWeight': 345
         }
         assert args[1]['headers']['Content-Type'] == 'application/json'
+
+    def test_put_archive_gzip(self):
+        data = b'x' * 300 * 1024
+        with mock.patch.object(
+            self.client, '_put', return_value=response(status_code=200)
+        ) as put:
+            assert self.client.put_archive(
+                fake_api.FAKE_CONTAINER_ID, '/tmp', io.BytesIO(data),
+                gzip=docker.utils.ParallelGzip(threads=2)
+            )
+        args = put.call_args
+        assert args[1]['params'] == {'path': '/tmp'}
+        assert gzip.decompress(b''.join(args[1]['data'])) == data
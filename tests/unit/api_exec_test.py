@@ -1,4 +1,10 @@
+import io
 import json
+from unittest import mock
+
+import pytest
+
+import docker
 
 from . import fake_api
 from .api_test import (
@@ -48,6 +54,30 @@ class ExecTest(BaseAPIClientTest):
             'Upgrade': 'tcp'
         }
 
+    def test_exec_start_preconnects_on_request(self):
+        with mock.patch.object(self.client, '_preconnect') as preconnect:
+            self.client.exec_start(fake_api.FAKE_EXEC_ID)
+            assert not preconnect.called
+            self.client.exec_start(fake_api.FAKE_EXEC_ID, detach=True,
+                                   preconnect=True)
+            assert not preconnect.called
+            self.client.exec_start(fake_api.FAKE_EXEC_ID, preconnect=True)
+            preconnect.assert_called_once_with()
+
+    def test_exec_start_output(self):
+        output = io.BytesIO()
+        with mock.patch.object(
+            self.client, '_read_from_socket', return_value=(3, 0)
+        ) as read:
+            assert self.client.exec_start(
+                fake_api.FAKE_EXEC_ID, output=output
+            ) == (3, 0)
+        assert read.call_args[1]['output'] is output
+        with pytest.raises(docker.errors.InvalidArgument):
+            self.client.exec_start(
+                fake_api.FAKE_EXEC_ID, stream=True, output=output
+            )
+
     def test_exec_start_detached(self):
         self.client.exec_start(fake_api.FAKE_EXEC_ID, detach=True)
 
@@ -69,6 +99,14 @@ class ExecTest(BaseAPIClientTest):
         args = fake_request.call_args
         assert args[0][1] == f"{url_prefix}exec/{fake_api.FAKE_EXEC_ID}/json"
 
+    def test_exec_request_timeouts(self):
+        self.client.exec_create(fake_api.FAKE_CONTAINER_ID, ['ls'])
+        assert fake_request.call_args[1]['timeout'] == DEFAULT_TIMEOUT_SECONDS
+        self.client.exec_create(fake_api.FAKE_CONTAINER_ID, ['ls'], timeout=3)
+        assert fake_request.call_args[1]['timeout'] == 3
+        self.client.exec_inspect(fake_api.FAKE_EXEC_ID, timeout=2)
+        assert fake_request.call_args[1]['timeout'] == 2
+
     def test_exec_resize(self):
         self.client.exec_resize(fake_api.FAKE_EXEC_ID, height=20, width=60)
 
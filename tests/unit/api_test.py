@@ -21,6 +21,7 @@ import urllib3
 import docker
 from docker.api import APIClient
 from docker.constants import DEFAULT_DOCKER_API_VERSION
+from docker.utils.json_codec import JSONCodec
 
 from . import fake_api
 
@@ -81,7 +82,8 @@ def fake_delete(self, url, *args, **kwargs):
     return fake_request('DELETE', url, *args, **kwargs)
 
 
-def fake_read_from_socket(self, response, stream, tty=False, demux=False):
+def fake_read_from_socket(self, response, stream, tty=False, demux=False,
+                          timeout=None, output=None):
     return b''
 
 
@@ -325,6 +327,34 @@ class DockerApiTest(BaseAPIClientTest):
         with pytest.raises(TypeError):
             self.client.create_host_config(security_opt='wrong')
 
+    def test_json_codec(self):
+        class Codec(JSONCodec):
+            def __init__(self):
+                self.loaded = []
+                self.dumped = []
+
+            def loads(self, data):
+                self.loaded.append(data)
+                return super().loads(data)
+
+            def dumps(self, obj):
+                self.dumped.append(obj)
+                return super().dumps(obj).encode('utf-8')
+
+        codec = Codec()
+        client = APIClient(
+            version=DEFAULT_DOCKER_API_VERSION, json_codec=codec
+        )
+        assert client._result(response(content={'a': 1}), json=True) == {
+            'a': 1
+        }
+        assert codec.loaded == [b'{"a": 1}']
+
+        with mock.patch.object(client, '_post') as post:
+            client._post_json('url', {'a': 1, 'b': None})
+        assert codec.dumped == [{'a': 1}]
+        assert post.call_args[1]['data'] == b'{"a": 1}'
+
     def test_stream_helper_decoding(self):
         status_code, content = fake_api.fake_responses[f"{url_prefix}events"]()
         content_str = json.dumps(content)
@@ -465,6 +495,84 @@ class UnixSocketStreamTest(unittest.TestCase):
             ]
 
 
+class PingHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def do_GET(self):
+        self.server.paths.append(self.path)
+        self.send_response(200)
+        self.send_header('Content-Length', '2')
+        self.end_headers()
+        self.wfile.write(b'OK')
+
+
+class PreconnectTest(unittest.TestCase):
+    def test_preconnect_adds_idle_connection(self):
+        tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmpdir)
+        path = os.path.join(tmpdir, 'docker.sock')
+        server = socketserver.ThreadingUnixStreamServer(path, PingHandler)
+        server.daemon_threads = True
+        server.connections = 0
+        server.paths = []
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        threading.Thread(
+            target=server.serve_forever, args=(0.01,), daemon=True
+        ).start()
+
+        client = APIClient(
+            base_url=f'unix://{path}', version=DEFAULT_DOCKER_API_VERSION
+        )
+        self.addCleanup(client.close)
+        client._preconnect().result()
+        assert server.paths == [f'/v{DEFAULT_DOCKER_API_VERSION}/_ping']
+
+        # The next request finds the connection idle in the pool
+        client._get(client._url('/_ping')).close()
+        assert server.connections == 1
+
+    def test_pending_preconnect_is_shared(self):
+        client = APIClient(
+            base_url='unix:///nonexistent/docker.sock',
+            version=DEFAULT_DOCKER_API_VERSION
+        )
+        self.addCleanup(client.close)
+        started = threading.Event()
+        release = threading.Event()
+
+        def open_spare_connection():
+            started.set()
+            release.wait(5)
+
+        with mock.patch.object(
+            client, '_open_spare_connection', open_spare_connection
+        ):
+            pending = client._preconnect()
+            started.wait(5)
+            assert client._preconnect() is pending
+            release.set()
+            pending.result()
+            assert client._preconnect() is not pending
+        # One worker thread, reused
+        assert len(client._preconnect_executor._threads) == 1
+
+    def test_preconnect_errors_are_ignored(self):
+        client = APIClient(
+            base_url='unix:///nonexistent/docker.sock',
+            version=DEFAULT_DOCKER_API_VERSION
+        )
+        self.addCleanup(client.close)
+        assert client._preconnect().result() is None
+
+
 class TCPSocketStreamTest(unittest.TestCase):
     stdout_data = b'''
     Now, those children out there, they're jumping through the
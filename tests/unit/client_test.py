@@ -8,13 +8,14 @@ import pytest
 import docker
 from docker.constants import (
     DEFAULT_DOCKER_API_VERSION,
-    DEFAULT_MAX_POOL_SIZE,
+    DEFAULT_MAX_WORKERS,
     DEFAULT_NPIPE,
     DEFAULT_TIMEOUT_SECONDS,
     DEFAULT_UNIX_SOCKET,
     IS_WINDOWS_PLATFORM,
 )
 from docker.utils import kwargs_from_env
+from docker.utils.json_codec import JSONCodec
 
 from . import fake_api
 
@@ -95,7 +96,7 @@ class ClientTest(unittest.TestCase):
         mock_obj.assert_called_once_with(base_url,
                                          "/var/run/docker.sock",
                                          60,
-                                         maxsize=DEFAULT_MAX_POOL_SIZE
+                                         maxsize=DEFAULT_MAX_WORKERS
                                          )
 
     @pytest.mark.skipif(
@@ -111,7 +112,7 @@ class ClientTest(unittest.TestCase):
 
         mock_obj.assert_called_once_with("//./pipe/docker_engine",
                                          60,
-                                         maxsize=DEFAULT_MAX_POOL_SIZE
+                                         maxsize=DEFAULT_MAX_WORKERS
                                          )
 
     @pytest.mark.skipif(
@@ -189,6 +190,14 @@ class FromEnvTest(unittest.TestCase):
 
         assert client.api.timeout == DEFAULT_TIMEOUT_SECONDS
 
+    def test_from_env_with_json_codec(self):
+        codec = JSONCodec()
+        client = docker.from_env(
+            version=DEFAULT_DOCKER_API_VERSION, json_codec=codec
+        )
+
+        assert client.api._json_codec is codec
+
     @pytest.mark.skipif(
         os.environ.get('DOCKER_HOST', '').startswith('tcp://') or IS_WINDOWS_PLATFORM,
         reason='Requires a Unix socket'
@@ -206,7 +215,7 @@ class FromEnvTest(unittest.TestCase):
         mock_obj.assert_called_once_with(base_url,
                                          "/var/run/docker.sock",
                                          60,
-                                         maxsize=DEFAULT_MAX_POOL_SIZE
+                                         maxsize=DEFAULT_MAX_WORKERS
                                          )
 
     @pytest.mark.skipif(
@@ -220,7 +229,7 @@ class FromEnvTest(unittest.TestCase):
 
         mock_obj.assert_called_once_with("//./pipe/docker_engine",
                                          60,
-                                         maxsize=DEFAULT_MAX_POOL_SIZE
+                                         maxsize=DEFAULT_MAX_WORKERS
                                          )
 
     @pytest.mark.skipif(
@@ -0,0 +1,177 @@
+import base64
+import gzip
+import http.server
+import io
+import json
+import os
+import shutil
+import socketserver
+import tarfile
+import tempfile
+import threading
+import unittest
+
+import docker
+from docker.constants import DEFAULT_DOCKER_API_VERSION
+from docker.utils.transfer import EXTRACT_INLINE_SIZE
+
+ARCHIVE = os.urandom(300000)
+STAT = {'name': 'sh', 'size': len(ARCHIVE), 'mode': 493}
+
+
+def make_tar(members):
+    """
+    Build a tar archive from ``(name, type, data or link name, mode)``
+    tuples.
+    """
+    f = io.BytesIO()
+    with tarfile.open(fileobj=f, mode='w') as tar:
+        for name, type, data, mode in members:
+            info = tarfile.TarInfo(name)
+            info.type = type
+            info.mode = mode
+            info.mtime = 1500000000
+            if type == tarfile.REGTYPE:
+                info.size = len(data)
+                tar.addfile(info, io.BytesIO(data))
+            else:
+                if type in (tarfile.SYMTYPE, tarfile.LNKTYPE):
+                    info.linkname = data
+                tar.addfile(info)
+    return f.getvalue()
+
+
+BIG = os.urandom(EXTRACT_INLINE_SIZE + 12345)
+TREE = make_tar([
+    ('etc', tarfile.DIRTYPE, None, 0o555),
+    ('etc/small', tarfile.REGTYPE, b'small', 0o640),
+    ('etc/big', tarfile.REGTYPE, BIG, 0o755),
+    ('etc/sub', tarfile.DIRTYPE, None, 0o755),
+    ('etc/sub/empty', tarfile.REGTYPE, b'', 0o644),
+    ('etc/link', tarfile.SYMTYPE, 'small', 0o777),
+    ('etc/hard', tarfile.LNKTYPE, 'etc/small', 0o640),
+    ('etc/fifo', tarfile.FIFOTYPE, None, 0o644),
+])
+
+
+class ArchiveHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def send_json(self, data, status=200):
+        data = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def read_chunked(self):
+        body = bytearray()
+        while True:
+            size = int(self.rfile.readline().split(b';')[0], 16)
+            body += self.rfile.read(size)
+            self.rfile.readline()
+            if not size:
+                return bytes(body)
+
+    def do_GET(self):
+        if self.path.endswith('/json'):
+            self.send_json({'Id': 'sha256:loaded', 'RepoTags': []})
+            return
+        if '/containers/gone/' in self.path:
+            data = b'{"message": "No such container: gone"}'
+            self.send_response(404)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+            return
+
+        body = TREE if '/containers/tree/' in self.path else ARCHIVE
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/x-tar')
+        if '/containers/sized/' in self.path:
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        self.send_header('Transfer-Encoding', 'chunked')
+        if '/containers/truncated/' in self.path:
+            self.end_headers()
+            self.wfile.write(b'10\r\n' + body[:8])
+            self.close_connection = True
+            return
+        if '/archive' in self.path:
+            self.send_header(
+                'X-Docker-Container-Path-Stat',
+                base64.b64encode(json.dumps(STAT).encode()).decode()
+            )
+            if 'gzip' in self.headers.get('Accept-Encoding', ''):
+                body = gzip.compress(body)
+                self.send_header('Content-Encoding', 'gzip')
+        self.end_headers()
+        # Chunks of uneven sizes, as a daemon would send them
+        for start in range(0, len(body), 32771):
+            chunk = body[start:start + 32771]
+            self.wfile.write(b'%x\r\n%s\r\n' % (len(chunk), chunk))
+        if '/containers/trailers/' in self.path:
+            self.wfile.write(b'0;ext=1\r\nX-Trailer: 1\r\n\r\n')
+        else:
+            self.wfile.write(b'0\r\n\r\n')
+
+    def do_PUT(self):
+        # Keep the chunked request body
+        assert self.headers['Transfer-Encoding'] == 'chunked'
+        self.server.uploaded = self.read_chunked()
+        self.send_response(200)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def do_POST(self):
+        assert self.path.split('?')[0].endswith('/images/load')
+        assert self.headers['Transfer-Encoding'] == 'chunked'
+        self.server.uploaded = self.read_chunked()
+        self.send_json({'stream': 'Loaded image ID: sha256:loaded\n'})
+
+
+class ArchiveServerTestCase(unittest.TestCase):
+    """
+    Runs an :py:class:`ArchiveHandler` server on a UNIX socket, at
+    ``self.base_url``, with an :py:class:`~docker.api.client.APIClient` for
+    it as ``self.client``.
+    """
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir)
+        self.server, self.base_url = self.start_server('docker.sock')
+        self.client = docker.APIClient(
+            base_url=self.base_url, version=DEFAULT_DOCKER_API_VERSION
+        )
+        self.addCleanup(self.client.close)
+
+    def start_server(self, name):
+        path = os.path.join(self.tmpdir, name)
+        server = socketserver.ThreadingUnixStreamServer(path, ArchiveHandler)
+        server.daemon_threads = True
+        server.connections = 0
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        threading.Thread(
+            target=server.serve_forever, args=(0.01,), daemon=True
+        ).start()
+        return server, f'unix://{path}'
+
+    def make_client(self, base_url=None):
+        client = docker.DockerClient(
+            base_url=base_url or self.base_url,
+            version=DEFAULT_DOCKER_API_VERSION
+        )
+        self.addCleanup(client.close)
+        return client
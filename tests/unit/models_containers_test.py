@@ -1,3 +1,10 @@
+import io
+import os
+import shutil
+import socket
+import tarfile
+import tempfile
+import time
 import unittest
 
 import pytest
@@ -10,6 +17,7 @@ from docker.types import EndpointConfig
 
 from .fake_api import FAKE_CONTAINER_ID, FAKE_EXEC_ID, FAKE_IMAGE_ID
 from .fake_api_client import make_fake_client
+from .fake_archive_server import ARCHIVE, BIG, STAT, ArchiveServerTestCase
 
 
 class ContainerCollectionTest(unittest.TestCase):
@@ -30,7 +38,7 @@ class ContainerCollectionTest(unittest.TestCase):
         client.api.wait.assert_called_with(FAKE_CONTAINER_ID)
         client.api.logs.assert_called_with(
             FAKE_CONTAINER_ID, stderr=False, stdout=True, stream=True,
-            follow=True
+            follow=True, tty=False
         )
 
     def test_create_container_args(self):
@@ -638,6 +646,180 @@ class ContainerCollectionTest(unittest.TestCase):
 
         assert client.containers.list(all=True, ignore_removed=True) == []
 
+    def test_list_max_workers(self):
+        client = make_fake_client({
+            'containers.return_value': [
+                {'Id': str(i)} for i in range(20)
+            ],
+            'inspect_container.side_effect': lambda i: {'Id': i},
+        })
+        containers = client.containers.list(max_workers=4)
+        assert [c.id for c in containers] == [str(i) for i in range(20)]
+        assert client.api.inspect_container.call_count == 20
+
+    def test_max_workers_is_bounded_by_the_shared_pool(self):
+        client = make_fake_client()
+        for max_workers in (0, 33):
+            with pytest.raises(docker.errors.InvalidArgument):
+                client.containers.list(max_workers=max_workers)
+            with pytest.raises(docker.errors.InvalidArgument):
+                client.containers.exec_run_many(
+                    'hostname', max_workers=max_workers
+                )
+            with pytest.raises(docker.errors.InvalidArgument):
+                client.containers.put_archive_many(
+                    '/', data=b'', max_workers=max_workers
+                )
+        assert not client.api.containers.called
+        assert client.containers.list(max_workers=32) is not None
+
+    def test_exec_run_many(self):
+        client = make_fake_client({
+            'containers.return_value': [
+                {'Id': str(i)} for i in range(10)
+            ],
+            'exec_create.side_effect': lambda c, *args, **kwargs: {'Id': c},
+            'exec_start.side_effect': lambda i, **kwargs: (i.encode(), None),
+            'exec_inspect.side_effect': lambda i, **kwargs: {
+                'ExitCode': int(i)
+            },
+        })
+        results = list(client.containers.exec_run_many(
+            'hostname', filters={'label': 'app=web'}, max_workers=4,
+            timeout=10
+        ))
+        client.api.containers.assert_called_with(
+            filters={'label': 'app=web'}
+        )
+        assert sorted(
+            (r.container.id, r.exit_code, r.output, r.error) for r in results
+        ) == [
+            (str(i), i, (str(i).encode(), None), None) for i in range(10)
+        ]
+        _, kwargs = client.api.exec_start.call_args
+        assert kwargs['demux'] is True
+        # Every request gets what is left of the timeout
+        for method in ('exec_create', 'exec_start', 'exec_inspect'):
+            _, kwargs = getattr(client.api, method).call_args
+            assert 0 < kwargs['timeout'] <= 10
+
+    def test_exec_run_many_without_timeout(self):
+        client = make_fake_client({'containers.return_value': [{'Id': 'a'}]})
+        list(client.containers.exec_run_many('hostname'))
+        _, kwargs = client.api.exec_create.call_args
+        assert kwargs['timeout'] is None
+        _, kwargs = client.api.exec_inspect.call_args
+        assert kwargs['timeout'] is None
+
+    def test_exec_run_many_failures(self):
+        def exec_create(container_id, *args, **kwargs):
+            if container_id == 'gone':
+                raise docker.errors.NotFound('No such container')
+            return {'Id': FAKE_EXEC_ID}
+
+        def exec_start(exec_id, **kwargs):
+            raise socket.timeout('Timed out reading the stream')
+
+        client = make_fake_client({
+            'exec_create.side_effect': exec_create,
+            'exec_start.side_effect': exec_start,
+        })
+        container = client.containers.get(FAKE_CONTAINER_ID)
+        results = client.containers.exec_run_many(
+            'sleep 60', containers=['gone', container], timeout=1
+        )
+        errors = {r.container.id: r for r in results}
+        assert isinstance(errors['gone'].error, docker.errors.NotFound)
+        assert errors['gone'].container.attrs == {'Id': 'gone'}
+        timed_out = errors[FAKE_CONTAINER_ID]
+        assert timed_out.container is container
+        assert isinstance(timed_out.error, socket.timeout)
+        assert timed_out.exit_code is None
+        assert timed_out.output is None
+        client.api.exec_inspect.assert_not_called()
+
+    def test_exec_run_many_timeout_covers_exec_create(self):
+        def exec_create(container_id, *args, **kwargs):
+            time.sleep(0.05)
+            return {'Id': FAKE_EXEC_ID}
+
+        client = make_fake_client({'exec_create.side_effect': exec_create})
+        result, = client.containers.exec_run_many(
+            'hostname', containers=[FAKE_CONTAINER_ID], timeout=0.01
+        )
+        assert isinstance(result.error, socket.timeout)
+        client.api.exec_start.assert_not_called()
+
+    def make_put_client(self):
+        uploads = {}
+
+        def put_archive(container_id, path, data):
+            if container_id == 'gone':
+                raise docker.errors.NotFound('No such container')
+            uploads[container_id] = (path, bytes(data))
+            return True
+
+        client = make_fake_client({'put_archive.side_effect': put_archive})
+        return client, uploads
+
+    def test_put_archive_many(self):
+        client, uploads = self.make_put_client()
+        results = client.containers.put_archive_many(
+            '/etc', b'archive', containers=['a', 'b', 'gone']
+        )
+        errors = {r.container.id: r.error for r in results}
+        assert errors['a'] is None
+        assert errors['b'] is None
+        assert isinstance(errors['gone'], docker.errors.NotFound)
+        assert uploads == {'a': ('/etc', b'archive'), 'b': ('/etc', b'archive')}
+
+    def test_put_archive_many_from_directory(self):
+        client, uploads = self.make_put_client()
+        src = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, src)
+        for name in ('app.conf', 'debug.log'):
+            with open(os.path.join(src, name), 'w') as f:
+                f.write(name)
+
+        results = list(client.containers.put_archive_many(
+            '/etc/app', src=src, exclude=['*.log'], gzip=True,
+            max_workers=1
+        ))
+        assert [r.error for r in results] == [None]
+        client.api.containers.assert_called_with(filters=None)
+        path, data = uploads[FAKE_CONTAINER_ID]
+        assert path == '/etc/app'
+        with tarfile.open(fileobj=io.BytesIO(data), mode='r:gz') as tar:
+            assert tar.getnames() == ['app.conf']
+
+    def test_put_archive_many_needs_one_source(self):
+        client, _ = self.make_put_client()
+        with pytest.raises(docker.errors.InvalidArgument):
+            client.containers.put_archive_many('/etc')
+        with pytest.raises(docker.errors.InvalidArgument):
+            client.containers.put_archive_many('/etc', b'', src='.')
+
+    def test_list_max_workers_ignore_removed(self):
+        def side_effect(container_id):
+            if int(container_id) % 2:
+                raise docker.errors.NotFound('Container not found')
+            return {'Id': container_id}
+
+        client = make_fake_client({
+            'containers.return_value': [
+                {'Id': str(i)} for i in range(10)
+            ],
+            'inspect_container.side_effect': side_effect,
+        })
+
+        with pytest.raises(docker.errors.NotFound):
+            client.containers.list(max_workers=4)
+
+        containers = client.containers.list(
+            max_workers=4, ignore_removed=True
+        )
+        assert [c.id for c in containers] == ['0', '2', '4', '6', '8']
+
 
 class ContainerTest(unittest.TestCase):
     def test_short_id(self):
@@ -659,7 +841,9 @@ class ContainerTest(unittest.TestCase):
         client = make_fake_client()
         container = client.containers.get(FAKE_CONTAINER_ID)
         container.attach(stream=True)
-        client.api.attach.assert_called_with(FAKE_CONTAINER_ID, stream=True)
+        client.api.attach.assert_called_with(
+            FAKE_CONTAINER_ID, stream=True, tty=False
+        )
 
     def test_commit(self):
         client = make_fake_client()
@@ -705,6 +889,18 @@ class ContainerTest(unittest.TestCase):
             demux=False,
         )
 
+    def test_exec_run_preconnect(self):
+        client = make_fake_client()
+        container = client.containers.get(FAKE_CONTAINER_ID)
+        container.exec_run('true', preconnect=True)
+        _, kwargs = client.api.exec_start.call_args
+        assert kwargs['preconnect'] is True
+
+        # Nothing follows a streamed command
+        container.exec_run('true', stream=True, preconnect=True)
+        _, kwargs = client.api.exec_start.call_args
+        assert 'preconnect' not in kwargs
+
     def test_export(self):
         client = make_fake_client()
         container = client.containers.get(FAKE_CONTAINER_ID)
@@ -713,6 +909,14 @@ class ContainerTest(unittest.TestCase):
             FAKE_CONTAINER_ID, DEFAULT_DATA_CHUNK_SIZE
         )
 
+    def test_export_to(self):
+        client = make_fake_client()
+        container = client.containers.get(FAKE_CONTAINER_ID)
+        container.export_to('/tmp/export.tar')
+        client.api.export_to.assert_called_with(
+            FAKE_CONTAINER_ID, '/tmp/export.tar'
+        )
+
     def test_get_archive(self):
         client = make_fake_client()
         container = client.containers.get(FAKE_CONTAINER_ID)
@@ -721,6 +925,14 @@ class ContainerTest(unittest.TestCase):
             FAKE_CONTAINER_ID, 'foo', DEFAULT_DATA_CHUNK_SIZE, False
         )
 
+    def test_get_archive_to(self):
+        client = make_fake_client()
+        container = client.containers.get(FAKE_CONTAINER_ID)
+        container.get_archive_to('foo', '/tmp/foo.tar')
+        client.api.get_archive_to.assert_called_with(
+            FAKE_CONTAINER_ID, 'foo', '/tmp/foo.tar', encode_stream=False
+        )
+
     def test_image(self):
         client = make_fake_client()
         container = client.containers.get(FAKE_CONTAINER_ID)
@@ -741,6 +953,20 @@ class ContainerTest(unittest.TestCase):
         client = make_fake_client()
         container = client.containers.get(FAKE_CONTAINER_ID)
         container.logs()
+        client.api.logs.assert_called_with(FAKE_CONTAINER_ID, tty=False)
+
+    def test_logs_tty_from_attrs(self):
+        client = make_fake_client()
+        container = client.containers.prepare_model({
+            'Id': FAKE_CONTAINER_ID, 'Config': {'Tty': True}
+        })
+        container.logs()
+        client.api.logs.assert_called_with(FAKE_CONTAINER_ID, tty=True)
+        container.attach(tty=False)
+        client.api.attach.assert_called_with(FAKE_CONTAINER_ID, tty=False)
+        # Looked up by the API client when not known
+        container = client.containers.prepare_model({'Id': FAKE_CONTAINER_ID})
+        container.logs()
         client.api.logs.assert_called_with(FAKE_CONTAINER_ID)
 
     def test_pause(self):
@@ -822,3 +1048,66 @@ class ContainerTest(unittest.TestCase):
         container = client.containers.get(FAKE_CONTAINER_ID)
         container.wait()
         client.api.wait.assert_called_with(FAKE_CONTAINER_ID)
+
+
+class ContainerGetPathTest(ArchiveServerTestCase):
+    def test_get_path(self):
+        client = self.make_client()
+        container = client.containers.prepare_model({'Id': 'tree'})
+        dest = os.path.join(self.tmpdir, 'out')
+        os.mkdir(dest)
+
+        assert container.get_path('/etc', dest) == STAT
+        assert sorted(os.listdir(os.path.join(dest, 'etc'))) == [
+            'big', 'hard', 'link', 'small', 'sub'
+        ]
+        # A new name for the copy
+        container.get_path('/etc', os.path.join(dest, 'conf'))
+        with open(os.path.join(dest, 'conf', 'big'), 'rb') as f:
+            assert f.read() == BIG
+
+        with pytest.raises(FileNotFoundError):
+            container.get_path('/etc', os.path.join(dest, 'no', 'conf'))
+
+
+class ContainerPutPathTest(ArchiveServerTestCase):
+    def test_put_path(self):
+        client = self.make_client()
+        container = client.containers.prepare_model({'Id': 'a'})
+        src = os.path.join(self.tmpdir, 'src')
+        os.makedirs(os.path.join(src, 'sub'))
+        os.makedirs(os.path.join(src, 'cache'))
+        for name, data in [('file', b'data'), ('sub/big', ARCHIVE),
+                           ('sub/skip.log', b''), ('cache/x', b'')]:
+            with open(os.path.join(src, name), 'wb') as f:
+                f.write(data)
+
+        for compress in (False, True):
+            assert container.put_path(
+                src, '/dest', exclude=['cache', '**/*.log'], gzip=compress
+            )
+            mode = 'r:gz' if compress else 'r'
+            with tarfile.open(fileobj=io.BytesIO(self.server.uploaded),
+                              mode=mode) as tar:
+                assert sorted(tar.getnames()) == ['file', 'sub', 'sub/big']
+                assert tar.extractfile('sub/big').read() == ARCHIVE
+
+        with pytest.raises(NotADirectoryError):
+            container.put_path(os.path.join(src, 'file'), '/dest')
+
+
+class ContainerCopyToTest(ArchiveServerTestCase):
+    def test_copy_to(self):
+        source = self.make_client().containers.prepare_model({'Id': 'a'})
+        # On another host
+        server, base_url = self.start_server('other.sock')
+        target = self.make_client(base_url).containers.prepare_model(
+            {'Id': 'b'}
+        )
+        assert source.copy_to('/bin/sh', target, '/bin') == STAT
+        assert server.uploaded == ARCHIVE
+
+        with pytest.raises(docker.errors.NotFound):
+            source.client.containers.prepare_model({'Id': 'gone'}).copy_to(
+                '/bin/sh', target, '/bin'
+            )
@@ -1,11 +1,17 @@
+import gzip
+import os
 import unittest
 import warnings
 
+import pytest
+import requests.exceptions
+
 from docker.constants import DEFAULT_DATA_CHUNK_SIZE
 from docker.models.images import Image
 
 from .fake_api import FAKE_IMAGE_ID
 from .fake_api_client import make_fake_client
+from .fake_archive_server import ARCHIVE, ArchiveServerTestCase
 
 
 class ImageCollectionTest(unittest.TestCase):
@@ -37,6 +43,14 @@ class ImageCollectionTest(unittest.TestCase):
         assert isinstance(images[0], Image)
         assert images[0].id == FAKE_IMAGE_ID
 
+    def test_list_max_workers(self):
+        client = make_fake_client({
+            'images.return_value': [{'Id': str(i)} for i in range(20)],
+            'inspect_image.side_effect': lambda i: {'Id': i},
+        })
+        images = client.images.list(max_workers=4)
+        assert [i.id for i in images] == [str(i) for i in range(20)]
+
     def test_load(self):
         client = make_fake_client()
         client.images.load('byte stream')
@@ -173,3 +187,45 @@ class ImageTest(unittest.TestCase):
         image = client.images.get(FAKE_IMAGE_ID)
         image.tag('foo')
         client.api.tag.assert_called_with(FAKE_IMAGE_ID, 'foo', tag=None)
+
+
+class ImageTransferToTest(ArchiveServerTestCase):
+    def test_transfer_to(self):
+        image = self.make_client().images.prepare_model(
+            {'Id': 'sha256:abc', 'RepoTags': ['app:1']}
+        )
+        server, base_url = self.start_server('other.sock')
+        target = self.make_client(base_url)
+        progress = []
+
+        images = image.transfer_to(target, progress=progress.append)
+        assert [i.id for i in images] == ['sha256:loaded']
+        assert server.uploaded == ARCHIVE
+        assert progress[-1].transferred == len(ARCHIVE)
+        assert progress[-1].rate > 0
+        assert [p.transferred for p in progress] == sorted(
+            p.transferred for p in progress
+        )
+
+        image.transfer_to(target, named='app:1', gzip=True)
+        assert gzip.decompress(server.uploaded) == ARCHIVE
+
+    def test_unreachable_target(self):
+        client = self.make_client()
+        image = client.images.prepare_model({'Id': 'sha256:abc'})
+        target = self.make_client(
+            f'unix://{os.path.join(self.tmpdir, "missing.sock")}'
+        )
+        responses = []
+
+        def get_image_response(*args):
+            res = get_image_response.original(*args)
+            responses.append(res)
+            return res
+        get_image_response.original = client.api._get_image_response
+        client.api._get_image_response = get_image_response
+
+        with pytest.raises(requests.exceptions.ConnectionError):
+            image.transfer_to(target)
+        # The source response is closed although nothing was read from it
+        assert responses[0].raw.closed
@@ -0,0 +1,410 @@
+import http.server
+import io
+import json
+import os
+import shutil
+import socketserver
+import struct
+import tempfile
+import threading
+import unittest
+import urllib.parse
+from unittest import mock
+
+import pytest
+
+import docker
+from docker.constants import DEFAULT_DOCKER_API_VERSION
+from docker.models import logs
+from docker.models.logs import (
+    LogFollower,
+    LogRecord,
+    _ChunkDecoder,
+    _since,
+    _timestamps,
+    read_columns,
+)
+from docker.utils.socket import STDERR, STDOUT
+
+
+def _frame(stream, data):
+    return struct.pack('>BxxxL', stream, len(data)) + data
+
+
+class FakeContainer:
+    def __init__(self, container_id, connections, tty=False,
+                 encoding='chunked'):
+        self.id = container_id
+        self.tty = tty
+        # How the body is delimited: 'chunked', 'length' (Content-Length) or
+        # 'close' (the end of the connection)
+        self.encoding = encoding
+        self.running = True
+        # For each connection: the messages, as (stream, timestamp, data),
+        # and whether it ends cleanly ('end'), is cut off ('drop') or hangs
+        # ('hang')
+        self.connections = list(connections)
+        self.requests = []
+
+
+class LogsHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        url = urllib.parse.urlsplit(self.path)
+        parts = url.path.split('/')
+        container = self.server.containers.get(parts[3])
+        if container is None:
+            return self._send_json(404, {'message': 'No such container'})
+        if parts[4] == 'json':
+            return self._send_json(200, {
+                'Id': container.id,
+                'State': {'Running': container.running},
+                'Config': {'Tty': container.tty},
+            })
+
+        container.requests.append(urllib.parse.parse_qs(url.query))
+        messages, ending = container.connections.pop(0)
+        body = []
+        for stream, timestamp, data in messages:
+            message = timestamp.encode() + b' ' + data
+            if not container.tty:
+                message = _frame(stream, message)
+            body.append(message)
+        self.send_response(200)
+        if container.encoding != 'chunked':
+            if container.encoding == 'length':
+                length = sum(map(len, body))
+                self.send_header('Content-Length', str(length))
+                if ending == 'drop':
+                    body[-1] = body[-1][:-1]
+            self.end_headers()
+            self.wfile.write(b''.join(body))
+            if not container.connections:
+                container.running = False
+            self.close_connection = True
+            return
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        for message in body:
+            self.wfile.write(b'%x\r\n%s\r\n' % (len(message), message))
+            self.wfile.flush()
+        if not container.connections:
+            container.running = False
+        if ending == 'end':
+            self.wfile.write(b'0\r\n\r\n')
+        elif ending == 'hang':
+            self.server.release.wait(5)
+        self.close_connection = True
+
+    def _send_json(self, status, body):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class FakeDaemon(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path, containers):
+        self.containers = {c.id: c for c in containers}
+        self.release = threading.Event()
+        super().__init__(path, LogsHandler)
+
+
+class DaemonTestCase(unittest.TestCase):
+    def start_daemon(self, *containers):
+        tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmpdir)
+        path = os.path.join(tmpdir, 'docker.sock')
+        server = FakeDaemon(path, containers)
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        self.addCleanup(server.release.set)
+        threading.Thread(
+            target=server.serve_forever, args=(0.01,), daemon=True
+        ).start()
+        client = docker.DockerClient(
+            base_url=f'unix://{path}', version=DEFAULT_DOCKER_API_VERSION
+        )
+        self.addCleanup(client.close)
+        return server, client
+
+
+class LogFollowerTest(DaemonTestCase):
+    def test_lines_are_reassembled(self):
+        ts = '2024-01-01T00:00:0{}.000000000Z'.format
+        a = FakeContainer('a', [([
+            (STDOUT, ts(1), b'one\ntw'),
+            (STDERR, ts(2), b'err\n'),
+            (STDOUT, ts(3), b'o\nthree'),
+            (STDOUT, ts(4), b' and more\n'),
+        ], 'end')])
+        b = FakeContainer('b', [([
+            (STDOUT, ts(5), b'tty line\r\n'),
+            (STDOUT, ts(6), b'unterminated'),
+        ], 'end')], tty=True)
+        _, client = self.start_daemon(a, b)
+
+        records = list(LogFollower(client, ['a', 'b'], reconnect_delay=0))
+        assert [r for r in records if r.container_id == 'a'] == [
+            LogRecord('a', STDOUT, ts(1), b'one'),
+            LogRecord('a', STDERR, ts(2), b'err'),
+            LogRecord('a', STDOUT, ts(1), b'two'),
+            LogRecord('a', STDOUT, ts(3), b'three and more'),
+        ]
+        assert [r for r in records if r.container_id == 'b'] == [
+            LogRecord('b', STDOUT, ts(5), b'tty line'),
+            LogRecord('b', STDOUT, ts(6), b'unterminated'),
+        ]
+        assert a.requests[0]['timestamps'] == ['1']
+        assert a.requests[0]['follow'] == ['1']
+
+    def test_resumes_after_disconnect(self):
+        ts = '2024-01-01T00:00:00.00000000{}Z'.format
+        a = FakeContainer('a', [
+            ([
+                (STDOUT, ts(1), b'first\n'),
+                (STDOUT, ts(2), b'second\n'),
+                (STDERR, ts(2), b'also second\n'),
+            ], 'drop'),
+            ([
+                (STDOUT, ts(2), b'second\n'),
+                (STDERR, ts(2), b'also second\n'),
+                (STDOUT, ts(3), b'third\n'),
+            ], 'end'),
+        ])
+        _, client = self.start_daemon(a)
+
+        records = list(LogFollower(client, ['a'], reconnect_delay=0))
+        assert [(r.stream, r.line) for r in records] == [
+            (STDOUT, b'first'),
+            (STDOUT, b'second'),
+            (STDERR, b'also second'),
+            (STDOUT, b'third'),
+        ]
+        assert len(a.requests) == 2
+        assert a.requests[1]['since'] == ['1704067200.000000002']
+
+    def test_non_chunked_bodies(self):
+        ts = '2024-01-01T00:00:00.00000000{}Z'.format
+        a = FakeContainer('a', [
+            ([(STDOUT, ts(1), b'first\n'), (STDOUT, ts(2), b'second\n')],
+             'drop'),
+            ([(STDOUT, ts(2), b'second\n')], 'end'),
+        ], encoding='length')
+        b = FakeContainer('b', [
+            ([(STDOUT, ts(3), b'tty line\n')], 'end'),
+        ], tty=True, encoding='close')
+        _, client = self.start_daemon(a, b)
+
+        records = list(LogFollower(client, ['a', 'b'], reconnect_delay=0))
+        assert sorted((r.container_id, r.line) for r in records) == [
+            ('a', b'first'), ('a', b'second'), ('b', b'tty line'),
+        ]
+        # Only the truncated body is read again
+        assert len(a.requests) == 2
+        assert len(b.requests) == 1
+
+    def test_close_from_another_thread(self):
+        a = FakeContainer('a', [([
+            (STDOUT, '2024-01-01T00:00:00.000000000Z', b'hello\n'),
+        ], 'hang')])
+        _, client = self.start_daemon(a)
+
+        follower = LogFollower(client, ['a'])
+        records = iter(follower)
+        assert next(records).line == b'hello'
+        threading.Timer(0.05, follower.close).start()
+        assert list(records) == []
+
+    def test_follow_logs(self):
+        a = FakeContainer('a', [([
+            (STDOUT, '2024-01-01T00:00:00.000000000Z', b'hello\n'),
+        ], 'end')])
+        _, client = self.start_daemon(a)
+
+        records = client.containers.follow_logs(
+            containers=['a'], stderr=False
+        )
+        assert [r.line for r in records] == [b'hello']
+        assert a.requests[0]['stderr'] == ['0']
+
+    def test_since(self):
+        assert _since('2024-01-01T00:00:01.5Z') == '1704067201.500000000'
+        assert _since('2024-01-01T02:00:01.000000007+02:00') == \
+            '1704067201.000000007'
+
+    def test_chunk_decoder(self):
+        body = b'5\r\nhello\r\n7;ext=1\r\n, world\r\n0\r\n\r\n'
+        decoder = _ChunkDecoder()
+        out = b''.join(decoder.feed(body[i:i + 1]) for i in range(len(body)))
+        assert out == b'hello, world'
+        assert decoder.done
+
+
+class LogsOutputTest(DaemonTestCase):
+    def test_logs_output(self):
+        ts = '2024-01-01T00:00:00.000000000Z'
+        a = FakeContainer('a', [([
+            (STDOUT, ts, b'out\n' * 10000),
+            (STDERR, ts, b'err\n'),
+        ], 'end')])
+        _, client = self.start_daemon(a)
+
+        stdout, stderr = io.BytesIO(), io.BytesIO()
+        written = client.containers.get('a').logs(
+            timestamps=True, output=(stdout, stderr)
+        )
+        assert written == (len(ts) + 1 + 40000, len(ts) + 5)
+        assert stdout.getvalue() == ts.encode() + b' ' + b'out\n' * 10000
+        assert stderr.getvalue() == ts.encode() + b' err\n'
+
+
+class LogColumnsTests:
+    # The numpy module to use, or None for the pure Python arrays
+    numpy = None
+
+    def setUp(self):
+        patcher = mock.patch.object(logs, 'numpy', self.numpy)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def nanoseconds(self, timestamps):
+        if self.numpy is not None:
+            assert timestamps.dtype == self.numpy.dtype('datetime64[ns]')
+            timestamps = timestamps.view('int64')
+        return [int(t) for t in timestamps]
+
+    def read(self, messages, tty=False, **kwargs):
+        a = FakeContainer('a', [(messages, 'end')], tty=tty)
+        _, client = self.start_daemon(a)
+        columns = client.containers.get('a').logs_columnar(**kwargs)
+        return a, columns
+
+    def test_columns(self):
+        ts = '2024-01-01T00:00:0{}.00000000{}Z'.format
+        a, columns = self.read([
+            (STDOUT, ts(1, 1), b'one\n'),
+            (STDERR, ts(1, 2), b'err\nmore err\n'),
+            (STDOUT, ts(2, 3), b'tw'),
+            (STDOUT, ts(3, 4), b'o\n'),
+            (STDOUT, ts(4, 5), b'\n'),
+        ], until=1704067300)
+
+        assert len(columns) == 5
+        assert columns.data == b'oneerrmore errtwo'
+        assert list(columns.offsets) == [0, 3, 6, 14, 17, 17]
+        assert list(columns.streams) == [
+            STDOUT, STDERR, STDERR, STDOUT, STDOUT
+        ]
+        second = 1704067200 * 10 ** 9
+        assert self.nanoseconds(columns.timestamps) == [
+            second + 10 ** 9 + 1, second + 10 ** 9 + 2,
+            second + 10 ** 9 + 2, second + 2 * 10 ** 9 + 3,
+            second + 4 * 10 ** 9 + 5,
+        ]
+        stream, _, line = columns[3]
+        assert (stream, line) == (STDOUT, b'two')
+        assert [line for _, _, line in columns] == [
+            b'one', b'err', b'more err', b'two', b''
+        ]
+        assert a.requests[0]['timestamps'] == ['1']
+        assert a.requests[0]['follow'] == ['0']
+        assert a.requests[0]['until'] == ['1704067300']
+
+    def test_tty(self):
+        ts = '2024-01-01T00:00:00.000000000Z'
+        _, columns = self.read([
+            (STDOUT, ts, b'line\r\n'),
+            (STDOUT, ts, b'unterminated'),
+        ], tty=True)
+        assert [line for _, _, line in columns] == [b'line', b'unterminated']
+
+    def test_timestamps_with_offset(self):
+        _, columns = self.read([
+            (STDOUT, '2024-01-01T02:00:00.5+02:00', b'one\n'),
+            (STDOUT, '2024-01-01T00:00:01.000000000Z', b'two\n'),
+        ])
+        assert self.nanoseconds(columns.timestamps) == [
+            1704067200500000000, 1704067201000000000
+        ]
+
+    def test_slice_and_take(self):
+        ts = '2024-01-01T00:00:00.00000000{}Z'.format
+        _, columns = self.read([
+            (STDOUT if i % 2 else STDERR, ts(i), b'line %d\n' % i)
+            for i in range(6)
+        ] + [(STDOUT, ts(6), b'\n')])
+
+        part = columns[2:5]
+        assert [line for _, _, line in part] == [
+            b'line 2', b'line 3', b'line 4'
+        ]
+        assert list(part.offsets) == [0, 6, 12, 18]
+        assert [line for _, _, line in columns[::3]] == [
+            b'line 0', b'line 3', b''
+        ]
+        assert columns[-1][2] == b''
+        with pytest.raises(IndexError):
+            columns[7]
+
+        if self.numpy is not None:
+            mask = columns.streams == STDOUT
+        else:
+            mask = [stream == STDOUT for stream in columns.streams]
+        stdout = columns.take(mask)
+        assert stdout.data == b'line 1line 3line 5'
+        assert [line for _, _, line in stdout] == [
+            b'line 1', b'line 3', b'line 5', b''
+        ]
+        assert self.nanoseconds(stdout.timestamps) == [
+            1704067200000000001, 1704067200000000003,
+            1704067200000000005, 1704067200000000006,
+        ]
+        assert [line for _, _, line in columns.take([4, 1, 1])] == [
+            b'line 4', b'line 1', b'line 1'
+        ]
+        assert len(columns.take([])) == 0
+
+
+class PurePythonLogColumnsTest(LogColumnsTests, DaemonTestCase):
+    pass
+
+
+@pytest.mark.skipif(logs.numpy is None, reason='numpy is not installed')
+class NumpyLogColumnsTest(LogColumnsTests, DaemonTestCase):
+    numpy = logs.numpy
+
+
+def test_timestamps():
+    assert list(_timestamps([
+        b'2024-01-01T00:00:00.000000001Z',
+        b'2024-01-01T00:00:00.999999999Z',
+        b'2024-01-01T00:00:01.5Z',
+    ])) == [
+        1704067200000000001, 1704067200999999999, 1704067201500000000
+    ]
+
+
+def test_parameters_are_validated_like_logs():
+    client = docker.DockerClient(
+        base_url='unix:///nonexistent/docker.sock', version='1.30'
+    )
+    readers = [
+        lambda **kwargs: client.api.logs('a', **kwargs),
+        lambda **kwargs: read_columns(client.api, 'a', **kwargs),
+        lambda **kwargs: LogFollower(client, ['a'], **kwargs),
+    ]
+    for read in readers:
+        with pytest.raises(docker.errors.InvalidArgument):
+            read(since='yesterday')
+    for read in readers[:2]:
+        with pytest.raises(docker.errors.InvalidVersion):
+            read(until=1)
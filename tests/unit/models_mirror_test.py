@@ -0,0 +1,234 @@
+import queue
+import time
+import unittest
+from unittest import mock
+
+from docker.errors import NotFound
+from docker.models.mirror import StateMirror
+
+from .fake_api import (
+    FAKE_CONTAINER_ID,
+    FAKE_IMAGE_ID,
+    FAKE_NETWORK_ID,
+    get_fake_volume,
+    get_fake_volume_list,
+)
+from .fake_api_client import make_fake_client
+
+
+class FakeEvents:
+    def __init__(self):
+        self.queue = queue.Queue()
+
+    def __iter__(self):
+        while True:
+            event = self.queue.get()
+            self.queue.task_done()
+            if event is None:
+                return
+            yield event
+
+    def close(self):
+        self.queue.put(None)
+
+
+def wait_for(condition):
+    for _ in range(500):
+        if condition():
+            return
+        time.sleep(0.01)
+    raise AssertionError('Timed out')
+
+
+def make_mirrored_client(**kwargs):
+    events = FakeEvents()
+    client = make_fake_client({
+        'events.return_value': events,
+        'volumes.return_value': get_fake_volume_list()[1],
+        'inspect_volume.return_value': get_fake_volume()[1],
+    })
+    mirror = client.start_mirror(**kwargs)
+    client.api.reset_mock()
+    return client, mirror, events
+
+
+class StateMirrorTest(unittest.TestCase):
+    def test_start_loads_every_resource(self):
+        client, mirror, _ = make_mirrored_client()
+        try:
+            assert client._mirror is mirror
+            assert mirror.is_fresh
+            container = client.containers.get(FAKE_CONTAINER_ID)
+            assert container.id == FAKE_CONTAINER_ID
+            assert client.images.get(FAKE_IMAGE_ID).id == FAKE_IMAGE_ID
+            assert client.networks.get(FAKE_NETWORK_ID).id == FAKE_NETWORK_ID
+            assert client.volumes.get('perfectcherryblossom').id == \
+                'perfectcherryblossom'
+            assert [c.id for c in client.containers.list()] == \
+                [FAKE_CONTAINER_ID]
+            assert len(client.images.list()) == 1
+            assert len(client.networks.list()) == 1
+            assert len(client.volumes.list()) == 1
+            assert not client.api.inspect_container.called
+            assert not client.api.containers.called
+            assert not client.api.images.called
+            assert not client.api.volumes.called
+        finally:
+            mirror.stop()
+        assert client._mirror is None
+
+    def test_subscribes_before_loading(self):
+        events = FakeEvents()
+        client = make_fake_client({'events.return_value': events})
+        mirror = StateMirror(client, resources=['containers'])
+        mirror.start()
+        mirror.stop()
+        calls = [c[0] for c in client.api.method_calls]
+        assert calls.index('events') < calls.index('containers')
+        assert client.api.events.call_args[1]['filters'] == {
+            'type': ['container']
+        }
+
+    def test_get_by_name_and_short_id(self):
+        client, mirror, _ = make_mirrored_client(resources=['containers'])
+        try:
+            with mirror._lock:
+                mirror._objects['containers'][FAKE_CONTAINER_ID]['Name'] = \
+                    '/foobar'
+            assert client.containers.get('foobar').id == FAKE_CONTAINER_ID
+            assert client.containers.get(FAKE_CONTAINER_ID[:12]).id == \
+                FAKE_CONTAINER_ID
+            assert not client.api.inspect_container.called
+        finally:
+            mirror.stop()
+
+    def test_get_image_by_tag(self):
+        client, mirror, _ = make_mirrored_client(resources=['images'])
+        try:
+            with mirror._lock:
+                mirror._objects['images'][FAKE_IMAGE_ID]['RepoTags'] = [
+                    'busybox:latest'
+                ]
+            assert client.images.get('busybox').id == FAKE_IMAGE_ID
+            assert client.images.get('busybox:latest').id == FAKE_IMAGE_ID
+            assert not client.api.inspect_image.called
+        finally:
+            mirror.stop()
+
+    def test_unknown_object_falls_back_to_api(self):
+        client, mirror, _ = make_mirrored_client()
+        try:
+            client.containers.get('unknown')
+            client.api.inspect_container.assert_called_once_with('unknown')
+        finally:
+            mirror.stop()
+
+    def test_filtered_list_falls_back_to_api(self):
+        client, mirror, _ = make_mirrored_client()
+        try:
+            client.containers.list(filters={'label': 'foo'})
+            assert client.api.containers.called
+            client.volumes.list(filters={'dangling': True})
+            assert client.api.volumes.called
+        finally:
+            mirror.stop()
+
+    def test_stale_mirror_falls_back_to_api(self):
+        client, mirror, _ = make_mirrored_client(max_staleness=1)
+        try:
+            mirror._behind_since = time.monotonic() - 2
+            assert not mirror.is_fresh
+            client.containers.get(FAKE_CONTAINER_ID)
+            assert client.api.inspect_container.called
+        finally:
+            mirror.stop()
+
+    def test_reload_queries_the_daemon(self):
+        client, mirror, _ = make_mirrored_client(resources=['containers'])
+        try:
+            container = client.containers.get(FAKE_CONTAINER_ID)
+            assert not client.api.inspect_container.called
+            container.reload()
+            client.api.inspect_container.assert_called_once_with(
+                FAKE_CONTAINER_ID
+            )
+            # The collection still answers from the mirror
+            client.containers.get(FAKE_CONTAINER_ID)
+            assert client.api.inspect_container.call_count == 1
+        finally:
+            mirror.stop()
+
+    def test_events_are_followed_from_the_daemon_time(self):
+        events = FakeEvents()
+        events._response = mock.Mock(
+            headers={'Date': 'Mon, 01 Jan 2024 00:00:07 GMT'}
+        )
+        client = make_fake_client({'events.return_value': events})
+        mirror = StateMirror(client, resources=['containers'])
+        mirror.start()
+        mirror.stop()
+        assert mirror._last_event_time == 1704067207
+
+    def test_events_update_the_mirror(self):
+        client, mirror, events = make_mirrored_client()
+        try:
+            client.api.inspect_container.return_value = {
+                'Id': FAKE_CONTAINER_ID,
+                'Name': '/foobar',
+                'State': {'Running': False},
+            }
+            events.queue.put({
+                'Type': 'container', 'Action': 'die',
+                'Actor': {'ID': FAKE_CONTAINER_ID}, 'time': 1,
+            })
+            events.queue.put({
+                'Type': 'container', 'Action': 'exec_start: sh',
+                'Actor': {'ID': FAKE_CONTAINER_ID}, 'time': 2,
+            })
+            wait_for(lambda: mirror._last_event_time == 2)
+            client.api.inspect_container.assert_called_once_with(
+                FAKE_CONTAINER_ID
+            )
+            assert client.containers.list() == []
+            assert len(client.containers.list(all=True)) == 1
+
+            events.queue.put({
+                'Type': 'container', 'Action': 'destroy',
+                'Actor': {'ID': FAKE_CONTAINER_ID}, 'time': 3,
+            })
+            events.queue.put({
+                'Type': 'volume', 'Action': 'destroy',
+                'Actor': {'ID': 'perfectcherryblossom'}, 'time': 4,
+            })
+            wait_for(lambda: mirror._last_event_time == 4)
+            assert client.containers.list(all=True) == []
+            assert client.volumes.list() == []
+        finally:
+            mirror.stop()
+
+    def test_object_gone_when_reinspected(self):
+        client, mirror, _ = make_mirrored_client()
+        try:
+            client.api.inspect_network.side_effect = NotFound('gone')
+            mirror._apply({
+                'Type': 'network', 'Action': 'disconnect',
+                'Actor': {'ID': FAKE_NETWORK_ID},
+            })
+            assert client.networks.list() == []
+        finally:
+            mirror.stop()
+
+    def test_reconnects_with_since(self):
+        client, mirror, events = make_mirrored_client()
+        new_events = FakeEvents()
+        client.api.events.return_value = new_events
+        try:
+            events.queue.put({
+                'Type': 'image', 'Action': 'pull',
+                'Actor': {'ID': FAKE_IMAGE_ID}, 'time': 42,
+            })
+            events.close()
+            wait_for(lambda: client.api.events.called)
+            assert client.api.events.call_args[1]['since'] == 42
+        finally:
+            mirror.stop()
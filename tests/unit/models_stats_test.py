@@ -0,0 +1,172 @@
+import math
+import unittest
+from unittest import mock
+
+import pytest
+
+import docker
+from docker.models import stats
+from docker.models.stats import FIELDS, StatsCollector, _parse
+
+from .fake_api_client import make_fake_client
+
+
+def make_stats(second, cpu, system, memory, rx, read):
+    return {
+        'read': f'2024-01-01T00:00:{second:02d}.000000000Z',
+        'cpu_stats': {
+            'cpu_usage': {'total_usage': cpu},
+            'system_cpu_usage': system,
+            'online_cpus': 2,
+        },
+        'memory_stats': {
+            'usage': memory + 100,
+            'limit': 1000,
+            'stats': {'inactive_file': 100},
+        },
+        'networks': {
+            'eth0': {'rx_bytes': rx, 'tx_bytes': 0},
+            'eth1': {'rx_bytes': rx, 'tx_bytes': 0},
+        },
+        'blkio_stats': {'io_service_bytes_recursive': [
+            {'major': 8, 'minor': 0, 'op': 'Read', 'value': read},
+            {'major': 8, 'minor': 0, 'op': 'Write', 'value': 0},
+        ]},
+    }
+
+
+class FakeStats:
+    def __init__(self):
+        self.round = 0
+
+    def __call__(self, container_id, stream=True, one_shot=None):
+        if container_id == 'gone':
+            raise docker.errors.NotFound('No such container')
+        n = int(container_id) + 1
+        r = self.round
+        return make_stats(
+            second=r, cpu=r * 10 * n, system=r * 100, memory=50 * n,
+            rx=r * 1000 * n, read=r * 500 * n
+        )
+
+
+class StatsCollectorTests:
+    # The numpy module to use, or None for the pure Python buffers
+    numpy = None
+
+    def setUp(self):
+        patcher = mock.patch.object(stats, 'numpy', self.numpy)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def make_collector(self, ids, **kwargs):
+        fake_stats = FakeStats()
+        client = make_fake_client({
+            'containers.return_value': [{'Id': i} for i in ids],
+            'stats.side_effect': fake_stats,
+        })
+        return client, fake_stats, StatsCollector(client, **kwargs)
+
+    def take_samples(self, collector, fake_stats, rounds):
+        for _ in range(rounds):
+            collector.sample()
+            fake_stats.round += 1
+
+    def test_rates(self):
+        client, fake_stats, collector = self.make_collector(['0', '1', '2'])
+        self.take_samples(collector, fake_stats, 3)
+
+        rates = collector.rates()
+        assert rates['id'] == ['0', '1', '2']
+        # 10 * n ns of CPU out of 100 ns, on 2 CPUs
+        assert list(rates['cpu_percent']) == [20.0, 40.0, 60.0]
+        assert list(rates['memory_usage']) == [50.0, 100.0, 150.0]
+        assert list(rates['memory_limit']) == [1000.0] * 3
+        assert list(rates['memory_percent']) == [5.0, 10.0, 15.0]
+        assert list(rates['net_rx_rate']) == [2000.0, 4000.0, 6000.0]
+        assert list(rates['net_tx_rate']) == [0.0] * 3
+        assert list(rates['block_read_rate']) == [500.0, 1000.0, 1500.0]
+        assert list(rates['block_write_rate']) == [0.0] * 3
+        client.api.stats.assert_called_with('2', stream=False, one_shot=True)
+
+    def test_single_sample_has_no_rates(self):
+        _, fake_stats, collector = self.make_collector(['0'])
+        self.take_samples(collector, fake_stats, 1)
+
+        rates = collector.rates()
+        assert math.isnan(rates['cpu_percent'][0])
+        assert math.isnan(rates['net_rx_rate'][0])
+        assert rates['memory_usage'][0] == 50.0
+
+    def test_samples_are_kept_in_a_ring_buffer(self):
+        _, fake_stats, collector = self.make_collector(['0'], history=3)
+        self.take_samples(collector, fake_stats, 5)
+
+        samples = collector.samples('0')
+        assert sorted(samples) == sorted(FIELDS)
+        assert list(samples['cpu_total']) == [20.0, 30.0, 40.0]
+        assert list(samples['time']) == [
+            1704067202.0, 1704067203.0, 1704067204.0
+        ]
+        assert collector.samples('unknown') is None
+
+    def test_containers_gone_are_forgotten(self):
+        client, fake_stats, collector = self.make_collector(['0', '1'])
+        self.take_samples(collector, fake_stats, 2)
+        client.api.containers.return_value = [{'Id': '1'}, {'Id': '2'}]
+        self.take_samples(collector, fake_stats, 2)
+
+        rates = collector.rates()
+        assert sorted(rates['id']) == ['1', '2']
+        assert collector.samples('0') is None
+        # The row of the container gone is reused, from scratch
+        assert len(collector.samples('2')['time']) == 2
+
+    def test_explicit_containers(self):
+        client, fake_stats, collector = self.make_collector(
+            [], containers=['0', 'gone']
+        )
+        assert collector.sample() == 1
+        client.api.containers.assert_not_called()
+        assert collector.rates()['id'] == ['0']
+
+    def test_many_containers(self):
+        ids = [str(i) for i in range(100)]
+        _, fake_stats, collector = self.make_collector(ids)
+        self.take_samples(collector, fake_stats, 2)
+
+        rates = collector.rates()
+        assert len(rates['id']) == 100
+        assert rates['cpu_percent'][99] == 2000.0
+
+
+class PurePythonStatsCollectorTest(StatsCollectorTests, unittest.TestCase):
+    pass
+
+
+@pytest.mark.skipif(stats.numpy is None, reason='numpy is not installed')
+class NumpyStatsCollectorTest(StatsCollectorTests, unittest.TestCase):
+    numpy = stats.numpy
+
+
+def test_parse_cgroup_v1():
+    values = dict(zip(FIELDS, _parse({
+        'read': '2024-01-01T00:00:00.5Z',
+        'cpu_stats': {
+            'cpu_usage': {'total_usage': 10, 'percpu_usage': [5, 5, 0, 0]},
+            'system_cpu_usage': 100,
+        },
+        'memory_stats': {
+            'usage': 300, 'limit': 1000,
+            'stats': {'total_inactive_file': 100, 'inactive_file': 50},
+        },
+    })))
+    assert values['time'] == 1704067200.5
+    assert values['online_cpus'] == 4
+    assert values['memory_usage'] == 200
+    assert values['net_rx'] == 0
+    assert values['block_read'] == 0
+
+
+def test_parse_stopped_container():
+    assert _parse({'read': '0001-01-01T00:00:00Z'}) is None
@@ -0,0 +1,159 @@
+import io
+import os
+import shutil
+import stat
+import subprocess
+import sys
+import tarfile
+import tempfile
+import unittest
+from unittest import mock
+
+import pytest
+
+from docker.errors import DockerException
+from docker.models import sync
+from docker.models.containers import ExecResult
+from docker.utils.transfer import extract_archive
+
+
+class FakeContainer:
+    """
+    Runs the commands on this host, where the container's filesystem is
+    the host's.
+    """
+    short_id = 'abcdef'
+
+    def __init__(self):
+        self.commands = []
+        self.archives = []
+
+    def exec_run(self, cmd, demux=False):
+        self.commands.append(cmd)
+        p = subprocess.run(cmd, capture_output=True)
+        return ExecResult(p.returncode, (p.stdout or None, p.stderr or None))
+
+    def put_archive(self, path, data, gzip=False):
+        data = b''.join(data)
+        self.archives.append(data)
+        extract_archive([data], path)
+        return True
+
+
+@pytest.mark.skipif(
+    not sys.platform.startswith('linux'), reason='needs GNU find and stat'
+)
+class SyncPathTest(unittest.TestCase):
+    def setUp(self):
+        self.src = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.src)
+        self.dest = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dest)
+        self.container = FakeContainer()
+        self.write('a', b'a')
+        self.write('sub/b', b'bb')
+        self.write('sub/deep/c', b'ccc')
+
+    def write(self, name, data, mtime=1500000000):
+        path = os.path.join(self.src, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(data)
+        os.utime(path, (mtime, mtime))
+
+    def sync(self, **kwargs):
+        return sync.sync_path(self.container, self.src, self.dest, **kwargs)
+
+    def test_sync(self):
+        sent, deleted = self.sync()
+        assert sent == ['a', 'sub', 'sub/b', 'sub/deep', 'sub/deep/c']
+        assert deleted == []
+        with open(os.path.join(self.dest, 'sub', 'deep', 'c'), 'rb') as f:
+            assert f.read() == b'ccc'
+
+        # Up to date: nothing is sent
+        assert self.sync() == ([], [])
+        assert len(self.container.archives) == 1
+
+    def test_changes(self):
+        self.sync()
+        self.write('a', b'A', mtime=1600000000)
+        self.write('sub/b', b'bbb')
+        os.chmod(os.path.join(self.src, 'sub', 'deep', 'c'), 0o700)
+        self.write('new', b'')
+        assert self.sync().sent == ['a', 'new', 'sub/b', 'sub/deep/c']
+        assert self.sync() == ([], [])
+
+    def test_directory_permissions(self):
+        self.sync()
+        os.chmod(os.path.join(self.src, 'sub', 'deep'), 0o700)
+        assert self.sync() == (['sub/deep'], [])
+        mode = os.stat(os.path.join(self.dest, 'sub', 'deep')).st_mode
+        assert stat.S_IMODE(mode) == 0o700
+        # Not the files in it
+        archive = io.BytesIO(self.container.archives[-1])
+        with tarfile.open(fileobj=archive) as tar:
+            assert tar.getnames() == ['sub/deep']
+        assert self.sync() == ([], [])
+
+    def test_checksum(self):
+        self.sync()
+        self.write('a', b'a', mtime=1600000000)
+        self.write('sub/b', b'BB', mtime=1600000000)
+        assert self.sync(checksum=True).sent == ['sub/b']
+        # Without checksums, a new modification time is enough
+        assert self.sync().sent == ['a']
+
+    def test_deletions(self):
+        self.sync()
+        os.remove(os.path.join(self.src, 'a'))
+        shutil.rmtree(os.path.join(self.src, 'sub', 'deep'))
+        assert self.sync(delete=False) == ([], [])
+
+        assert self.sync() == ([], ['a', 'sub/deep'])
+        assert sorted(os.listdir(self.dest)) == ['sub']
+        assert os.listdir(os.path.join(self.dest, 'sub')) == ['b']
+
+    def test_type_changes(self):
+        self.sync()
+        os.remove(os.path.join(self.src, 'a'))
+        self.write('a/file', b'')
+        shutil.rmtree(os.path.join(self.src, 'sub', 'deep'))
+        self.write('sub/deep', b'')
+        sent, deleted = self.sync(delete=False)
+        assert sent == ['a', 'a/file', 'sub/deep']
+        assert deleted == ['a', 'sub/deep']
+        assert os.path.isfile(os.path.join(self.dest, 'a', 'file'))
+        assert os.path.isfile(os.path.join(self.dest, 'sub', 'deep'))
+
+    def test_exclude(self):
+        self.write('debug.log', b'')
+        assert 'debug.log' not in self.sync(exclude=['*.log']).sent
+
+        self.write(os.path.join(self.dest, 'remote.log'), b'')
+        shutil.copy(os.path.join(self.src, 'debug.log'), self.dest)
+        # Excluded files in the container are kept
+        assert self.sync(exclude=['*.log']) == ([], [])
+        assert os.path.exists(os.path.join(self.dest, 'debug.log'))
+
+    def test_arguments_are_batched(self):
+        self.sync()
+        for name in ('a', 'sub/b', 'sub/deep/c'):
+            os.utime(os.path.join(self.src, name), (1600000000, 1600000000))
+        with mock.patch.object(sync, '_MAX_ARGS_LENGTH', 10):
+            assert self.sync(checksum=True).sent == []
+        sha256sums = [c for c in self.container.commands
+                      if c[0] == 'sha256sum']
+        assert len(sha256sums) == 3
+
+    def test_missing_destination(self):
+        shutil.rmtree(self.dest)
+        with pytest.raises(DockerException, match='find failed'):
+            self.sync()
+        os.mkdir(self.dest)
+
+    def test_not_a_directory(self):
+        with pytest.raises(NotADirectoryError):
+            sync.sync_path(
+                self.container, os.path.join(self.src, 'a'), self.dest
+            )
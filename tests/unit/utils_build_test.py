@@ -1,15 +1,25 @@
+import io
 import os
 import os.path
 import shutil
 import socket
 import tarfile
 import tempfile
+import time
 import unittest
+from unittest import mock
 
 import pytest
 
 from docker.constants import IS_WINDOWS_PLATFORM
-from docker.utils import exclude_paths, match_tag, tar
+from docker.utils import (
+    ContextCache,
+    exclude_paths,
+    match_tag,
+    stream_archive,
+    tar,
+)
+from docker.utils.build import PatternMatcher
 
 from ..helpers import make_tree
 
@@ -339,6 +349,30 @@ class ExcludePathsTest(unittest.TestCase):
             ['../a.py', '/../b.py']
         ) == {'c.py'}
 
+    def test_excluded_directory_is_not_walked(self):
+        listed = []
+        scandir = os.scandir
+
+        def fake_scandir(path):
+            listed.append(os.path.relpath(path, self.base))
+            return scandir(path)
+
+        with mock.patch('os.scandir', fake_scandir):
+            assert self.exclude(['subdir', '!foo/bar']) == (
+                self.all_paths - {'subdir'} - {
+                    p for p in self.all_paths if p.startswith('subdir/')
+                }
+            )
+        assert not [p for p in listed if p.startswith('subdir')]
+
+    def test_double_wildcard_matches_parent_directory(self):
+        matcher = PatternMatcher(['foo', '!**/bar'])
+        assert matcher.matches('foo/a.py')
+        assert not matcher.matches('foo/bar')
+        assert not matcher.matches('foo/bar/a.py')
+        assert matcher.matches('foo/baz/bar/a.py')
+        assert not matcher.matches('foo/baz/bar')
+
 
 class TarTest(unittest.TestCase):
     def test_tar_with_excludes(self):
@@ -474,6 +508,86 @@ class TarTest(unittest.TestCase):
             assert tar_data.getnames() == ['th.txt']
             assert tar_data.getmember('th.txt').mtime == -3600
 
+    def test_tar_stream(self):
+        base = make_tree(['foo'], ['Dockerfile', 'foo/a.py', 'foo/b.py'])
+        self.addCleanup(shutil.rmtree, base)
+        with open(os.path.join(base, 'foo/a.py'), 'wb') as f:
+            f.write(os.urandom(300 * 1024))
+
+        with tar(base, exclude=['foo/b.py']) as archive:
+            expected = archive.read()
+        for gzip in (False, True):
+            chunks = list(tar(
+                base, exclude=['foo/b.py'], gzip=gzip, stream=True
+            ))
+            assert max(len(c) for c in chunks) <= 64 * 1024 * 2
+            tar_data = tarfile.open(fileobj=io.BytesIO(b''.join(chunks)))
+            assert sorted(tar_data.getnames()) == [
+                'Dockerfile', 'foo', 'foo/a.py'
+            ]
+            if not gzip:
+                assert b''.join(chunks) == expected
+
+    @pytest.mark.skipif(IS_WINDOWS_PLATFORM, reason='No execute bit on Win32')
+    def test_tar_reproducible(self):
+        first = make_tree(['foo'], ['Dockerfile', 'foo/a.py', 'foo/run.sh'])
+        self.addCleanup(shutil.rmtree, first)
+        second = make_tree(['foo'], ['foo/run.sh', 'foo/a.py', 'Dockerfile'])
+        self.addCleanup(shutil.rmtree, second)
+        os.chmod(os.path.join(first, 'foo/run.sh'), 0o755)
+        os.chmod(os.path.join(second, 'foo/run.sh'), 0o700)
+        os.chmod(os.path.join(second, 'foo/a.py'), 0o600)
+        os.utime(os.path.join(second, 'Dockerfile'), (12345, 12345.5))
+
+        for gzip in (False, True):
+            with tar(first, gzip=gzip, reproducible=True) as archive:
+                expected = archive.read()
+            with tar(second, gzip=gzip, reproducible=True) as archive:
+                assert archive.read() == expected
+
+        tar_data = tarfile.open(fileobj=io.BytesIO(expected))
+        assert [
+            (m.name, m.mode, m.mtime, m.uid, m.gid, m.uname)
+            for m in tar_data.getmembers()
+        ] == [
+            ('Dockerfile', 0o644, 0, 0, 0, ''),
+            ('foo', 0o755, 0, 0, 0, ''),
+            ('foo/a.py', 0o644, 0, 0, 0, ''),
+            ('foo/run.sh', 0o755, 0, 0, 0, ''),
+        ]
+        assert expected[4:8] == b'\0\0\0\0'
+
+    def test_stream_archive_backpressure(self):
+        base = make_tree([], ['a', 'b'])
+        self.addCleanup(shutil.rmtree, base)
+        for name in ('a', 'b'):
+            with open(os.path.join(base, name), 'wb') as f:
+                f.write(b'x' * 1024 * 1024)
+
+        chunks = stream_archive(base, chunk_size=1024, max_chunks=2)
+        next(chunks)
+        # The producer is blocked on the bounded queue, closing the stream
+        # stops it
+        chunks.close()
+
+    @pytest.mark.skipif(
+        IS_WINDOWS_PLATFORM or os.geteuid() == 0,
+        reason='root user always has access ; no chmod on Windows'
+    )
+    def test_tar_stream_with_inaccessible_file(self):
+        base = tempfile.mkdtemp()
+        full_path = os.path.join(base, 'foo')
+        self.addCleanup(shutil.rmtree, base)
+        with open(full_path, 'w') as f:
+            f.write('content')
+        os.chmod(full_path, 0o222)
+        with pytest.raises(IOError) as ei:
+            list(tar(base, stream=True))
+
+        assert f'Can not read file in context: {full_path}' in (
+            ei.exconly()
+        )
+
     @pytest.mark.skipif(IS_WINDOWS_PLATFORM, reason='No symlinks on Windows')
     def test_tar_directory_link(self):
         dirs = ['a', 'b', 'a/c']
@@ -490,6 +604,118 @@ class TarTest(unittest.TestCase):
             assert 'a/c/b/utils.py' not in names
 
 
+class ContextCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.base = make_tree(['foo'], ['Dockerfile', 'foo/a.py', 'foo/b.py'])
+        self.addCleanup(shutil.rmtree, self.base)
+        self.cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.cache_dir)
+
+    def archive(self, cache, **kwargs):
+        opened = []
+
+        def fake_open(path, *args, **kwargs):
+            opened.append(os.path.relpath(path, self.base))
+            return open(path, *args, **kwargs)
+
+        with mock.patch('docker.utils.build.open', fake_open, create=True):
+            with tar(self.base, cache=cache, **kwargs) as archive:
+                return archive.read(), opened
+
+    def test_unchanged_files_are_not_read(self):
+        with tar(self.base) as archive:
+            expected = archive.read()
+        data, opened = self.archive(ContextCache(self.cache_dir))
+        assert data == expected
+        assert sorted(opened) == ['Dockerfile', 'foo/a.py', 'foo/b.py']
+
+        # A new cache object over the same directory reuses the members
+        data, opened = self.archive(ContextCache(self.cache_dir))
+        assert data == expected
+        assert opened == []
+
+    def test_changed_files_are_read(self):
+        cache = ContextCache(self.cache_dir)
+        self.archive(cache)
+        with open(os.path.join(self.base, 'foo/a.py'), 'w') as f:
+            f.write('print("changed")')
+        data, opened = self.archive(cache)
+        assert opened == ['foo/a.py']
+        tar_data = tarfile.open(fileobj=io.BytesIO(data))
+        assert tar_data.extractfile('foo/a.py').read() == b'print("changed")'
+        assert tar_data.extractfile('foo/b.py').read() == b'content'
+
+    def test_removed_files_are_forgotten(self):
+        cache = ContextCache(self.cache_dir)
+        self.archive(cache, gzip=True)
+        os.unlink(os.path.join(self.base, 'foo/b.py'))
+        with open(os.path.join(self.base, 'foo/a.py'), 'w') as f:
+            f.write('a')
+        data, _ = self.archive(cache, gzip=True)
+        tar_data = tarfile.open(fileobj=io.BytesIO(data))
+        assert sorted(tar_data.getnames()) == ['Dockerfile', 'foo', 'foo/a.py']
+        assert len(cache._entries) == 2
+        assert len(os.listdir(os.path.join(self.cache_dir, 'blobs'))) == 2
+
+    def test_caches_sharing_a_directory_merge_their_entries(self):
+        other = make_tree([], ['Dockerfile', 'c.py'])
+        self.addCleanup(shutil.rmtree, other)
+        first = ContextCache(self.cache_dir)
+        second = ContextCache(self.cache_dir)
+        # As another process would, with the index read before the first
+        # one saved its entries
+        second._load()
+        self.archive(first)
+        with tar(other, cache=second):
+            pass
+
+        cache = ContextCache(self.cache_dir)
+        data, opened = self.archive(cache)
+        assert opened == []
+        assert len(cache._entries) == 5
+        # No member either cache uses was deleted
+        assert sorted(os.listdir(os.path.join(self.cache_dir, 'blobs'))) == \
+            sorted({entry[-1][1] for entry in cache._entries.values()})
+
+    def test_unused_members_of_other_caches_are_kept_for_a_while(self):
+        blobs = os.path.join(self.cache_dir, 'blobs')
+        os.makedirs(blobs)
+        for name, age in [('recent', 0), ('old', 7200)]:
+            path = os.path.join(blobs, name)
+            with open(path, 'wb'):
+                pass
+            mtime = time.time() - age
+            os.utime(path, (mtime, mtime))
+        self.archive(ContextCache(self.cache_dir))
+        assert 'recent' in os.listdir(blobs)
+        assert 'old' not in os.listdir(blobs)
+
+    @pytest.mark.skipif(
+        not hasattr(os, 'geteuid') or os.geteuid() != 0,
+        reason='changing the owner of a file needs root'
+    )
+    def test_owner_changes_are_read(self):
+        cache = ContextCache(self.cache_dir)
+        self.archive(cache)
+        os.chown(os.path.join(self.base, 'foo/a.py'), 1000, 1000)
+        data, opened = self.archive(cache)
+        assert opened == ['foo/a.py']
+        tar_data = tarfile.open(fileobj=io.BytesIO(data))
+        assert tar_data.getmember('foo/a.py').uid == 1000
+
+    def test_reproducible_members_are_cached_separately(self):
+        cache = ContextCache(self.cache_dir)
+        self.archive(cache)
+        with tar(self.base, reproducible=True) as archive:
+            expected = archive.read()
+        data, opened = self.archive(cache, reproducible=True)
+        assert data == expected
+        assert len(opened) == 3
+        data, opened = self.archive(cache, reproducible=True)
+        assert data == expected
+        assert opened == []
+
+
 # selected test cases from https://github.com/distribution/reference/blob/8507c7fcf0da9f570540c958ea7b972c30eeaeca/reference_test.go#L13-L328
 @pytest.mark.parametrize("tag,expected", [
     ("test_com", True),
@@ -0,0 +1,77 @@
+import gzip
+import io
+import os
+import shutil
+import tarfile
+import zlib
+
+import pytest
+
+from docker.errors import InvalidArgument
+from docker.utils import ParallelGzip, create_archive
+
+from ..helpers import make_tree
+
+
+def sample(size):
+    # Half random, half repetitive, so that blocks compress unevenly
+    return os.urandom(size // 2) + b'docker' * (size // 12)
+
+
+class TestParallelGzip:
+
+    @pytest.mark.parametrize('size', [0, 1, 4096, 100000])
+    @pytest.mark.parametrize('level', [0, 1, 6, 9])
+    def test_round_trip(self, size, level):
+        data = sample(size)
+        out = io.BytesIO()
+        with ParallelGzip(level, threads=3, block_size=4096).open(out) as f:
+            f.write(data)
+        assert gzip.decompress(out.getvalue()) == data
+
+    def test_header_has_no_timestamp(self):
+        out = io.BytesIO()
+        with ParallelGzip(level=9).open(out) as f:
+            f.write(b'foo')
+        assert out.getvalue()[:10] == b'\x1f\x8b\x08\x00\x00\x00\x00\x00\x02\xff'
+
+    def test_preset_dictionary_keeps_ratio(self):
+        data = b'0123456789abcdef' * 4096
+        out = io.BytesIO()
+        with ParallelGzip(threads=2, block_size=1024).open(out) as f:
+            f.write(data)
+        # Blocks after the first refer back to the previous block
+        alone = sum(
+            len(zlib.compress(data[i:i + 1024]))
+            for i in range(0, len(data), 1024)
+        )
+        assert len(out.getvalue()) < alone / 2
+
+    @pytest.mark.parametrize('wrap', [bytes, io.BytesIO, lambda d: [d, d]])
+    def test_compress(self, wrap):
+        data = sample(50000)
+        chunks = list(ParallelGzip(block_size=8192).compress(wrap(data)))
+        assert len(chunks) > 1
+        expected = data * 2 if isinstance(wrap(b''), list) else data
+        assert gzip.decompress(b''.join(chunks)) == expected
+
+    def test_abandoned_compress(self):
+        chunks = ParallelGzip(block_size=1024).compress(sample(100000))
+        next(chunks)
+        chunks.close()
+
+    @pytest.mark.parametrize('kwargs', [
+        {'level': 10}, {'level': -1}, {'threads': 0}, {'block_size': 0},
+    ])
+    def test_invalid_options(self, kwargs):
+        with pytest.raises(InvalidArgument):
+            ParallelGzip(**kwargs)
+
+    def test_create_archive(self):
+        base = make_tree(['foo'], ['Dockerfile', 'foo/a.py'])
+        try:
+            with create_archive(base, gzip=ParallelGzip(threads=2)) as f:
+                names = tarfile.open(fileobj=f).getnames()
+        finally:
+            shutil.rmtree(base)
+        assert sorted(names) == ['Dockerfile', 'foo', 'foo/a.py']
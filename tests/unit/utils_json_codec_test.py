@@ -0,0 +1,41 @@
+from unittest import mock
+
+import pytest
+
+from docker.errors import DockerException, InvalidArgument
+from docker.utils import json_codec
+from docker.utils.json_codec import JSONCodec, get_json_codec
+
+
+class TestGetJsonCodec:
+
+    def test_default(self):
+        assert type(get_json_codec()) is JSONCodec
+
+    def test_codec_object(self):
+        codec = object()
+        assert get_json_codec(codec) is codec
+
+    def test_unknown(self):
+        with pytest.raises(InvalidArgument):
+            get_json_codec('simplejson')
+
+    def test_auto_without_fast_codecs(self):
+        with mock.patch.object(json_codec, 'orjson', None), \
+                mock.patch.object(json_codec, 'ujson', None):
+            assert type(get_json_codec('auto')) is JSONCodec
+
+    def test_missing_library(self):
+        with mock.patch.object(json_codec, 'ujson', None):
+            with pytest.raises(DockerException):
+                get_json_codec('ujson')
+
+    @pytest.mark.parametrize('name', ['json', 'orjson', 'ujson'])
+    def test_round_trip(self, name):
+        try:
+            codec = get_json_codec(name)
+        except DockerException:
+            pytest.skip(f'{name} is not installed')
+        data = {'Id': 'abc', 'Labels': {'a/b': 'é'}, 'Size': 2 ** 40}
+        assert codec.loads(codec.dumps(data)) == data
+        assert codec.loads(b'{"a": [1, null]}') == {'a': [1, None]}
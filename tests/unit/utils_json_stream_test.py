@@ -1,4 +1,14 @@
-from docker.utils.json_stream import json_splitter, json_stream, stream_as_text
+import json
+
+import pytest
+
+from docker.errors import StreamParseError
+from docker.utils.json_stream import (
+    JSONStreamDecoder,
+    json_splitter,
+    json_stream,
+    stream_as_text,
+)
 
 
 class TestJsonSplitter:
@@ -56,3 +66,47 @@ class TestJsonStream:
             {'three': 'four'},
             {'x': 2}
         ]
+
+    def test_with_bytes_split_mid_line(self):
+        stream = [b'{"status": "Pulling', b' fs layer"}\n{"id"', b': "a"}\n']
+        assert list(json_stream(stream)) == [
+            {'status': 'Pulling fs layer'},
+            {'id': 'a'},
+        ]
+
+    def test_multibyte_character_split_across_chunks(self):
+        data = '{"a": "ěĝ"}\n'.encode()
+        stream = [data[:8], data[8:]]
+        assert list(json_stream(stream)) == [{'a': 'ěĝ'}]
+
+    def test_object_spread_over_lines(self):
+        stream = ['{\n  "a": 1,\n', '  "b": 2\n}\n{"c": 3}\n']
+        assert list(json_stream(stream)) == [{'a': 1, 'b': 2}, {'c': 3}]
+
+    def test_truncated_stream(self):
+        with pytest.raises(StreamParseError):
+            list(json_stream([b'{"a": 1}\n{"b": ']))
+
+
+class TestJSONStreamDecoder:
+
+    def test_each_line_parsed_once(self):
+        lines = []
+
+        def loads(data):
+            lines.append(data)
+            return json.loads(data)
+
+        decoder = JSONStreamDecoder(loads)
+        assert decoder.decode(b'{"a": 1}\n{"b"') == [{'a': 1}]
+        for c in b': 2':
+            assert decoder.decode(bytes([c])) == []
+        assert decoder.decode(b'}\n') == [{'b': 2}]
+        assert decoder.flush() == []
+        assert lines == [b'{"a": 1}', b'{"b": 2}']
+
+    def test_unterminated_object(self):
+        decoder = JSONStreamDecoder()
+        assert decoder.decode(b'{"a": {"b": 1}') == []
+        assert decoder.decode(b'}') == [{'a': {'b': 1}}]
+        assert decoder.flush() == []
@@ -1,9 +1,15 @@
 import base64
+import concurrent.futures
+import io
 import json
 import os
 import os.path
 import shutil
+import socket
+import struct
 import tempfile
+import threading
+import time
 import unittest
 
 import pytest
@@ -28,7 +34,9 @@ from docker.utils import (
     version_gte,
     version_lt,
 )
+from docker.utils.concurrency import bounded_as_completed, bounded_map
 from docker.utils.ports import build_port_bindings, split_port
+from docker.utils.socket import FrameReader, consume_socket_output
 
 TEST_CERT_DIR = os.path.join(
     os.path.dirname(__file__),
@@ -658,3 +666,187 @@ def test_compare_versions():
     assert compare_version('1', '1.0') == 0
     assert compare_version('1.10', '1.10.1') == 1
     assert compare_version('1.10.0', '1.10') == 0
+
+
+class BoundedMapTest(unittest.TestCase):
+    def setUp(self):
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=8)
+        self.addCleanup(self.executor.shutdown)
+
+    def test_keeps_order(self):
+        def fn(i):
+            time.sleep(0.001 * (10 - i))
+            return i * 2
+
+        result = list(bounded_map(self.executor, fn, range(10), 4))
+        assert result == [i * 2 for i in range(10)]
+
+    def test_limits_calls_in_flight(self):
+        lock = threading.Lock()
+        state = {'running': 0, 'max': 0}
+
+        def fn(i):
+            with lock:
+                state['running'] += 1
+                state['max'] = max(state['max'], state['running'])
+            time.sleep(0.005)
+            with lock:
+                state['running'] -= 1
+            return i
+
+        assert list(bounded_map(self.executor, fn, range(20), 3)) == \
+            list(range(20))
+        assert state['max'] <= 3
+
+    def test_propagates_exceptions(self):
+        def fn(i):
+            if i == 2:
+                raise ValueError(i)
+            return i
+
+        with pytest.raises(ValueError):
+            list(bounded_map(self.executor, fn, range(5), 2))
+
+
+
+class BoundedAsCompletedTest(unittest.TestCase):
+    def setUp(self):
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=8)
+        self.addCleanup(self.executor.shutdown)
+
+    def test_yields_in_completion_order(self):
+        release = threading.Event()
+
+        def fn(i):
+            if i == 0:
+                release.wait(5)
+            return i
+
+        results = bounded_as_completed(self.executor, fn, range(5), 2)
+        first = [next(results) for _ in range(4)]
+        release.set()
+        assert first == [1, 2, 3, 4]
+        assert list(results) == [0]
+
+    def test_limits_calls_in_flight(self):
+        lock = threading.Lock()
+        state = {'running': 0, 'max': 0}
+
+        def fn(i):
+            with lock:
+                state['running'] += 1
+                state['max'] = max(state['max'], state['running'])
+            time.sleep(0.005)
+            with lock:
+                state['running'] -= 1
+            return i
+
+        results = bounded_as_completed(self.executor, fn, range(20), 3)
+        assert sorted(results) == list(range(20))
+        assert state['max'] <= 3
+
+    def test_propagates_exceptions(self):
+        def fn(i):
+            if i == 2:
+                raise ValueError(i)
+            return i
+
+        with pytest.raises(ValueError):
+            list(bounded_as_completed(self.executor, fn, range(5), 2))
+
+def _frame(stream, data):
+    return struct.pack('>BxxxL', stream, len(data)) + data
+
+
+class FrameReaderTest(unittest.TestCase):
+    def make_reader(self, data, **kwargs):
+        server, client = socket.socketpair()
+        self.addCleanup(client.close)
+        server.sendall(data)
+        server.close()
+        return FrameReader(client, **kwargs)
+
+    def test_many_frames_one_read(self):
+        data = b''.join(_frame(1 + i % 2, b'x%d' % i) for i in range(100))
+        reader = self.make_reader(data)
+        frames = [(s, bytes(p)) for s, p in reader.frames()]
+        assert frames == [(1 + i % 2, b'x%d' % i) for i in range(100)]
+
+    def test_payloads_are_views_on_the_buffer(self):
+        reader = self.make_reader(_frame(1, b'hello'))
+        _, payload = next(reader.frames())
+        assert isinstance(payload, memoryview)
+        assert payload.obj is reader._buffer
+
+    def test_frames_larger_than_buffer(self):
+        data = _frame(1, b'a' * 100) + _frame(2, b'b' * 30)
+        reader = self.make_reader(data, bufsize=16)
+        out = {1: b'', 2: b''}
+        for stream, payload in reader.frames():
+            assert len(payload) <= 16
+            out[stream] += bytes(payload)
+        assert out == {1: b'a' * 100, 2: b'b' * 30}
+
+    def test_header_split_across_reads(self):
+        data = b''.join(_frame(1, b'abc') for _ in range(10))
+        reader = self.make_reader(data, bufsize=10)
+        assert b''.join(bytes(p) for _, p in reader.frames()) == b'abc' * 10
+
+    def test_truncated_stream(self):
+        reader = self.make_reader(_frame(1, b'abc') + _frame(2, b'de')[:4])
+        assert [bytes(p) for _, p in reader.frames()] == [b'abc']
+
+    def test_tty(self):
+        reader = self.make_reader(b'raw \x01 data', tty=True)
+        assert [(s, bytes(p)) for s, p in reader.frames()] == [
+            (1, b'raw \x01 data')
+        ]
+
+    def test_write_to(self):
+        data = _frame(1, b'out') + _frame(2, b'err') + _frame(1, b'put')
+        reader = self.make_reader(data)
+        stdout = io.BytesIO()
+        assert reader.write_to(stdout) == (6, 3)
+        assert stdout.getvalue() == b'output'
+
+    def test_timeout(self):
+        server, client = socket.socketpair()
+        self.addCleanup(server.close)
+        self.addCleanup(client.close)
+        server.sendall(_frame(1, b'abc'))
+        reader = FrameReader(client, timeout=0.05)
+        stdout = io.BytesIO()
+        with pytest.raises(socket.timeout):
+            reader.write_to(stdout)
+        assert stdout.getvalue() == b'abc'
+
+    def test_file_object(self):
+        data = _frame(1, b'abc') + _frame(2, b'def')
+        reader = FrameReader(io.BytesIO(data), bufsize=4)
+        stdout, stderr = io.BytesIO(), io.BytesIO()
+        assert reader.write_to(stdout, stderr) == (3, 3)
+        assert (stdout.getvalue(), stderr.getvalue()) == (b'abc', b'def')
+
+    def test_write_to_file_descriptor(self):
+        reader = self.make_reader(_frame(1, b'out') + _frame(2, b'err'))
+        with tempfile.TemporaryFile() as f:
+            assert reader.write_to(f.fileno(), f.fileno()) == (3, 3)
+            f.seek(0)
+            assert f.read() == b'outerr'
+
+    def test_socket_io(self):
+        server, client = socket.socketpair()
+        self.addCleanup(client.close)
+        server.sendall(_frame(1, b'abc') + _frame(2, b'def'))
+        server.close()
+        reader = FrameReader(socket.SocketIO(client, 'rb'))
+        stdout, stderr = io.BytesIO(), io.BytesIO()
+        reader.write_to(stdout, stderr)
+        assert (stdout.getvalue(), stderr.getvalue()) == (b'abc', b'def')
+
+
+def test_consume_socket_output_demux():
+    frames = [(b'a', None), (None, b'b'), (b'c', None), (b'', None)]
+    assert consume_socket_output(iter(frames), demux=True) == (b'ac', b'b')
+    assert consume_socket_output(iter([(b'a', None)]), demux=True) == \
+        (b'a', None)
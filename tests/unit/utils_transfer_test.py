@@ -0,0 +1,237 @@
+import concurrent.futures
+import gzip
+import io
+import os
+import shutil
+import tarfile
+import tempfile
+import threading
+import unittest
+
+import pytest
+import requests.exceptions
+
+import docker
+from docker.utils.transfer import (
+    extract_archive,
+    open_destination,
+    shared_buffer,
+    stream_body,
+    write_body,
+)
+
+from .fake_archive_server import (
+    ARCHIVE,
+    BIG,
+    STAT,
+    TREE,
+    ArchiveServerTestCase,
+    make_tar,
+)
+
+
+class WriteBodyTest(ArchiveServerTestCase):
+    def test_export_to_path(self):
+        dest = os.path.join(self.tmpdir, 'export.tar')
+        assert self.client.export_to('a', dest) == len(ARCHIVE)
+        with open(dest, 'rb') as f:
+            assert f.read() == ARCHIVE
+
+    def test_export_to_file_descriptor(self):
+        with tempfile.TemporaryFile() as f:
+            assert self.client.export_to('a', f.fileno()) == len(ARCHIVE)
+            f.seek(0)
+            assert f.read() == ARCHIVE
+
+    def test_get_archive_to(self):
+        dest = io.BytesIO()
+        size, stat = self.client.get_archive_to('a', '/bin/sh', dest)
+        assert size == len(ARCHIVE)
+        assert dest.getvalue() == ARCHIVE
+        assert stat == STAT
+
+    def test_get_archive_to_compressed(self):
+        dest = io.BytesIO()
+        size, _ = self.client.get_archive_to(
+            'a', '/bin/sh', dest, encode_stream=True
+        )
+        assert size == len(ARCHIVE)
+        assert dest.getvalue() == ARCHIVE
+
+    def test_export_to_content_length(self):
+        dest = io.BytesIO()
+        assert self.client.export_to('sized', dest) == len(ARCHIVE)
+        assert dest.getvalue() == ARCHIVE
+
+    def test_trailers(self):
+        dest = io.BytesIO()
+        assert self.client.export_to('trailers', dest) == len(ARCHIVE)
+        assert dest.getvalue() == ARCHIVE
+
+    def test_small_buffer(self):
+        for container in ('a', 'trailers', 'sized'):
+            res = self.client._get(
+                self.client._url('/containers/{0}/export', container),
+                stream=True
+            )
+            dest = io.BytesIO()
+            # Chunk size lines are split across reads
+            assert write_body(res, dest, bufsize=3) == len(ARCHIVE)
+            assert dest.getvalue() == ARCHIVE
+
+    def test_connection_is_reused(self):
+        for container in ('a', 'trailers', 'sized', 'a'):
+            self.client.export_to(container, io.BytesIO())
+        assert self.server.connections == 1
+
+    def test_truncated(self):
+        with pytest.raises(requests.exceptions.ChunkedEncodingError):
+            self.client.export_to('truncated', io.BytesIO())
+
+    def test_error(self):
+        dest = os.path.join(self.tmpdir, 'export.tar')
+        with pytest.raises(docker.errors.NotFound):
+            self.client.export_to('gone', dest)
+        assert not os.path.exists(dest)
+
+
+class StreamBodyTest(ArchiveServerTestCase):
+    def test_stream_body(self):
+        res = self.client._get(
+            self.client._url('/containers/{0}/export', 'a'), stream=True
+        )
+        chunks = list(stream_body(res, chunk_size=1000, max_chunks=2))
+        assert b''.join(chunks) == ARCHIVE
+        assert all(len(chunk) >= 1000 for chunk in chunks[:-1])
+
+        # Stopping early stops the thread and closes the response
+        res = self.client._get(
+            self.client._url('/containers/{0}/export', 'a'), stream=True
+        )
+        body = stream_body(res, chunk_size=1000, max_chunks=2)
+        assert len(next(body)) >= 1000
+        body.close()
+        assert not [t for t in threading.enumerate()
+                    if t.name == 'docker-stream-body']
+
+    def test_stream_body_error(self):
+        res = self.client._get(
+            self.client._url('/containers/{0}/export', 'truncated'),
+            stream=True
+        )
+        with pytest.raises(requests.exceptions.ChunkedEncodingError):
+            list(stream_body(res))
+
+
+class ExtractArchiveTest(unittest.TestCase):
+    def setUp(self):
+        self.dest = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dest)
+        # Let the directories with no write permission be removed
+        self.addCleanup(
+            lambda: [os.chmod(d, 0o755) for d, _, _ in os.walk(self.dest)]
+        )
+
+    def chunks(self, data, size=1000):
+        return (data[i:i + size] for i in range(0, len(data), size))
+
+    def path(self, *parts):
+        return os.path.join(self.dest, *parts)
+
+    def test_extract(self):
+        assert extract_archive(self.chunks(TREE), self.dest) == 7
+
+        with open(self.path('etc', 'small'), 'rb') as f:
+            assert f.read() == b'small'
+        with open(self.path('etc', 'big'), 'rb') as f:
+            assert f.read() == BIG
+        assert os.path.getsize(self.path('etc', 'sub', 'empty')) == 0
+        assert os.readlink(self.path('etc', 'link')) == 'small'
+        assert os.path.samefile(
+            self.path('etc', 'hard'), self.path('etc', 'small')
+        )
+        assert not os.path.lexists(self.path('etc', 'fifo'))
+
+        for name, mode in [('etc', 0o555), ('etc/small', 0o640),
+                           ('etc/big', 0o755)]:
+            st = os.stat(self.path(name))
+            assert st.st_mode & 0o7777 == mode
+            assert st.st_mtime == 1500000000
+
+    def test_rename(self):
+        extract_archive(self.chunks(TREE), self.dest, rename='conf')
+        assert sorted(os.listdir(self.dest)) == ['conf']
+        assert os.path.samefile(
+            self.path('conf', 'hard'), self.path('conf', 'small')
+        )
+
+    def test_single_file_replaces_symlink(self):
+        outside = tempfile.NamedTemporaryFile()
+        self.addCleanup(outside.close)
+        os.symlink(outside.name, self.path('file'))
+        data = make_tar([('file', tarfile.REGTYPE, b'data', 0o600)])
+
+        extract_archive([data], self.dest)
+        assert not os.path.islink(self.path('file'))
+        assert outside.read() == b''
+
+    def test_queued_write_is_not_redirected_by_a_symlink(self):
+        outside = tempfile.NamedTemporaryFile()
+        self.addCleanup(outside.close)
+        data = make_tar([
+            ('b', tarfile.REGTYPE, b'pwned', 0o644),
+            ('b', tarfile.SYMTYPE, outside.name, 0o777),
+        ])
+        # The write of the file waits for a busy worker
+        executor = concurrent.futures.ThreadPoolExecutor(1)
+        self.addCleanup(executor.shutdown)
+        busy = threading.Event()
+        executor.submit(busy.wait, 5)
+        threading.Timer(0.1, busy.set).start()
+
+        extract_archive([data], self.dest, executor=executor)
+        assert os.readlink(self.path('b')) == outside.name
+        assert outside.read() == b''
+
+    def test_unsafe_paths(self):
+        for members in [
+            [('../escape', tarfile.REGTYPE, b'', 0o644)],
+            [('a/../../escape', tarfile.REGTYPE, b'', 0o644)],
+            [('link', tarfile.SYMTYPE, '/tmp', 0o777),
+             ('link/escape', tarfile.REGTYPE, b'', 0o644)],
+            [('link', tarfile.SYMTYPE, '..', 0o777),
+             ('link/escape', tarfile.DIRTYPE, None, 0o755)],
+        ]:
+            with pytest.raises(docker.errors.DockerException):
+                extract_archive([make_tar(members)], self.dest)
+        assert not os.path.exists(self.path('..', 'escape'))
+
+    def test_absolute_paths_are_relative_to_dest(self):
+        data = make_tar([('/abs', tarfile.REGTYPE, b'data', 0o644)])
+        extract_archive([data], self.dest)
+        assert os.path.exists(self.path('abs'))
+
+    def test_write_error(self):
+        data = make_tar([
+            ('dir', tarfile.REGTYPE, b'data', 0o644),
+            ('dir/file', tarfile.REGTYPE, b'data', 0o644),
+        ])
+        with pytest.raises(OSError):
+            extract_archive([data], self.dest)
+
+
+def test_open_destination_leaves_file_objects_open():
+    f = io.BytesIO()
+    with open_destination(f) as dest:
+        dest.write(b'data')
+    assert not f.closed
+    assert f.getvalue() == b'data'
+
+
+def test_shared_buffer():
+    data = b'data' * 1000
+    assert shared_buffer(data).obj is data
+    for source in (io.BytesIO(data), iter([data[:10], data[10:]])):
+        assert shared_buffer(source) == data
+    assert gzip.decompress(shared_buffer([data], gzip=True)) == data
+    assert shared_buffer(iter([])) == b''